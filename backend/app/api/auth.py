@@ -16,6 +16,7 @@ from schemas.account import AccountOut, Permissions
 from core.dependencies.aaa import AuthUser, require_permissions, oauth2_scheme
 from redis import Redis
 from core.dependencies.redis import get_auth_redis
+from core.security import get_password_hash_stats
 
 # from schemas.auth import SAMLConfigBase, SAMLConfigOut
 # from models.config import SysSAMLConfig
@@ -105,3 +106,12 @@ async def get_self(
     user: AuthUser,
 ):
     return user
+
+
+@router.get(
+    "/password-hash-stats",
+    summary="Latency of bcrypt hash/verify calls in this process",
+)
+@require_permissions(Permissions.admin)
+async def password_hash_stats():
+    return get_password_hash_stats()
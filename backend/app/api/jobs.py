@@ -5,15 +5,13 @@ from typing import List
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, status
 from core.custom_api_route import HandleResponseRoute
-from core.dependencies.db import DBSession
+from core.dependencies.db import DBSession, DBReplicaSession
 from schemas.job import JobCreate, JobRead, JobUpdate, JobOut
 from services import job_service
 from core.dependencies.aaa import require_permissions
 from schemas.account import Permissions
-from core.custom_page import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
+from core.custom_page import Page, paginate_keyset
 from models.job import Job
-from sqlalchemy import select
 
 
 router = APIRouter(
@@ -44,26 +42,34 @@ async def create_job(
 @router.get("/list", response_model=Page[JobOut])
 @require_permissions(Permissions.admin)
 async def get_jobs(
-    db: DBSession,
+    db: DBReplicaSession,
 ) -> List[JobRead]:
     """
     Get a list of all jobs with pagination.
     
+    Pages are addressed by `current`/`pageSize`, or by the `after` cursor
+    returned as `nextCursor` for index-backed keyset paging.
+    
     Args:
         db: Database session
         
     Returns:
         List[JobRead]: List of jobs
     """
-    query = select(Job).order_by(Job.created_at.desc())
-    return await paginate(db, query)
+    return await paginate_keyset(
+        db,
+        job_service.job_list_query(),
+        count_key=("jobs",),
+        created_at_column=Job.created_at,
+        id_column=Job.id,
+    )
 
 
 @router.get("/{job_id}", response_model=JobRead)
 @require_permissions(Permissions.admin)
 async def get_job(
     job_id: str,
-    db: DBSession
+    db: DBReplicaSession
 ) -> JobRead:
     """
     Get a specific job by ID.
@@ -78,7 +84,7 @@ async def get_job(
     Raises:
         HTTPException: If job not found
     """
-    job = job_service.get_job_by_id(db, job_id)
+    job = await job_service.get_job_by_id(db, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -8,11 +8,9 @@ from schemas.log_template import LogTemplateCreate, LogTemplateRead, LogTemplate
 from services import log_template_service
 from core.custom_api_route import HandleResponseRoute
 from schemas.account import Permissions
-from core.dependencies.db import DBSession
+from core.dependencies.db import DBSession, DBReplicaSession
 from core.dependencies.aaa import require_permissions
-from core.custom_page import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import select
+from core.custom_page import Page, paginate_keyset
 from models.log_template import LogTemplate
 
 router = APIRouter(
@@ -42,7 +40,7 @@ async def create_template(
 
 @router.get("/list", response_model=Page[LogTemplateRead])
 async def get_templates(
-    db: DBSession,
+    db: DBReplicaSession,
     name: Optional[str] = None,
     device_type: Optional[str] = None,
     content_format: Optional[str] = None,
@@ -50,6 +48,9 @@ async def get_templates(
     """
     Get a list of all templates with pagination and optional filters.
     
+    Pages are addressed by `current`/`pageSize`, or by the `after` cursor
+    returned as `nextCursor` for index-backed keyset paging.
+    
     Args:
         db: Database session
         name: Optional filter by template name
@@ -59,22 +60,20 @@ async def get_templates(
     Returns:
         Page[LogTemplateRead]: Paginated list of templates
     """
-    query = select(LogTemplate)
-    
-    if name and name != "undefined":
-        query = query.filter(LogTemplate.name.ilike(f"%{name}%"))
-    if device_type:
-        query = query.filter(LogTemplate.device_type == device_type)
-    if content_format:
-        query = query.filter(LogTemplate.content_format == content_format)
-    
-    return await paginate(db, query)
+    query = log_template_service.template_list_query(name, device_type, content_format)
+    return await paginate_keyset(
+        db,
+        query,
+        count_key=("log_templates", name, device_type, content_format),
+        created_at_column=LogTemplate.created_at,
+        id_column=LogTemplate.id,
+    )
 
 
 @router.get("/{template_id}", response_model=LogTemplateRead)
 async def get_template(
     template_id: str,
-    db: DBSession
+    db: DBReplicaSession
 ) -> LogTemplateRead:
     """
     Get a single template by ID.
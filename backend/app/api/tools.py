@@ -1,12 +1,29 @@
 """
 API router for tools and utilities endpoints.
 """
-from fastapi import APIRouter, status
-from schemas.tools import LogParseRequest, LogParseResponse
-from services.parsing_service import parse_log_with_template
+from typing import AsyncIterator, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import FormData, UploadFile
+from starlette.requests import ClientDisconnect
+from schemas.tools import (
+    DetectedTemplate,
+    LogParseRequest,
+    LogParseResponse,
+    TemplateDetectRequest,
+    TemplateDetectResponse,
+)
+from services.parsing_service import (
+    get_compiled_parser,
+    parse_log_with_template,
+    stream_ndjson_batches,
+    stream_parse_ndjson,
+)
+from services.template_detection import template_detection_index
+from services import log_template_service
 from core.custom_api_route import HandleResponseRoute
 from schemas.account import Permissions
-from core.dependencies.db import DBSession
+from core.dependencies.db import DBSession, DBReplicaSession
 from core.dependencies.aaa import require_permissions
 
 router = APIRouter(
@@ -15,6 +32,8 @@ router = APIRouter(
     tags=["tools"]
 )
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.post("/parse-log", response_model=LogParseResponse, status_code=status.HTTP_200_OK)
 @require_permissions(Permissions.admin)
@@ -23,14 +42,183 @@ async def parse_log(
 ) -> LogParseResponse:
     """
     Parse a log message using a template to extract structured ECS data.
-    
+
     Args:
         request: Log parsing request containing template and log message
-        
+
     Returns:
         LogParseResponse: Parsing result with structured data or error message
     """
     return parse_log_with_template(
         template_content_format=request.template_content_format,
         log_message=request.log_message
-    )
\ No newline at end of file
+    )
+
+
+async def _iter_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that may read the request body while it streams.
+
+    Before ASGI spec 2.4 (uvicorn reports 2.3), StreamingResponse listens
+    for client disconnects on the request's receive channel while it
+    streams, which would swallow the body chunks the stream still reads.
+    This one streams the way StreamingResponse does under spec 2.4: a
+    disconnect surfaces as a failed send instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+async def _read_log_upload(request: Request) -> Tuple[AsyncIterator[bytes], Optional[FormData]]:
+    """
+    Get the uploaded logs from a multipart `file` field or the raw body.
+
+    A raw body is read as it arrives, so results flow while it is still
+    being uploaded; a multipart upload is spooled by its form parser first.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        return request.stream(), None
+    form = await request.form()
+    upload = form.get("file")
+    if not isinstance(upload, UploadFile):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Multipart body must contain a 'file' field"
+        )
+    return _iter_upload(upload), form
+
+
+@router.post("/parse-log/stream", status_code=status.HTTP_200_OK)
+@require_permissions(Permissions.admin)
+async def parse_log_stream(
+    request: Request,
+    db: DBSession,
+    template_id: Optional[str] = None,
+    template_content_format: Optional[str] = None,
+    only_misses: bool = False,
+) -> StreamingResponse:
+    """
+    Parse newline-delimited logs in bulk and stream NDJSON results.
+
+    The logs are either a multipart upload (field `file`, optionally with a
+    `template_content_format` form field), spooled and then parsed chunk by
+    chunk, or the raw, possibly chunked, request body, parsed as it
+    arrives so results stream back while the upload continues. Each output
+    line is one parse result; the last line is a summary with match/miss
+    counts and throughput.
+
+    Args:
+        request: Incoming request carrying the logs
+        db: Database session
+        template_id: ID of a stored template to parse with
+        template_content_format: Template content, used when no template_id is given
+        only_misses: Only emit records for lines that do not match
+
+    Returns:
+        StreamingResponse: application/x-ndjson parse results
+    """
+    chunks, form = await _read_log_upload(request)
+    if form is not None:
+        template_content_format = template_content_format or form.get("template_content_format")
+
+    if template_id:
+        template = await log_template_service.get_template_by_id(db, template_id)
+        if not template:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Template not found"
+            )
+        template_content_format = template.content_format
+    if not template_content_format:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either template_id or template_content_format is required"
+        )
+
+    try:
+        parser = get_compiled_parser(template_content_format)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid template: {e}"
+        )
+
+    return DuplexStreamingResponse(
+        stream_parse_ndjson(parser, chunks, only_misses=only_misses),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/detect-template", response_model=TemplateDetectResponse, status_code=status.HTTP_200_OK)
+@require_permissions(Permissions.admin)
+async def detect_template(
+    request: TemplateDetectRequest,
+    db: DBReplicaSession
+) -> TemplateDetectResponse:
+    """
+    Identify which stored template a log message matches.
+
+    Args:
+        request: Detection request containing the log message
+        db: Database session
+
+    Returns:
+        TemplateDetectResponse: Matching templates, most specific first, and
+        the message parsed with the best one
+    """
+    await template_detection_index.refresh(db)
+    result = template_detection_index.detect(request.log_message)
+    best = result.best
+    return TemplateDetectResponse(
+        is_match=best is not None,
+        template_id=best.id if best else None,
+        template_name=best.name if best else None,
+        matches=[DetectedTemplate(id=t.id, name=t.name) for t in result.matches],
+        parsed_ecs=result.parsed_ecs,
+    )
+
+
+@router.post("/detect-template/stream", status_code=status.HTTP_200_OK)
+@require_permissions(Permissions.admin)
+async def detect_template_stream(
+    request: Request,
+    db: DBReplicaSession,
+    only_misses: bool = False,
+) -> StreamingResponse:
+    """
+    Detect the template of newline-delimited logs in bulk and stream NDJSON results.
+
+    Takes the same multipart or raw body input as /parse-log/stream. Each
+    output line carries the best matching template of one input line; the
+    last line is a summary with match/miss counts and throughput.
+
+    Args:
+        request: Incoming request carrying the logs
+        db: Database session
+        only_misses: Only emit records for lines that match no template
+
+    Returns:
+        StreamingResponse: application/x-ndjson detection results
+    """
+    chunks, _ = await _read_log_upload(request)
+    await template_detection_index.refresh(db)
+
+    def detect_batch(lines, first_line_no):
+        return template_detection_index.detect_lines_to_ndjson(lines, first_line_no, only_misses)
+
+    return DuplexStreamingResponse(
+        stream_ndjson_batches(chunks, detect_batch),
+        media_type="application/x-ndjson",
+    )
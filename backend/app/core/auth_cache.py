@@ -0,0 +1,142 @@
+"""
+In-process TTL cache for authenticated account and permission lookups.
+
+Every protected endpoint needs the account's blocked flag and the permission
+names of its role. Resolving those costs an ``Account`` query plus two selectin
+loads, so the result is cached per account id for a short TTL. Mutations in
+``services/account.py`` publish the account id on a Redis channel and every
+API process evicts the entry, so changes apply before the TTL runs out.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from redis import asyncio as aioredis
+
+from core.fastapi_logger import fastapi_logger as logger
+from core.settings import cfg
+
+AUTH_INVALIDATION_CHANNEL = "auth_invalidate"
+# published instead of an account id when a role (and therefore many accounts) changed
+INVALIDATE_ALL = "*"
+
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """Authorization facts of an account, safe to share between requests."""
+
+    account_id: str
+    role_name: Optional[str]
+    permissions: frozenset[str]
+    is_blocked: bool
+
+    @classmethod
+    def from_account(cls, account) -> "AuthPrincipal":
+        role = account.role
+        return cls(
+            account_id=account.id,
+            role_name=role.name if role else None,
+            permissions=frozenset(p.name for p in role.permissions) if role else frozenset(),
+            is_blocked=bool(account.is_blocked),
+        )
+
+
+class AuthCache:
+    """Account id -> ``AuthPrincipal`` mapping with per-entry expiry."""
+
+    def __init__(self, ttl_seconds: float, max_size: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[float, AuthPrincipal]] = {}
+
+    def get(self, account_id: str) -> Optional[AuthPrincipal]:
+        entry = self._entries.get(account_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(account_id, None)
+            return None
+        return principal
+
+    def put(self, principal: AuthPrincipal) -> AuthPrincipal:
+        if self.ttl_seconds <= 0:
+            return principal
+        if len(self._entries) >= self.max_size:
+            self._evict_expired()
+            if len(self._entries) >= self.max_size:
+                # drop the oldest insertion, dicts keep insertion order
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[principal.account_id] = (
+            time.monotonic() + self.ttl_seconds,
+            principal,
+        )
+        return principal
+
+    def invalidate(self, account_id: str) -> None:
+        if account_id == INVALIDATE_ALL:
+            self._entries.clear()
+        else:
+            self._entries.pop(account_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+auth_cache = AuthCache(
+    ttl_seconds=cfg.AUTH_CACHE_TTL_SECONDS,
+    max_size=cfg.AUTH_CACHE_MAX_SIZE,
+)
+
+_publisher: Optional[aioredis.Redis] = None
+
+
+def _get_publisher() -> aioredis.Redis:
+    global _publisher
+    if _publisher is None:
+        _publisher = aioredis.from_url(str(cfg.REDIS_URI), decode_responses=True)
+    return _publisher
+
+
+async def publish_auth_invalidation(account_id: str = INVALIDATE_ALL) -> None:
+    """
+    Evict an account (or everything) from the cache of every API process.
+
+    The local entry is dropped immediately; a failed publish is only logged
+    because the other processes will still expire the entry after the TTL.
+    """
+    auth_cache.invalidate(account_id)
+    try:
+        await _get_publisher().publish(AUTH_INVALIDATION_CHANNEL, account_id)
+    except Exception as e:
+        logger.warning(f"Failed to publish auth invalidation for {account_id}: {e}")
+
+
+async def listen_auth_invalidations() -> None:
+    """Apply invalidations published by other processes until cancelled."""
+    while True:
+        rds = aioredis.from_url(str(cfg.REDIS_URI), decode_responses=True)
+        try:
+            pubsub = rds.pubsub()
+            await pubsub.subscribe(AUTH_INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    auth_cache.invalidate(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # entries may be stale while disconnected, start from scratch
+            logger.warning(f"Auth invalidation listener error: {e}, reconnecting")
+            auth_cache.clear()
+            await asyncio.sleep(1)
+        finally:
+            await rds.aclose()
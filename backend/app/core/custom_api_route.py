@@ -20,8 +20,9 @@ router = APIRouter(
 """
 ## 异常处理
 
-from typing import Callable
+from typing import Any, Callable
 from fastapi import Request, Response, HTTPException
+from fastapi.datastructures import DefaultPlaceholder
 from fastapi.exceptions import RequestValidationError
 from fastapi.routing import APIRoute
 from fastapi.responses import JSONResponse
@@ -29,37 +30,73 @@ from fastapi.responses import JSONResponse
 # from airflow_client.client.exceptions import ApiException
 import json
 from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
 
 from .settings import cfg
 
 
+# 下面url bypass response格式化处理
+BYPASS_PATH_SUFFIXES = (
+    "export",
+    "/auth/login",
+    "/auth/samlp",
+    "/auth/logout",
+)
+BYPASS_PATH_PREFIXES = (
+    # "/airflow_mgmt/logs/download/"
+)
+
+
+class EnvelopeJSONResponse(JSONResponse):
+    """
+    JSONResponse that wraps the handler content in the success envelope while
+    rendering, so the body is serialized exactly once.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(
+            {
+                "success": True,
+                "data": content,
+                "errorMessage": "",
+            }
+        )
+
+
 class HandleResponseRoute(APIRoute):
     def get_route_handler(self) -> Callable:
-        original_route_handler = super().get_route_handler()
+        # decided once per route instead of on every request. Runs again for
+        # the prefixed copy include_router makes, so response_class is only
+        # swapped while building the handler: a router route's un-prefixed
+        # path (e.g. /login) must not leak its decision into the app route
+        self.bypass_envelope = self.path.endswith(
+            BYPASS_PATH_SUFFIXES
+        ) or self.path.startswith(BYPASS_PATH_PREFIXES)
+        response_class = self.response_class
+        if not self.bypass_envelope and isinstance(
+            response_class, DefaultPlaceholder
+        ):
+            self.response_class = EnvelopeJSONResponse
+        try:
+            original_route_handler = super().get_route_handler()
+        finally:
+            self.response_class = response_class
 
         async def custom_route_handler(request: Request) -> Response:
             try:
                 response: Response = await original_route_handler(request)
-                # 下面url bypass response格式化处理
-                if request.url.path.endswith(
-                    (
-                        "export",
-                        "/auth/login",
-                        "/auth/samlp",
-                        "/auth/logout"
-                    )
-                ) or request.url.path.startswith(
-                    (
-                        # "/airflow_mgmt/logs/download/"
-                    )
-                ):
+                if self.bypass_envelope or isinstance(response, EnvelopeJSONResponse):
                     return response
                 else:
                     # Check if status code allows response body
                     # Status codes like 204 (No Content), 304 (Not Modified) cannot have a body
                     if response.status_code in (204, 304) or (100 <= response.status_code < 200):
                         return response
-                    
+
+                    # handler returned its own Response, re-wrap JSON bodies only
+                    # (streaming and file responses pass through untouched)
+                    if not isinstance(response, JSONResponse):
+                        return response
                     body = json.loads(response.body)
 
                     content = {
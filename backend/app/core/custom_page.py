@@ -1,18 +1,33 @@
+import base64
+import time
 from dataclasses import dataclass
-from typing import Any, Generic, Sequence, Type, TypeVar
+from datetime import datetime
+from typing import Any, Dict, Generic, Optional, Sequence, Tuple, Type, TypeVar
 
-from fastapi import Query
+from fastapi import HTTPException, Query
 from pydantic import Field
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_pagination.api import create_page, resolve_params
 from fastapi_pagination.bases import AbstractParams, BasePage, RawParams
 
+from .settings import cfg
+
 
 @dataclass
 class CustomParams(AbstractParams):
     current: int = Query(1, ge=1, description="Page number")
     pageSize: int = Query(20, ge=1, description="Page size")
+    after: Optional[str] = Query(
+        None,
+        description="Keyset cursor of the last row already seen (`nextCursor` of the "
+        "previous page); when set, `current` is ignored",
+    )
 
     def to_raw_params(self) -> RawParams:
+        if self.after:
+            return RawParams(limit=self.pageSize, offset=0)
         return RawParams(
             limit=self.pageSize,
             offset=self.pageSize * (self.current - 1),
@@ -28,6 +43,9 @@ class Page(BasePage[T], Generic[T]):
     total: int = Field(..., description="Total number of items")
     current: int = Field(..., description="Current index")
     pageSize: int = Field(..., description="Number of rows per page")
+    nextCursor: Optional[str] = Field(
+        None, description="Cursor for the next page (pass as `after`)"
+    )
 
     __params_type__ = CustomParams
 
@@ -43,3 +61,112 @@ class Page(BasePage[T], Generic[T]):
             pageSize=params.pageSize,
             **kwargs,
         )
+
+
+class TotalCountCache:
+    """
+    Short-lived cache for list totals, so polling a list does not run a
+    COUNT(*) on every request. Keys are tuples whose first item is the table
+    name; creates and deletes invalidate every key of their table.
+
+    Keys include free-text filters, so the cache holds at most `max_size`
+    keys: a full cache drops its expired keys, then the least recently used.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[Tuple, Tuple[float, int]] = {}
+
+    def get(self, key: Tuple) -> Optional[int]:
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        # re-inserted as the most recently used, dicts keep insertion order
+        self._entries[key] = entry
+        return entry[1]
+
+    def put(self, key: Tuple, total: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_size:
+            self._evict_expired()
+            while len(self._entries) >= self.max_size:
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, total)
+
+    def invalidate(self, table: str) -> None:
+        for key in [k for k in self._entries if k[0] == table]:
+            del self._entries[key]
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+total_count_cache = TotalCountCache(
+    ttl_seconds=cfg.LIST_TOTAL_CACHE_TTL_SECONDS,
+    max_size=cfg.LIST_TOTAL_CACHE_MAX_SIZE,
+)
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Opaque cursor of a row, URL-safe base64 so it needs no query string encoding."""
+    raw = f"{created_at.isoformat()},{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = raw.rsplit(",", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except ValueError:
+        # binascii.Error and UnicodeDecodeError are ValueErrors too
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    query: Select,
+    *,
+    count_key: Tuple,
+    created_at_column: Any,
+    id_column: Any,
+) -> Page:
+    """
+    Paginate a projection query ordered by (created_at, id) descending.
+
+    Without `after` this is the usual current/pageSize page. With `after` the
+    page is read by an index-backed seek past the cursor instead of an OFFSET.
+    The total comes from `total_count_cache` when it is still fresh.
+    """
+    params: CustomParams = resolve_params()
+
+    total = total_count_cache.get(count_key)
+    if total is None:
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+        total = await db.scalar(count_query)
+        total_count_cache.put(count_key, total)
+
+    raw_params = params.to_raw_params()
+    if params.after:
+        cursor_created_at, cursor_id = decode_cursor(params.after)
+        query = query.where(
+            tuple_(created_at_column, id_column) < tuple_(cursor_created_at, cursor_id)
+        )
+    query = query.limit(raw_params.limit).offset(raw_params.offset)
+
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) == params.pageSize:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return create_page(rows, total=total, params=params, nextCursor=next_cursor)
@@ -4,12 +4,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from fastapi_decorators import depends
 from sqlalchemy import select
-from sqlalchemy.orm import Session
 
 from schemas.account import Permissions
-from core.security import verify_password
+from core.security import verify_password_async
 from models.aaa import Account
 from core.auth_jwt import AuthJWT
+from core.auth_cache import AuthPrincipal, auth_cache
 from core.dependencies.db import DBSession
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -17,36 +17,62 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 # aaa section
 
 
-def authenticate_user(db: Session, username: str, password: str):
-    user: Account = db.query(Account).filter(Account.username == username).first()
-    if not user or not verify_password(password, user.password_hashed):
+async def authenticate_user(db: DBSession, username: str, password: str):
+    mgmt = await db.scalars(select(Account).filter(Account.username == username))
+    user: Account = mgmt.first()
+    if not user or not await verify_password_async(password, user.password_hashed):
         raise HTTPException(status_code=401, detail="Bad username or password")
     return user
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: DBSession,
-) -> Account:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def _get_token_subject(token: str) -> str:
     await AuthJWT.jwt_required(token)
 
     payload = AuthJWT.get_raw_jwt(token)
     uid = payload.get("sub")
     if not uid:
-        raise credentials_exception
+        raise _credentials_exception()
+    return uid
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: DBSession,
+) -> Account:
+    uid = await _get_token_subject(token)
     # user = db.query(Account).filter(Account.id == uid).first()
     mgmt = await db.scalars(select(Account).filter(Account.id == uid))
     user = mgmt.first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    auth_cache.put(AuthPrincipal.from_account(user))
     return user
 
 
+async def get_current_principal(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: DBSession,
+) -> AuthPrincipal:
+    """Like get_current_user, but served from the auth cache when possible."""
+    uid = await _get_token_subject(token)
+    principal = auth_cache.get(uid)
+    if principal is None:
+        mgmt = await db.scalars(select(Account).filter(Account.id == uid))
+        user = mgmt.first()
+        if user is None:
+            raise _credentials_exception()
+        principal = auth_cache.put(AuthPrincipal.from_account(user))
+    return principal
+
+
 async def get_current_active_user(
     user: Annotated[Account, Depends(get_current_user)],
 ):
@@ -55,26 +81,37 @@ async def get_current_active_user(
     return user
 
 
+async def get_current_active_principal(
+    principal: Annotated[AuthPrincipal, Depends(get_current_principal)],
+) -> AuthPrincipal:
+    if principal.is_blocked:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+
 def require_permissions(*required_permissions: list[Permissions]):
+    required = frozenset(
+        p.value if isinstance(p, Permissions) else p for p in required_permissions
+    )
+
     @depends
-    def dependency(user: Account = Depends(get_current_active_user)):
-        user_permissions = [i.name for i in user.role.permissions]
-        for permission in required_permissions:
-            p = permission.value if isinstance(permission, Permissions) else permission
-            if p not in user_permissions:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not enough permissions",
-                )
-        return user
+    def dependency(
+        principal: AuthPrincipal = Depends(get_current_active_principal),
+    ):
+        if not required <= principal.permissions:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return principal
 
     return dependency
 
 
 async def is_admin(
-    user: Annotated[Account, Depends(get_current_user)],
+    principal: Annotated[AuthPrincipal, Depends(get_current_principal)],
 ) -> bool:
-    if user.role.name != "admin":
+    if principal.role_name != "admin":
         return False
     return True
 
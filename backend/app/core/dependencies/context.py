@@ -15,6 +15,7 @@ class FastAPIAppContext(BaseModel):
 
 class State(TypedDict):
     sessionmaker: async_sessionmaker[AsyncSession]
+    replica_sessionmaker: async_sessionmaker[AsyncSession]
     context: FastAPIAppContext
 
 
@@ -1,9 +1,15 @@
+import time
 from typing import Annotated
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response
 from collections.abc import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from core.settings import cfg
+
+# cookie holding the epoch until which this client must read from the primary
+READ_PRIMARY_UNTIL_COOKIE = "ls_read_primary_until"
+
 
 async def create_async_sessionmaker(
     engine: AsyncEngine,
@@ -30,16 +36,54 @@ async def get_async_db_session(
 DBSession = Annotated[AsyncSession, Depends(get_async_db_session)]
 
 
-# async def get_async_replica_sessionmaker(
-#     request: Request,
-# ) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
-#     yield request.state.replica_sessionmaker
+async def get_async_replica_sessionmaker(
+    request: Request,
+) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """
+    Sessionmaker for read-only endpoints.
+
+    Falls back to the primary when no replica is configured, and for clients
+    that mutated something within the last DB_READ_YOUR_WRITES_SECONDS so
+    they never read data older than their own writes.
+    """
+    if _reads_own_writes(request):
+        yield request.state.sessionmaker
+    else:
+        yield request.state.replica_sessionmaker
+
+
+async def get_async_db_replica_session(
+    sessionmaker: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_async_replica_sessionmaker)
+    ],
+) -> AsyncGenerator[AsyncSession, None]:
+    async with sessionmaker() as session:
+        yield session
+
+
+DBReplicaSession = Annotated[AsyncSession, Depends(get_async_db_replica_session)]
+
+
+def _reads_own_writes(request: Request) -> bool:
+    until = request.cookies.get(READ_PRIMARY_UNTIL_COOKIE)
+    if not until:
+        return False
+    try:
+        return float(until) > time.time()
+    except ValueError:
+        return False
 
-# async def get_async_db_replica_session(
-#     sessionmaker: Annotated[
-#         async_sessionmaker[AsyncSession], Depends(get_async_replica_sessionmaker)
-#     ],
-# ) -> AsyncGenerator[AsyncSession, None]:
-#     async with sessionmaker() as session:
-#         yield session
 
+def mark_read_primary_window(request: Request, response: Response) -> None:
+    """Pin the client's reads to the primary after a successful mutation."""
+    if request.method in ("GET", "HEAD", "OPTIONS") or response.status_code >= 400:
+        return
+    window = cfg.DB_READ_YOUR_WRITES_SECONDS
+    if window <= 0:
+        return
+    response.set_cookie(
+        READ_PRIMARY_UNTIL_COOKIE,
+        str(time.time() + window),
+        max_age=window,
+        httponly=True,
+    )
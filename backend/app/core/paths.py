@@ -0,0 +1,24 @@
+"""
+Confinement of job file paths to the directories configured for them.
+
+The API checks paths when a job is saved, for early feedback; the worker
+checks them again against its own filesystem before opening anything, since
+it runs on another host and rows may predate the settings.
+"""
+import os
+from typing import Optional
+
+
+def resolve_within(path: Optional[str], root: str) -> Optional[str]:
+    """
+    Resolve an absolute path, following symlinks and .., if it lies inside root.
+
+    Returns:
+        The resolved path, or None when path is empty, relative or resolves
+        outside root
+    """
+    if not path or not os.path.isabs(path):
+        return None
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(path)
+    return resolved if os.path.commonpath([resolved, root]) == root else None
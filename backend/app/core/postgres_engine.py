@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy.orm import declarative_base
 from .settings import cfg
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
@@ -5,7 +6,8 @@ import ssl
 import os
 
 
-async def create_pg_engine() -> AsyncEngine:
+async def create_pg_engine(db_uri: Optional[str] = None) -> AsyncEngine:
+    db_uri = db_uri or cfg.APP_DB_URI
     # Check if SSL is enabled through environment variables
     if cfg.DB_SSL_ENABLED:
         # Create an SSLContext with proper security defaults
@@ -44,10 +46,10 @@ async def create_pg_engine() -> AsyncEngine:
         # ssl_context.check_hostname = False
         # ssl_context.verify_mode = ssl.CERT_NONE
         
-        engine = create_async_engine(cfg.APP_DB_URI, connect_args={"ssl": ssl_context})
+        engine = create_async_engine(db_uri, connect_args={"ssl": ssl_context})
     else:
         # Non-SSL connection
-        engine = create_async_engine(cfg.APP_DB_URI)
+        engine = create_async_engine(db_uri)
 
     return engine
 
@@ -1,9 +1,16 @@
 
+import asyncio
 import bcrypt
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, TypeVar
 from cryptography.fernet import Fernet
 from .settings import cfg
 
+T = TypeVar("T")
+
 # Generate or validate Fernet key
 def get_or_generate_fernet_key():
     """
@@ -69,6 +76,78 @@ def verify_password(plain_password: str, hashed_password: str):
     )
 
 
+# bcrypt takes ~200ms of CPU per call, keep it off the event loop in a
+# dedicated, bounded pool so login bursts cannot starve other requests
+_password_executor = ThreadPoolExecutor(
+    max_workers=cfg.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+
+
+@dataclass
+class PasswordHashStats:
+    """Latency counters for one password operation."""
+
+    count: int = 0
+    total_wait_ms: float = 0.0
+    total_run_ms: float = 0.0
+    max_latency_ms: float = 0.0
+
+    def observe(self, wait_ms: float, run_ms: float) -> None:
+        self.count += 1
+        self.total_wait_ms += wait_ms
+        self.total_run_ms += run_ms
+        self.max_latency_ms = max(self.max_latency_ms, wait_ms + run_ms)
+
+    def snapshot(self) -> Dict[str, float]:
+        n = self.count or 1
+        return {
+            "count": self.count,
+            "avg_wait_ms": round(self.total_wait_ms / n, 3),
+            "avg_run_ms": round(self.total_run_ms / n, 3),
+            "max_latency_ms": round(self.max_latency_ms, 3),
+        }
+
+
+password_hash_stats: Dict[str, PasswordHashStats] = {
+    "hash": PasswordHashStats(),
+    "verify": PasswordHashStats(),
+}
+
+
+async def _run_password_op(op: str, func: Callable[..., T], *args) -> T:
+    submitted = time.perf_counter()
+    started = submitted
+
+    def timed():
+        nonlocal started
+        started = time.perf_counter()
+        return func(*args)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _password_executor, timed
+        )
+    finally:
+        finished = time.perf_counter()
+        password_hash_stats[op].observe(
+            (started - submitted) * 1000, (finished - started) * 1000
+        )
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_password_op("hash", get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_op(
+        "verify", verify_password, plain_password, hashed_password
+    )
+
+
+def get_password_hash_stats() -> Dict[str, Dict[str, float]]:
+    return {op: stats.snapshot() for op, stats in password_hash_stats.items()}
+
+
 # generate uuid
 def gen_uuid() -> str:
     return str(uuid.uuid4())
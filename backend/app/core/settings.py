@@ -52,10 +52,46 @@ class Settings(BaseSettings):
     # Database settings
     APP_DB_URI : str
     DB_SSL_ENABLED: Optional[bool] = False
+    # Optional read replica for GET endpoints, unset means read from primary
+    APP_DB_REPLICA_URI: Optional[str] = None
+    # After a mutation, a client reads from primary for this many seconds
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
     
     # Redis settings
     REDIS_URI: str
-    
+
+    # Syslog over TLS (TLS jobs): verify-full checks the certificate chain and host name,
+    # verify-ca the certificate chain only, require encrypts without checking certificates
+    SYSLOG_TLS_MODE: str = "verify-full"
+    # CA bundle receivers are verified with, unset means the system CAs
+    SYSLOG_TLS_CA_FILE: Optional[str] = None
+    # Client certificate and key for receivers requiring mutual TLS
+    SYSLOG_TLS_CERT_FILE: Optional[str] = None
+    SYSLOG_TLS_KEY_FILE: Optional[str] = None
+
+    # Authorization header of HTTP jobs (ES_BULK, SPLUNK_HEC, HTTP_JSON),
+    # e.g. "Splunk <HEC token>" or "ApiKey <key>"; unset sends none
+    HTTP_SINK_AUTHORIZATION: Optional[str] = None
+
+    # Directory on the worker host FILE jobs and destinations may write to;
+    # file_path must resolve inside it (the standalone runner is not limited)
+    FILE_SINK_ROOT: str = "/var/lib/log-simulator/output"
+
+    # Directory on the worker host REPLAY jobs may read captures from;
+    # replay_path must resolve inside it
+    REPLAY_CAPTURE_ROOT: str = "/var/lib/log-simulator/captures"
+
+    # Authorization cache (seconds, 0 disables caching)
+    AUTH_CACHE_TTL_SECONDS: float = 5.0
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    # Max concurrent bcrypt hash/verify calls per process
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # List endpoint totals cache (seconds, 0 disables caching)
+    LIST_TOTAL_CACHE_TTL_SECONDS: float = 10.0
+    LIST_TOTAL_CACHE_MAX_SIZE: int = 1000
+
     # Application settings
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
     app_title: str = "Log Simulator"
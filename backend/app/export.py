@@ -0,0 +1,227 @@
+"""
+Offline dataset export: generate logs from a template into (compressed) files.
+
+Logs are generated with LogGenerator and stamped by a VirtualClock that
+spreads them evenly over [--start, --end). The range is split into --shards
+contiguous, time-ordered shards written in parallel by --workers processes,
+each buffering --buffer-size bytes before a write. Only the template YAML is
+read; the API, Redis and the database are not needed.
+
+Formats:
+    raw      one log per line
+    ndjson   {"@timestamp": <event time, UTC>, "message": <log>} per line
+
+Usage (from backend/):
+    python -m app.export fortigate_forward_traffic -n 1000000 \\
+        --start 2026-10-01T00:00:00Z --end 2026-10-08T00:00:00Z \\
+        --format ndjson --compress zstd -o /tmp/corpus
+"""
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# App modules are imported relative to this directory, as in the API and worker
+sys.path.insert(0, str(Path(__file__).parent))
+
+from services.log_generator import LogGenerator
+from services.virtual_clock import US_PER_SECOND, VirtualClock
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "predefined_templates"
+
+FORMATS = ("raw", "ndjson")
+COMPRESSIONS = ("none", "gzip", "zstd")
+EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+PROGRESS_SECONDS = 1.0
+# Logs between updates of a shard's progress counters
+PROGRESS_EVERY = 1000
+
+# Shared per-shard (logs, bytes) counters, set in every worker process
+_progress = None
+
+
+def load_template(template: str) -> tuple:
+    """
+    Resolve a predefined template id (file stem) or a YAML path.
+
+    Returns:
+        tuple: (template name, content_format)
+    """
+    path = Path(template)
+    if not path.exists():
+        path = TEMPLATES_DIR / f"{template}.yml"
+    if not path.exists():
+        raise FileNotFoundError(f"Template {template} is neither a YAML file nor one of {TEMPLATES_DIR}")
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    return path.stem, data["content_format"]
+
+
+def parse_time(value: str) -> datetime:
+    """ISO 8601 time, naive values are taken as UTC."""
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def open_output(path: Path, compress: str, level: Optional[int]) -> BinaryIO:
+    """Open a shard file for binary writes through the chosen compressor."""
+    if compress == "gzip":
+        return gzip.open(path, "wb", compresslevel=6 if level is None else level)
+    if compress == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd output needs the zstandard package (pip install zstandard)")
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return compressor.stream_writer(open(path, "wb"), closefd=True)
+    return open(path, "wb")
+
+
+def _init_worker(progress) -> None:
+    global _progress
+    _progress = progress
+
+
+def write_shard(shard: int, first: int, stop: int, clock: VirtualClock, template: str,
+                path: Path, fmt: str, compress: str, level: Optional[int],
+                buffer_size: int, seed: Optional[int]) -> tuple:
+    """
+    Generate logs [first, stop) of the export into one shard file.
+
+    Returns:
+        tuple: (logs written, uncompressed bytes written)
+
+    Progress counters count logs and (approximate) bytes generated so far.
+    """
+    generator = LogGenerator()
+    if seed is not None:
+        # distinct but reproducible values per shard
+        generator.fake.seed_instance(seed + shard)
+        random.seed(seed + shard)
+
+    ndjson = fmt == "ndjson"
+    utc_second, utc_prefix = None, ""
+    chunk = []
+    chunk_bytes = 0
+    written = total_bytes = 0
+    with open_output(path, compress, level) as output:
+        for index, context in clock.contexts(first, stop):
+            log = generator.generate_log(template, context)
+            if ndjson:
+                second, fraction = divmod(clock.time_us(index), US_PER_SECOND)
+                if second != utc_second:
+                    utc_second = second
+                    utc_prefix = datetime.fromtimestamp(second, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+                line = f'{{"@timestamp":"{utc_prefix}.{fraction:06d}Z","message":{json.dumps(log)}}}\n'
+            else:
+                line = log + "\n"
+            chunk.append(line)
+            chunk_bytes += len(line)
+
+            if chunk_bytes >= buffer_size:
+                data = "".join(chunk).encode("utf-8")
+                output.write(data)
+                written += len(chunk)
+                total_bytes += len(data)
+                chunk, chunk_bytes = [], 0
+            if _progress is not None and (index - first) % PROGRESS_EVERY == 0:
+                _progress[2 * shard] = written + len(chunk)
+                _progress[2 * shard + 1] = total_bytes + chunk_bytes
+
+        if chunk:
+            data = "".join(chunk).encode("utf-8")
+            output.write(data)
+            written += len(chunk)
+            total_bytes += len(data)
+    if _progress is not None:
+        _progress[2 * shard] = written
+        _progress[2 * shard + 1] = total_bytes
+    return written, total_bytes
+
+
+def print_progress(progress, count: int, started: float, final: bool = False) -> None:
+    logs = sum(progress[0::2])
+    size = sum(progress[1::2])
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    print(
+        f"\r{logs}/{count} logs ({logs / count:.0%}), {logs / elapsed:,.0f} logs/s, "
+        f"{size / elapsed / 1e6:.1f} MB/s uncompressed",
+        end="\n" if final or not sys.stderr.isatty() else "", file=sys.stderr, flush=True
+    )
+
+
+def main(argv=None) -> None:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m app.export", description="Generate logs from a template into files"
+    )
+    arg_parser.add_argument("template", help="Predefined template id (file stem) or path to a template YAML")
+    arg_parser.add_argument("-n", "--count", type=int, required=True, help="Number of logs")
+    arg_parser.add_argument("--start", type=parse_time, help="Event time of the first log (default: --end - 1 day)")
+    arg_parser.add_argument("--end", type=parse_time, help="End of the event time range (default: now)")
+    arg_parser.add_argument("-o", "--output", type=Path, default=Path("export"), help="Output directory")
+    arg_parser.add_argument("--format", choices=FORMATS, default="raw", help="Line format")
+    arg_parser.add_argument("--compress", choices=COMPRESSIONS, default="none", help="Shard compression")
+    arg_parser.add_argument("--level", type=int, help="Compression level")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel processes")
+    arg_parser.add_argument("--shards", type=int, help="Output files (default: --workers)")
+    arg_parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE,
+                            help="Bytes buffered before each write")
+    arg_parser.add_argument("--seed", type=int, help="Random seed for the generated values (uuid placeholders stay random)")
+    args = arg_parser.parse_args(argv)
+
+    if args.count < 1:
+        arg_parser.error("--count must be at least 1")
+    if args.compress == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            arg_parser.error("--compress zstd needs the zstandard package (pip install zstandard)")
+    end = args.end or datetime.now(timezone.utc)
+    start = args.start or end - timedelta(days=1)
+    if end <= start:
+        arg_parser.error("--end must be after --start")
+    shards = max(1, min(args.shards or args.workers, args.count))
+    workers = max(1, min(args.workers, shards))
+
+    name, template = load_template(args.template)
+    clock = VirtualClock.spanning(start, end, args.count)
+    args.output.mkdir(parents=True, exist_ok=True)
+    extension = (".ndjson" if args.format == "ndjson" else ".log") + EXTENSIONS[args.compress]
+    print(f"Exporting {args.count} logs of {name} from {start.isoformat()} to {end.isoformat()} "
+          f"into {shards} shard(s) with {workers} process(es)", file=sys.stderr)
+
+    progress = multiprocessing.Array("q", 2 * shards, lock=False)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(progress,)) as pool:
+        futures = [
+            pool.submit(
+                write_shard, shard,
+                shard * args.count // shards, (shard + 1) * args.count // shards,
+                clock, template, args.output / f"{name}-{shard:05d}-of-{shards:05d}{extension}",
+                args.format, args.compress, args.level, args.buffer_size, args.seed,
+            )
+            for shard in range(shards)
+        ]
+        while not all(future.done() for future in futures):
+            time.sleep(PROGRESS_SECONDS)
+            print_progress(progress, args.count, started)
+        results = [future.result() for future in futures]
+
+    print_progress(progress, args.count, started, final=True)
+    size = sum(path.stat().st_size for path in args.output.glob(f"{name}-*-of-{shards:05d}{extension}"))
+    print(f"Wrote {sum(r[0] for r in results)} logs, {sum(r[1] for r in results) / 1e6:.1f} MB "
+          f"({size / 1e6:.1f} MB on disk) to {args.output} in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
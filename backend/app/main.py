@@ -1,13 +1,15 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
 from collections.abc import AsyncIterator
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from core.dependencies.db import create_async_sessionmaker
+from core.dependencies.db import create_async_sessionmaker, mark_read_primary_window
 from core.postgres_engine import create_pg_engine
 from core.dependencies.context import State
 
 from core.auth_jwt.auth_config import AuthConfig
 from core.dependencies.redis import get_auth_redis
+from core.auth_cache import listen_auth_invalidations
 from core.settings import cfg, get_settings
 
 from fastapi_pagination import add_pagination
@@ -41,10 +43,25 @@ async def token_in_denylist(raw_jwt_token):
 async def lifespan(app: FastAPI) -> AsyncIterator[State]:
     engine = await create_pg_engine()
     sessionmaker = await create_async_sessionmaker(engine)
+    # reads go to the replica when one is configured, otherwise to primary
+    replica_engine = None
+    replica_sessionmaker = sessionmaker
+    if cfg.APP_DB_REPLICA_URI:
+        replica_engine = await create_pg_engine(cfg.APP_DB_REPLICA_URI)
+        replica_sessionmaker = await create_async_sessionmaker(replica_engine)
+    auth_listener = asyncio.create_task(listen_auth_invalidations())
     yield {
             "engine": engine,
             "sessionmaker": sessionmaker,
+            "replica_sessionmaker": replica_sessionmaker,
         }
+    auth_listener.cancel()
+    try:
+        await auth_listener
+    except asyncio.CancelledError:
+        pass
+    if replica_engine is not None:
+        await replica_engine.dispose()
     await engine.dispose()
 
 
@@ -67,6 +84,13 @@ app.add_middleware(
 add_pagination(app)
 
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    mark_read_primary_window(request, response)
+    return response
+
+
 # Include routers
 app.include_router(auth.router, prefix="/auth")
 app.include_router(jobs.router, prefix="/jobs")
@@ -2,9 +2,9 @@
 Job model for managing log sending jobs.
 """
 import enum
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import String, Integer, Enum, ForeignKey, DateTime
+from sqlalchemy import String, Integer, Float, Boolean, Enum, ForeignKey, DateTime, Index, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import BaseModel
 
@@ -16,6 +16,11 @@ class ProtocolEnum(str, enum.Enum):
     """Enum for supported network protocols."""
     TCP = "TCP"
     UDP = "UDP"
+    TLS = "TLS"
+    ES_BULK = "ES_BULK"
+    SPLUNK_HEC = "SPLUNK_HEC"
+    HTTP_JSON = "HTTP_JSON"
+    FILE = "FILE"
 
 
 class JobStatusEnum(str, enum.Enum):
@@ -26,6 +31,34 @@ class JobStatusEnum(str, enum.Enum):
     ERROR = "ERROR"
 
 
+class JobModeEnum(str, enum.Enum):
+    """Enum for how a job paces its logs."""
+    CONSTANT = "CONSTANT"
+    RAMP = "RAMP"
+    BACKFILL = "BACKFILL"
+    REPLAY = "REPLAY"
+
+
+class SyslogFormatEnum(str, enum.Enum):
+    """Enum for the syslog header put in front of each log."""
+    RAW = "RAW"
+    RFC3164 = "RFC3164"
+    RFC5424 = "RFC5424"
+
+
+class TcpFramingEnum(str, enum.Enum):
+    """Enum for how logs are delimited on a TCP stream."""
+    NEWLINE = "NEWLINE"
+    OCTET_COUNTING = "OCTET_COUNTING"
+
+
+class FsyncPolicyEnum(str, enum.Enum):
+    """Enum for when FILE jobs fsync their file."""
+    NONE = "NONE"
+    ROTATE = "ROTATE"
+    WRITE = "WRITE"
+
+
 class Job(BaseModel):
     """
     Model for log sending jobs.
@@ -35,25 +68,141 @@ class Job(BaseModel):
     """
     
     __tablename__ = "jobs"
+    __table_args__ = (
+        # list endpoints sort and keyset-seek by (created_at, id), newest first
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+    )
     
     # Reference to the log template to use
-    template_id: Mapped[str] = mapped_column(String(64), ForeignKey("log_templates.id"))
+    template_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("log_templates.id"), index=True
+    )
+    
+    template_weight: Mapped[Optional[float]] = mapped_column(
+        Float,
+        comment="Weight of the template among the job's templates (null for 1)"
+    )
 
     # Network protocol to use
     protocol: Mapped[ProtocolEnum] = mapped_column(
         Enum(ProtocolEnum),
-        comment="Network protocol (TCP or UDP)"
+        comment="Network protocol (TCP, UDP, syslog over TLS, an HTTP bulk API: ES_BULK, SPLUNK_HEC, HTTP_JSON, or a local FILE)"
     )
     
     # Destination configuration
-    destination_host: Mapped[str] = mapped_column(
+    destination_host: Mapped[Optional[str]] = mapped_column(
         String(255),
-        comment="Target host IP address or hostname"
+        comment="Target host IP address or hostname (null for FILE)"
     )
     
-    destination_port: Mapped[int] = mapped_column(
+    destination_port: Mapped[Optional[int]] = mapped_column(
         Integer,
-        comment="Target port number"
+        comment="Target port number (null for FILE)"
+    )
+    
+    # Syslog header and TCP framing of every log
+    syslog_format: Mapped[SyslogFormatEnum] = mapped_column(
+        Enum(SyslogFormatEnum),
+        default=SyslogFormatEnum.RAW,
+        server_default=SyslogFormatEnum.RAW.value,
+        comment="Syslog header (RAW for none, RFC3164 or RFC5424)"
+    )
+    
+    tcp_framing: Mapped[TcpFramingEnum] = mapped_column(
+        Enum(TcpFramingEnum),
+        default=TcpFramingEnum.NEWLINE,
+        server_default=TcpFramingEnum.NEWLINE.value,
+        comment="TCP framing (NEWLINE-terminated or RFC 6587 OCTET_COUNTING)"
+    )
+    
+    syslog_pri: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Syslog PRI, facility * 8 + severity (null for 134, local0.info)"
+    )
+    
+    syslog_hostname: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        comment="Syslog HOSTNAME (null for the worker's hostname)"
+    )
+    
+    syslog_appname: Mapped[Optional[str]] = mapped_column(
+        String(48),
+        comment="Syslog APP-NAME / TAG (null for log-simulator)"
+    )
+    
+    # HTTP protocols post logs in batches
+    http_path: Mapped[Optional[str]] = mapped_column(
+        String(1024),
+        comment="HTTP: request path (null for /_bulk, /services/collector/event or /)"
+    )
+    
+    http_index: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        comment="HTTP: Elasticsearch or Splunk index (null for log-simulator or the token's default)"
+    )
+    
+    http_batch_size: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="HTTP: logs per request (null for 500)"
+    )
+    
+    http_batch_age_ms: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="HTTP: longest a log waits for its batch to fill (null for 1000)"
+    )
+    
+    http_max_in_flight: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="HTTP: concurrent requests and pooled connections (null for 4)"
+    )
+    
+    http_gzip: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        comment="HTTP: gzip request bodies"
+    )
+    
+    http_tls: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        comment="HTTP: use HTTPS"
+    )
+    
+    # FILE writes logs to a local file or named pipe
+    file_path: Mapped[Optional[str]] = mapped_column(
+        String(1024),
+        comment="FILE: path of the file or named pipe on the worker host"
+    )
+    
+    file_rotate_mb: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="FILE: rotate the file at this size in MiB (null for no size rotation)"
+    )
+    
+    file_rotate_seconds: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="FILE: rotate the file at this age in seconds (null for no time rotation)"
+    )
+    
+    file_rotate_keep: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="FILE: rotated files to keep (null to keep all)"
+    )
+    
+    file_gzip: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        comment="FILE: write a gzip stream"
+    )
+    
+    file_fsync: Mapped[FsyncPolicyEnum] = mapped_column(
+        Enum(FsyncPolicyEnum),
+        default=FsyncPolicyEnum.NONE,
+        server_default=FsyncPolicyEnum.NONE.value,
+        comment="FILE: fsync policy (NONE, on ROTATE and close, or after every WRITE)"
     )
     
     # Job status
@@ -86,10 +235,133 @@ class Job(BaseModel):
         comment="Delay in milliseconds between each log sent"
     )
     
-    # Relationship to log template
+    embed_sequence: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        comment="Embed job id, sequence number and send time ({sim.*} placeholders or a trailer) in each log"
+    )
+    
+    # Pacing mode, RAMP searches the destination's saturation point
+    mode: Mapped[JobModeEnum] = mapped_column(
+        Enum(JobModeEnum),
+        default=JobModeEnum.CONSTANT,
+        server_default=JobModeEnum.CONSTANT.value,
+        comment="Pacing mode (CONSTANT interval, adaptive RAMP, BACKFILL of a past time range or REPLAY of a capture)"
+    )
+    
+    ramp_base_eps: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="RAMP: logs per second of the first step"
+    )
+    
+    ramp_factor: Mapped[Optional[float]] = mapped_column(
+        Float,
+        comment="RAMP: rate multiplier between steps"
+    )
+    
+    ramp_step_seconds: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="RAMP: duration of each step in seconds"
+    )
+    
+    ramp_max_eps: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="RAMP: rate not to exceed (null for no limit)"
+    )
+    
+    backfill_eps: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="BACKFILL: logs per second of event time between start_time and end_time"
+    )
+    
+    prerender_pool: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="RAMP/BACKFILL: logs rendered once and re-sent with patched timestamps (null to render every log)"
+    )
+    
+    # REPLAY sends a capture file instead of generated logs
+    replay_path: Mapped[Optional[str]] = mapped_column(
+        String(1024),
+        comment="REPLAY: path of the capture file on the worker host"
+    )
+    
+    replay_speed: Mapped[Optional[float]] = mapped_column(
+        Float,
+        comment="REPLAY: speed multiplier of the capture's timing (null for 1, 0 for as fast as possible)"
+    )
+    
+    replay_loop: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        comment="REPLAY: restart the capture when it ends"
+    )
+    
+    replay_rewrite_timestamps: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        comment="REPLAY: replace the capture's timestamps with the time each line is sent"
+    )
+    
+    # Result of the last RAMP run
+    saturation_eps: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Highest sustainable logs per second found by the last ramp"
+    )
+    
+    saturation_reason: Mapped[Optional[str]] = mapped_column(
+        String(512),
+        comment="What limited the last ramp"
+    )
+    
+    saturation_measured_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="When the last ramp settled"
+    )
+    
+    # Delivery to the job's own destination in its last run
+    logs_delivered: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Logs the destination accepted in the last run"
+    )
+    
+    delivery_errors: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Failed writes to the destination in the last run"
+    )
+    
+    delivery_reconnects: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Reconnects to the destination in the last run"
+    )
+    
+    delivery_last_error: Mapped[Optional[str]] = mapped_column(
+        String(512),
+        comment="Last error writing to the destination in the last run"
+    )
+    
+    # Relationship to log template, load it explicitly where it is needed
     template: Mapped["LogTemplate"] = relationship(
         back_populates="jobs",
-        lazy="selectin"
+        lazy="raise"
+    )
+    
+    # Extra destinations every log is also sent to, load them explicitly where they are needed
+    destinations: Mapped[List["JobDestination"]] = relationship(
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="JobDestination.position",
+        lazy="raise"
+    )
+    
+    # Extra templates logs are drawn from by weight, load them explicitly where they are needed
+    templates: Mapped[List["JobTemplate"]] = relationship(
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="JobTemplate.position",
+        lazy="raise"
     )
     
     # def __repr__(self) -> str:
@@ -98,3 +370,120 @@ class Job(BaseModel):
     #         f"protocol={self.protocol}, destination={self.destination_host}:{self.destination_port}, "
     #         f"status={self.status})>"
     #     )
+
+
+class JobDestination(BaseModel):
+    """
+    Model for the extra destinations of a job.
+    
+    Every log of the job is rendered once and sent to the job's own
+    destination and to each of its extra destinations, with their own
+    protocol; the job's other settings (syslog header, HTTP batching,
+    FILE rotation) apply to all of them.
+    """
+    
+    __tablename__ = "job_destinations"
+    
+    job_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("jobs.id", ondelete="CASCADE"), index=True
+    )
+    
+    position: Mapped[int] = mapped_column(
+        Integer,
+        comment="Order of the destination among the job's extra destinations"
+    )
+    
+    protocol: Mapped[ProtocolEnum] = mapped_column(
+        Enum(ProtocolEnum),
+        comment="Network protocol, as for the job"
+    )
+    
+    destination_host: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        comment="Target host IP address or hostname (null for FILE)"
+    )
+    
+    destination_port: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Target port number (null for FILE)"
+    )
+    
+    file_path: Mapped[Optional[str]] = mapped_column(
+        String(1024),
+        comment="FILE: path of the file or named pipe on the worker host"
+    )
+    
+    http_path: Mapped[Optional[str]] = mapped_column(
+        String(1024),
+        comment="HTTP: request path (null for the protocol's default)"
+    )
+    
+    http_index: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        comment="HTTP: Elasticsearch or Splunk index (null for the default)"
+    )
+    
+    # Delivery to this destination in the job's last run
+    logs_delivered: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Logs the destination accepted in the last run"
+    )
+    
+    delivery_errors: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Failed writes to the destination in the last run"
+    )
+    
+    delivery_reconnects: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        comment="Reconnects to the destination in the last run"
+    )
+    
+    delivery_last_error: Mapped[Optional[str]] = mapped_column(
+        String(512),
+        comment="Last error writing to the destination in the last run"
+    )
+    
+    job: Mapped["Job"] = relationship(
+        back_populates="destinations",
+        lazy="raise"
+    )
+
+
+class JobTemplate(BaseModel):
+    """
+    Model for the extra templates of a job.
+    
+    Every log of the job is generated from its template or one of its
+    extra templates, drawn in proportion to their weights, and sent over
+    the job's one connection at the job's one rate.
+    """
+    
+    __tablename__ = "job_templates"
+    
+    job_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("jobs.id", ondelete="CASCADE"), index=True
+    )
+    
+    position: Mapped[int] = mapped_column(
+        Integer,
+        comment="Order of the template among the job's extra templates"
+    )
+    
+    template_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("log_templates.id", ondelete="CASCADE"), index=True
+    )
+    
+    weight: Mapped[float] = mapped_column(
+        Float,
+        comment="Weight of the template among the job's templates"
+    )
+    
+    job: Mapped["Job"] = relationship(
+        back_populates="templates",
+        lazy="raise"
+    )
+    
+    template: Mapped["LogTemplate"] = relationship(
+        lazy="raise"
+    )
@@ -2,7 +2,7 @@
 LogTemplate model for storing log templates.
 """
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Text, Boolean
+from sqlalchemy import String, Text, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import BaseModel
 
@@ -18,6 +18,10 @@ class LogTemplate(BaseModel):
     """
     
     __tablename__ = "log_templates"
+    __table_args__ = (
+        # list endpoint sorts and keyset-seeks by (created_at, id), newest first
+        Index("ix_log_templates_created_at_id", "created_at", "id"),
+    )
     
     name: Mapped[str] = mapped_column(
         String(255), 
@@ -44,11 +48,11 @@ class LogTemplate(BaseModel):
         comment="Flag to distinguish between system-provided and user-custom templates"
     )
     
-    # Relationship to jobs
+    # Relationship to jobs, load it explicitly where it is needed
     jobs: Mapped[List["Job"]] = relationship(
         back_populates="template",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="raise"
     )
     
     def __repr__(self) -> str:
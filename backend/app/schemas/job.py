@@ -2,10 +2,100 @@
 Pydantic schemas for Job API endpoints.
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import AliasPath, BaseModel, ConfigDict, Field
-from models.job import ProtocolEnum, JobStatusEnum
+from models.job import ProtocolEnum, JobStatusEnum, JobModeEnum, SyslogFormatEnum, TcpFramingEnum, FsyncPolicyEnum
+
+
+# Extra destinations a job may fan out to
+MAX_DESTINATIONS = 16
+
+# Extra templates a job may mix in
+MAX_TEMPLATES = 64
+
+
+class JobTemplateBase(BaseModel):
+    """Schema of an extra template of a job."""
+    
+    template_id: UUID = Field(
+        ...,
+        description="ID of the log template to mix in"
+    )
+    weight: float = Field(
+        ...,
+        gt=0,
+        description="Weight of the template among the job's templates, e.g. 10 of 100"
+    )
+
+
+class JobTemplateRead(JobTemplateBase):
+    """Schema for reading an extra template of a job."""
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobDestinationBase(BaseModel):
+    """Schema of an extra destination of a job."""
+    
+    protocol: ProtocolEnum = Field(
+        ...,
+        description="Network protocol, as for the job; the job's syslog, framing, HTTP and FILE settings apply"
+    )
+    destination_host: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=255,
+        description="Target host IP address or hostname (required unless FILE)"
+    )
+    destination_port: Optional[int] = Field(
+        None,
+        ge=1,
+        le=65535,
+        description="Target port number (1-65535, required unless FILE)"
+    )
+    file_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        description="FILE: absolute path of the file or named pipe on the worker host, under FILE_SINK_ROOT"
+    )
+    http_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        pattern=r"^/[!-~]*$",
+        description="HTTP: request path (null for /_bulk, /services/collector/event or /)"
+    )
+    http_index: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=255,
+        description="HTTP: Elasticsearch or Splunk index (null for log-simulator or the token's default index)"
+    )
+
+
+class JobDestinationRead(JobDestinationBase):
+    """Schema for reading an extra destination with the delivery of the job's last run."""
+    
+    logs_delivered: Optional[int] = Field(
+        None,
+        description="Logs the destination accepted in the last run"
+    )
+    delivery_errors: Optional[int] = Field(
+        None,
+        description="Failed writes to the destination in the last run"
+    )
+    delivery_reconnects: Optional[int] = Field(
+        None,
+        description="Reconnects to the destination in the last run"
+    )
+    delivery_last_error: Optional[str] = Field(
+        None,
+        description="Last error writing to the destination in the last run"
+    )
+    
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobBase(BaseModel):
@@ -15,21 +105,136 @@ class JobBase(BaseModel):
         ...,
         description="ID of the log template to use"
     )
+    template_weight: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Weight of the template among the job's templates (null for 1)"
+    )
+    templates: List[JobTemplateBase] = Field(
+        default_factory=list,
+        max_length=MAX_TEMPLATES,
+        description="Extra templates, each log comes from the job's template or one of these, drawn by weight, "
+                    "over the job's one connection (unused by REPLAY)"
+    )
     protocol: ProtocolEnum = Field(
         ...,
-        description="Network protocol (TCP or UDP)"
+        description="Network protocol: TCP, UDP, TLS (RFC 5425 syslog over TLS, verified per the worker's SYSLOG_TLS_* "
+                    "settings), an HTTP bulk API: ES_BULK (Elasticsearch _bulk), SPLUNK_HEC or HTTP_JSON (JSON arrays), "
+                    "or FILE (a file or named pipe on the worker host, see file_path)"
     )
-    destination_host: str = Field(
-        ...,
+    destination_host: Optional[str] = Field(
+        None,
         min_length=1,
         max_length=255,
-        description="Target host IP address or hostname"
+        description="Target host IP address or hostname (required unless FILE)"
     )
-    destination_port: int = Field(
-        ...,
+    destination_port: Optional[int] = Field(
+        None,
         ge=1,
         le=65535,
-        description="Target port number (1-65535)"
+        description="Target port number (1-65535, required unless FILE)"
+    )
+    syslog_format: SyslogFormatEnum = Field(
+        SyslogFormatEnum.RAW,
+        description="Syslog header in front of each log: RAW (none), RFC3164 or RFC5424"
+    )
+    tcp_framing: TcpFramingEnum = Field(
+        TcpFramingEnum.NEWLINE,
+        description="TCP and TLS framing: NEWLINE-terminated or RFC 6587 OCTET_COUNTING (packs logs into larger writes, required by RFC 5425 receivers)"
+    )
+    syslog_pri: Optional[int] = Field(
+        None,
+        ge=0,
+        le=191,
+        description="Syslog PRI, facility * 8 + severity (null for 134, local0.info)"
+    )
+    syslog_hostname: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=255,
+        pattern=r"^[!-~]+$",
+        description="Syslog HOSTNAME (null for the worker's hostname)"
+    )
+    syslog_appname: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=48,
+        pattern=r"^[!-~]+$",
+        description="Syslog APP-NAME / TAG (null for log-simulator)"
+    )
+    http_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        pattern=r"^/[!-~]*$",
+        description="HTTP: request path (null for /_bulk, /services/collector/event or /)"
+    )
+    http_index: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=255,
+        description="HTTP: Elasticsearch or Splunk index (null for log-simulator or the token's default index)"
+    )
+    http_batch_size: Optional[int] = Field(
+        None,
+        ge=1,
+        le=100_000,
+        description="HTTP: logs per request (null for 500)"
+    )
+    http_batch_age_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        le=60_000,
+        description="HTTP: longest a log waits for its batch to fill, in milliseconds (null for 1000)"
+    )
+    http_max_in_flight: Optional[int] = Field(
+        None,
+        ge=1,
+        le=64,
+        description="HTTP: concurrent requests and pooled keep-alive connections (null for 4)"
+    )
+    http_gzip: bool = Field(
+        False,
+        description="HTTP: gzip request bodies"
+    )
+    http_tls: bool = Field(
+        False,
+        description="HTTP: use HTTPS, verified per the worker's SYSLOG_TLS_* settings"
+    )
+    file_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        description="FILE: absolute path of the file or named pipe on the worker host, under FILE_SINK_ROOT"
+    )
+    file_rotate_mb: Optional[int] = Field(
+        None,
+        ge=1,
+        le=1_048_576,
+        description="FILE: rotate the file once it holds this many MiB (null for no size rotation)"
+    )
+    file_rotate_seconds: Optional[int] = Field(
+        None,
+        ge=1,
+        description="FILE: rotate the file this many seconds after it was started (null for no time rotation)"
+    )
+    file_rotate_keep: Optional[int] = Field(
+        None,
+        ge=0,
+        description="FILE: rotated files to keep, older ones are deleted (null to keep all)"
+    )
+    file_gzip: bool = Field(
+        False,
+        description="FILE: write a gzip stream, flushed per write so it can be read while it grows"
+    )
+    file_fsync: FsyncPolicyEnum = Field(
+        FsyncPolicyEnum.NONE,
+        description="FILE: fsync NONE (leave it to the OS), on ROTATE and close, or after every WRITE"
+    )
+    destinations: List[JobDestinationBase] = Field(
+        default_factory=list,
+        max_length=MAX_DESTINATIONS,
+        description="Extra destinations, each log is rendered once and sent to the job's destination and to each of them"
     )
     start_time: Optional[datetime] = Field(
         None,
@@ -49,6 +254,69 @@ class JobBase(BaseModel):
         ge=1,
         description="Delay in milliseconds between each log sent"
     )
+    embed_sequence: bool = Field(
+        False,
+        description="Embed job id, sequence number and send time in each log for loss/latency accounting"
+    )
+    mode: JobModeEnum = Field(
+        JobModeEnum.CONSTANT,
+        description="Pacing mode: CONSTANT sends every send_interval_ms, RAMP raises the rate until the "
+                    "destination saturates, BACKFILL sends the logs of start_time..end_time as fast as possible, "
+                    "REPLAY sends the lines of the capture file replay_path"
+    )
+    ramp_base_eps: Optional[int] = Field(
+        100,
+        ge=1,
+        description="RAMP: logs per second of the first step"
+    )
+    ramp_factor: Optional[float] = Field(
+        1.5,
+        gt=1,
+        le=10,
+        description="RAMP: rate multiplier between steps"
+    )
+    ramp_step_seconds: Optional[int] = Field(
+        10,
+        ge=1,
+        description="RAMP: duration of each step in seconds"
+    )
+    ramp_max_eps: Optional[int] = Field(
+        None,
+        ge=1,
+        description="RAMP: rate not to exceed (null for no limit)"
+    )
+    backfill_eps: Optional[int] = Field(
+        None,
+        ge=1,
+        description="BACKFILL: logs per second of event time, timestamps advance by 1/backfill_eps per log"
+    )
+    prerender_pool: Optional[int] = Field(
+        None,
+        ge=1,
+        le=1_000_000,
+        description="RAMP/BACKFILL: render this many logs once and re-send them with only their timestamps "
+                    "patched, for the highest rates (null to render every log)"
+    )
+    replay_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        description="REPLAY: absolute path of the capture file on the worker host, under REPLAY_CAPTURE_ROOT"
+    )
+    replay_speed: Optional[float] = Field(
+        None,
+        ge=0,
+        description="REPLAY: speed multiplier of the capture's timing (null or 1 for the original timing, "
+                    "0 for as fast as possible)"
+    )
+    replay_loop: bool = Field(
+        False,
+        description="REPLAY: restart the capture when it ends"
+    )
+    replay_rewrite_timestamps: bool = Field(
+        False,
+        description="REPLAY: replace the capture's timestamps with the time each line is sent"
+    )
 
 
 class JobCreate(JobBase):
@@ -63,9 +331,21 @@ class JobUpdate(BaseModel):
         None,
         description="ID of the log template to use"
     )
+    template_weight: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Weight of the template among the job's templates (null for 1)"
+    )
+    templates: Optional[List[JobTemplateBase]] = Field(
+        None,
+        max_length=MAX_TEMPLATES,
+        description="Extra templates, replacing the current ones ([] to remove them all)"
+    )
     protocol: Optional[ProtocolEnum] = Field(
         None,
-        description="Network protocol (TCP or UDP)"
+        description="Network protocol: TCP, UDP, TLS (RFC 5425 syslog over TLS, verified per the worker's SYSLOG_TLS_* "
+                    "settings), an HTTP bulk API: ES_BULK (Elasticsearch _bulk), SPLUNK_HEC or HTTP_JSON (JSON arrays), "
+                    "or FILE (a file or named pipe on the worker host, see file_path)"
     )
     destination_host: Optional[str] = Field(
         None,
@@ -79,6 +359,108 @@ class JobUpdate(BaseModel):
         le=65535,
         description="Target port number (1-65535)"
     )
+    syslog_format: Optional[SyslogFormatEnum] = Field(
+        None,
+        description="Syslog header in front of each log: RAW (none), RFC3164 or RFC5424"
+    )
+    tcp_framing: Optional[TcpFramingEnum] = Field(
+        None,
+        description="TCP and TLS framing: NEWLINE-terminated or RFC 6587 OCTET_COUNTING (packs logs into larger writes, required by RFC 5425 receivers)"
+    )
+    syslog_pri: Optional[int] = Field(
+        None,
+        ge=0,
+        le=191,
+        description="Syslog PRI, facility * 8 + severity (null for 134, local0.info)"
+    )
+    syslog_hostname: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=255,
+        pattern=r"^[!-~]+$",
+        description="Syslog HOSTNAME (null for the worker's hostname)"
+    )
+    syslog_appname: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=48,
+        pattern=r"^[!-~]+$",
+        description="Syslog APP-NAME / TAG (null for log-simulator)"
+    )
+    http_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        pattern=r"^/[!-~]*$",
+        description="HTTP: request path (null for /_bulk, /services/collector/event or /)"
+    )
+    http_index: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=255,
+        description="HTTP: Elasticsearch or Splunk index (null for log-simulator or the token's default index)"
+    )
+    http_batch_size: Optional[int] = Field(
+        None,
+        ge=1,
+        le=100_000,
+        description="HTTP: logs per request (null for 500)"
+    )
+    http_batch_age_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        le=60_000,
+        description="HTTP: longest a log waits for its batch to fill, in milliseconds (null for 1000)"
+    )
+    http_max_in_flight: Optional[int] = Field(
+        None,
+        ge=1,
+        le=64,
+        description="HTTP: concurrent requests and pooled keep-alive connections (null for 4)"
+    )
+    http_gzip: Optional[bool] = Field(
+        None,
+        description="HTTP: gzip request bodies"
+    )
+    http_tls: Optional[bool] = Field(
+        None,
+        description="HTTP: use HTTPS, verified per the worker's SYSLOG_TLS_* settings"
+    )
+    file_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        description="FILE: absolute path of the file or named pipe on the worker host, under FILE_SINK_ROOT"
+    )
+    file_rotate_mb: Optional[int] = Field(
+        None,
+        ge=1,
+        le=1_048_576,
+        description="FILE: rotate the file once it holds this many MiB (null for no size rotation)"
+    )
+    file_rotate_seconds: Optional[int] = Field(
+        None,
+        ge=1,
+        description="FILE: rotate the file this many seconds after it was started (null for no time rotation)"
+    )
+    file_rotate_keep: Optional[int] = Field(
+        None,
+        ge=0,
+        description="FILE: rotated files to keep, older ones are deleted (null to keep all)"
+    )
+    file_gzip: Optional[bool] = Field(
+        None,
+        description="FILE: write a gzip stream, flushed per write so it can be read while it grows"
+    )
+    file_fsync: Optional[FsyncPolicyEnum] = Field(
+        None,
+        description="FILE: fsync NONE (leave it to the OS), on ROTATE and close, or after every WRITE"
+    )
+    destinations: Optional[List[JobDestinationBase]] = Field(
+        None,
+        max_length=MAX_DESTINATIONS,
+        description="Extra destinations, replacing the current ones ([] to remove them all)"
+    )
     status: Optional[JobStatusEnum] = Field(
         None,
         description="Job status"
@@ -101,6 +483,69 @@ class JobUpdate(BaseModel):
         ge=1,
         description="Delay in milliseconds between each log sent"
     )
+    embed_sequence: Optional[bool] = Field(
+        None,
+        description="Embed job id, sequence number and send time in each log for loss/latency accounting"
+    )
+    mode: Optional[JobModeEnum] = Field(
+        None,
+        description="Pacing mode: CONSTANT sends every send_interval_ms, RAMP raises the rate until the "
+                    "destination saturates, BACKFILL sends the logs of start_time..end_time as fast as possible, "
+                    "REPLAY sends the lines of the capture file replay_path"
+    )
+    ramp_base_eps: Optional[int] = Field(
+        None,
+        ge=1,
+        description="RAMP: logs per second of the first step"
+    )
+    ramp_factor: Optional[float] = Field(
+        None,
+        gt=1,
+        le=10,
+        description="RAMP: rate multiplier between steps"
+    )
+    ramp_step_seconds: Optional[int] = Field(
+        None,
+        ge=1,
+        description="RAMP: duration of each step in seconds"
+    )
+    ramp_max_eps: Optional[int] = Field(
+        None,
+        ge=1,
+        description="RAMP: rate not to exceed (null for no limit)"
+    )
+    backfill_eps: Optional[int] = Field(
+        None,
+        ge=1,
+        description="BACKFILL: logs per second of event time, timestamps advance by 1/backfill_eps per log"
+    )
+    prerender_pool: Optional[int] = Field(
+        None,
+        ge=1,
+        le=1_000_000,
+        description="RAMP/BACKFILL: render this many logs once and re-send them with only their timestamps "
+                    "patched, for the highest rates (null to render every log)"
+    )
+    replay_path: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=1024,
+        description="REPLAY: absolute path of the capture file on the worker host, under REPLAY_CAPTURE_ROOT"
+    )
+    replay_speed: Optional[float] = Field(
+        None,
+        ge=0,
+        description="REPLAY: speed multiplier of the capture's timing (null or 1 for the original timing, "
+                    "0 for as fast as possible)"
+    )
+    replay_loop: Optional[bool] = Field(
+        None,
+        description="REPLAY: restart the capture when it ends"
+    )
+    replay_rewrite_timestamps: Optional[bool] = Field(
+        None,
+        description="REPLAY: replace the capture's timestamps with the time each line is sent"
+    )
 
 
 class JobRead(JobBase):
@@ -122,6 +567,42 @@ class JobRead(JobBase):
         ...,
         description="Timestamp when job was last updated"
     )
+    saturation_eps: Optional[int] = Field(
+        None,
+        description="Highest sustainable logs per second found by the last ramp"
+    )
+    saturation_reason: Optional[str] = Field(
+        None,
+        description="What limited the last ramp"
+    )
+    saturation_measured_at: Optional[datetime] = Field(
+        None,
+        description="When the last ramp settled"
+    )
+    logs_delivered: Optional[int] = Field(
+        None,
+        description="Logs the job's destination accepted in the last run"
+    )
+    delivery_errors: Optional[int] = Field(
+        None,
+        description="Failed writes to the job's destination in the last run"
+    )
+    delivery_reconnects: Optional[int] = Field(
+        None,
+        description="Reconnects to the job's destination in the last run"
+    )
+    delivery_last_error: Optional[str] = Field(
+        None,
+        description="Last error writing to the job's destination in the last run"
+    )
+    templates: List[JobTemplateRead] = Field(
+        default_factory=list,
+        description="Extra templates logs are drawn from by weight"
+    )
+    destinations: List[JobDestinationRead] = Field(
+        default_factory=list,
+        description="Extra destinations with the delivery of the last run"
+    )
     
     class Config:
         from_attributes = True
@@ -136,9 +617,57 @@ class JobStatusUpdate(BaseModel):
     )
 
 
-class JobOut(JobRead):
-    """Schema for job output data."""
+class JobOut(BaseModel):
+    """Schema for a row of the job list, see GET /jobs/{job_id} for the full job."""
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
-    template_name: str = Field(validation_alias=AliasPath("template", "name"))
\ No newline at end of file
+    id: UUID = Field(
+        ...,
+        description="Unique job identifier"
+    )
+    template_id: UUID = Field(
+        ...,
+        description="ID of the log template to use"
+    )
+    template_name: str = Field(validation_alias=AliasPath("template", "name"))
+    protocol: ProtocolEnum = Field(
+        ...,
+        description="Network protocol"
+    )
+    destination_host: Optional[str] = Field(
+        None,
+        description="Target host IP address or hostname"
+    )
+    destination_port: Optional[int] = Field(
+        None,
+        description="Target port number"
+    )
+    status: JobStatusEnum = Field(
+        ...,
+        description="Current job status"
+    )
+    start_time: Optional[datetime] = Field(
+        None,
+        description="Scheduled start time for the job"
+    )
+    end_time: Optional[datetime] = Field(
+        None,
+        description="Scheduled end time for the job"
+    )
+    send_count: Optional[int] = Field(
+        None,
+        description="Total number of logs to send (null for unlimited)"
+    )
+    send_interval_ms: Optional[int] = Field(
+        None,
+        description="Delay in milliseconds between each log sent"
+    )
+    created_at: datetime = Field(
+        ...,
+        description="Timestamp when job was created"
+    )
+    updated_at: datetime = Field(
+        ...,
+        description="Timestamp when job was last updated"
+    )
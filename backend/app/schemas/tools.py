@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
 
 
@@ -14,4 +14,26 @@ class LogParseResponse(BaseModel):
     
     is_match: bool
     parsed_ecs: Optional[Dict[str, Any]] = None
-    error_message: Optional[str] = None
\ No newline at end of file
+    error_message: Optional[str] = None
+
+class TemplateDetectRequest(BaseModel):
+    """Request schema for detecting the template of a log message."""
+
+    log_message: str
+
+
+class DetectedTemplate(BaseModel):
+    """A stored template that matches the log message."""
+
+    id: str
+    name: str
+
+
+class TemplateDetectResponse(BaseModel):
+    """Response schema for template detection result."""
+
+    is_match: bool
+    template_id: Optional[str] = None
+    template_name: Optional[str] = None
+    matches: List[DetectedTemplate] = []
+    parsed_ecs: Optional[Dict[str, Any]] = None
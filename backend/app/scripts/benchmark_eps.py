@@ -0,0 +1,193 @@
+"""
+End-to-end EPS benchmark of the job send path.
+
+Starts a UDP and a TCP sink on localhost in this process, then runs the
+sending loop (send_engine.run_send_loop -> _send_log_message) for
+1, 10, 100 and 1000 concurrent jobs and reports per run:
+
+    eps         messages sent per second
+    bytes/s     bytes received by the sink per second
+    loss        messages sent but never received by the sink
+    cpu/10k     process CPU seconds per 10k messages (sender and sink)
+    errors      jobs that stopped on a send error
+
+No database, Redis or external collector is needed.
+
+Usage:
+    python scripts/benchmark_eps.py [--template fortigate_forward_traffic]
+        [--protocol udp,tcp] [--concurrency 1,10,100,1000] [-n 10000]
+"""
+import argparse
+import asyncio
+import logging
+import math
+import socket
+import sys
+import time
+import yaml
+from pathlib import Path
+
+# Add the parent directory to sys.path to import from app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services import send_engine
+
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / "predefined_templates"
+
+SINK_HOST = "127.0.0.1"
+# The sink counts as drained when nothing arrived for this long after sending
+DRAIN_IDLE_SECONDS = 0.5
+DRAIN_TIMEOUT_SECONDS = 10.0
+UDP_RECEIVE_BUFFER = 8 * 1024 * 1024
+
+
+class SinkStats:
+    """Messages and bytes received by a sink."""
+
+    def __init__(self) -> None:
+        self.messages = 0
+        self.bytes = 0
+        self.last_received = 0.0
+
+    def reset(self) -> None:
+        self.messages = 0
+        self.bytes = 0
+        self.last_received = time.monotonic()
+
+
+class UdpSink(asyncio.DatagramProtocol):
+    """Counts one message per datagram."""
+
+    def __init__(self, stats: SinkStats) -> None:
+        self.stats = stats
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.stats.messages += 1
+        self.stats.bytes += len(data)
+        self.stats.last_received = time.monotonic()
+
+
+async def start_sinks():
+    """Start the UDP and TCP sinks and return their ports and stats."""
+    loop = asyncio.get_running_loop()
+
+    udp_stats = SinkStats()
+    udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECEIVE_BUFFER)
+    udp_sock.bind((SINK_HOST, 0))
+    udp_transport, _ = await loop.create_datagram_endpoint(lambda: UdpSink(udp_stats), sock=udp_sock)
+
+    tcp_stats = SinkStats()
+
+    async def handle_tcp(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # TCP messages are newline-terminated
+        while data := await reader.read(65536):
+            tcp_stats.messages += data.count(b"\n")
+            tcp_stats.bytes += len(data)
+            tcp_stats.last_received = time.monotonic()
+        writer.close()
+
+    tcp_server = await asyncio.start_server(handle_tcp, SINK_HOST, 0, backlog=4096)
+
+    sinks = {
+        "UDP": (udp_sock.getsockname()[1], udp_stats),
+        "TCP": (tcp_server.sockets[0].getsockname()[1], tcp_stats),
+    }
+    return sinks, udp_transport, tcp_server
+
+
+async def wait_drained(stats: SinkStats, expected: int) -> None:
+    """Wait until the sink received everything or went idle."""
+    deadline = time.monotonic() + DRAIN_TIMEOUT_SECONDS
+    while stats.messages < expected and time.monotonic() < deadline:
+        if time.monotonic() - stats.last_received > DRAIN_IDLE_SECONDS:
+            break
+        await asyncio.sleep(0.05)
+
+
+async def run_once(template: str, protocol: str, port: int, stats: SinkStats,
+                   concurrency: int, messages: int, interval_ms: int) -> dict:
+    """Run `concurrency` jobs sending `messages` logs in total."""
+    per_job = math.ceil(messages / concurrency)
+    job_config = {
+        "destination_host": SINK_HOST,
+        "destination_port": port,
+        "protocol": protocol,
+        "start_time": None,
+        "end_time": None,
+        "send_count": per_job,
+        "send_interval_ms": interval_ms,
+        "embed_sequence": False,
+    }
+
+    stats.reset()
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(send_engine.run_send_loop(f"bench-{i}", job_config, template) for i in range(concurrency)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    # a job that failed sent an unknown number of messages before failing
+    sent = sum(r for r in results if isinstance(r, int))
+    errors = sum(1 for r in results if isinstance(r, BaseException))
+    await wait_drained(stats, sent)
+    cpu = time.process_time() - cpu_started
+
+    return {
+        "sent": sent,
+        "eps": sent / elapsed,
+        "bytes_per_sec": stats.bytes / elapsed,
+        "loss": max(sent - stats.messages, 0),
+        "cpu_per_10k": cpu / sent * 10000 if sent else 0.0,
+        "errors": errors,
+    }
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description="End-to-end EPS benchmark against local sinks")
+    arg_parser.add_argument("--template", default="fortigate_forward_traffic",
+                            help="Predefined template name (file stem) or path to a template YAML")
+    arg_parser.add_argument("--protocol", default="udp,tcp", help="Comma-separated protocols")
+    arg_parser.add_argument("--concurrency", default="1,10,100,1000", help="Comma-separated job counts")
+    arg_parser.add_argument("-n", "--messages", type=int, default=10000, help="Messages per run")
+    arg_parser.add_argument("--interval-ms", type=int, default=0, help="Per-job send interval")
+    arg_parser.add_argument("--log-level", default="WARNING", help="Send engine log level during the run")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level)
+    send_engine.logger.setLevel(args.log_level)
+
+    template_path = Path(args.template)
+    if not template_path.exists():
+        template_path = TEMPLATES_DIR / f"{args.template}.yml"
+    template = yaml.safe_load(template_path.read_text(encoding="utf-8"))["content_format"]
+
+    protocols = [name.strip().upper() for name in args.protocol.split(",")]
+    if not set(protocols) <= {"UDP", "TCP"}:
+        arg_parser.error(f"unsupported protocol in {args.protocol!r}, use udp and/or tcp")
+
+    sinks, udp_transport, tcp_server = await start_sinks()
+    print(f"template {template_path.stem}, {args.messages} messages per run, interval {args.interval_ms}ms")
+    print(f"{'proto':<6} {'jobs':>5} {'eps':>10} {'bytes/s':>12} {'loss':>7} {'cpu/10k':>8} {'errors':>6}")
+    try:
+        for protocol in protocols:
+            port, stats = sinks[protocol]
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                result = await run_once(
+                    template, protocol, port, stats, concurrency, args.messages, args.interval_ms
+                )
+                print(
+                    f"{protocol:<6} {concurrency:>5} {result['eps']:>10.0f} "
+                    f"{result['bytes_per_sec']:>12.0f} {result['loss']:>7} "
+                    f"{result['cpu_per_10k']:>7.2f}s {result['errors']:>6}"
+                )
+    finally:
+        udp_transport.close()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
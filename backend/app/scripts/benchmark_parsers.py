@@ -0,0 +1,84 @@
+"""
+Benchmark the key=value parser against the regex parser.
+
+Generates messages for every key=value shaped predefined template and
+reports parse µs/msg and match rate for both parsers, plus the speedup on
+the messages both parsers match. Messages only the key=value parser
+matches (quoted values with spaces) cost it a full parse where the regex
+parser rejects them early, which pulls its overall figure down.
+
+Usage:
+    python scripts/benchmark_parsers.py [-n 2000] [--glob 'fortigate_*.yml']
+"""
+import argparse
+import sys
+import time
+import yaml
+from pathlib import Path
+
+# Add the parent directory to sys.path to import from app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.log_generator import LogGenerator
+from services.parsing_service import (
+    CompiledTemplateParser,
+    KeyValueTemplateParser,
+    is_key_value_template,
+)
+
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / "predefined_templates"
+
+
+def time_parser(parser, logs):
+    """Return (µs per message, match rate) of parsing logs with parser."""
+    started = time.perf_counter()
+    matched = sum(1 for log in logs if parser.parse(log) is not None)
+    elapsed = time.perf_counter() - started
+    return elapsed / len(logs) * 1e6, matched / len(logs)
+
+
+def speedup_on_common(regex_parser, kv_parser, logs):
+    """Return the speedup on the messages both parsers match, None if there are none."""
+    common = [log for log in logs if regex_parser.parse(log) is not None and kv_parser.parse(log) is not None]
+    if not common:
+        return None
+    regex_us, _ = time_parser(regex_parser, common)
+    kv_us, _ = time_parser(kv_parser, common)
+    return regex_us / kv_us
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare key=value and regex template parsers")
+    arg_parser.add_argument("-n", "--messages", type=int, default=2000, help="Messages per template")
+    arg_parser.add_argument("--glob", default="fortigate_*.yml", help="Template files to benchmark")
+    args = arg_parser.parse_args()
+
+    generator = LogGenerator()
+    print(f"{'template':<32} {'regex µs':>9} {'match':>6} {'kv µs':>8} {'match':>6} {'speedup':>8} {'both':>7}")
+    totals = [0.0, 0.0]
+    for yaml_file in sorted(TEMPLATES_DIR.glob(args.glob)):
+        template = yaml.safe_load(yaml_file.read_text(encoding="utf-8"))["content_format"]
+        if not is_key_value_template(template):
+            print(f"{yaml_file.stem:<32} skipped, not key=value shaped")
+            continue
+
+        logs = [generator.generate_log(template) for _ in range(args.messages)]
+        regex_parser = CompiledTemplateParser(template)
+        kv_parser = KeyValueTemplateParser(template)
+        regex_us, regex_rate = time_parser(regex_parser, logs)
+        kv_us, kv_rate = time_parser(kv_parser, logs)
+        common = speedup_on_common(regex_parser, kv_parser, logs)
+        totals[0] += regex_us
+        totals[1] += kv_us
+        print(
+            f"{yaml_file.stem:<32} {regex_us:>9.2f} {regex_rate:>6.0%} "
+            f"{kv_us:>8.2f} {kv_rate:>6.0%} {regex_us / kv_us:>7.2f}x "
+            f"{'-' if common is None else f'{common:.2f}x':>7}"
+        )
+
+    if totals[1]:
+        print(f"{'total':<32} {totals[0]:>9.2f} {'':>6} {totals[1]:>8.2f} {'':>6} {totals[0] / totals[1]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Generate -> parse round-trip benchmark over the predefined templates.
+
+For every template in predefined_templates/ it generates messages with
+LogGenerator, parses them back with the parsing service and reports:
+
+    gen_us      generation time per message (µs)
+    parse_us    parse time per message (µs)
+    gen_bytes   peak bytes allocated while generating one message
+    parse_bytes peak bytes allocated while parsing one message
+    match_rate  share of generated messages that parse back
+
+Results are compared with a JSON baseline; timings or allocations worse than
+the baseline by more than --threshold, or a lower match rate, are flagged and
+make the script exit with status 1.
+
+Usage:
+    python scripts/benchmark_roundtrip.py [-n 1000] [-r 3] [--update-baseline]
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import yaml
+from datetime import datetime, timezone
+from pathlib import Path
+
+from faker import Faker
+
+# Add the parent directory to sys.path to import from app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.log_generator import LogGenerator
+from services.parsing_service import get_compiled_parser
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+TEMPLATES_DIR = BACKEND_DIR / "predefined_templates"
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "roundtrip_baseline.json"
+
+# Messages whose allocations are traced per template (tracing is slow)
+ALLOCATION_SAMPLE = 200
+# A match rate lower than the baseline by more than this is a regression
+MATCH_RATE_TOLERANCE = 0.01
+TIMED_METRICS = ("gen_us", "parse_us", "gen_bytes", "parse_bytes")
+
+
+def peak_bytes_per_call(func, args_list) -> float:
+    """Average peak bytes allocated by one call of func, traced with tracemalloc."""
+    tracemalloc.start()
+    try:
+        total = 0
+        for args in args_list:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+    return total / len(args_list)
+
+
+def benchmark_template(generator: LogGenerator, template: str, messages: int, repeat: int) -> dict:
+    """Run the round trip for one template, keeping the best of `repeat` timings."""
+    parser = get_compiled_parser(template)
+
+    gen_s = parse_s = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        logs = [generator.generate_log(template) for _ in range(messages)]
+        gen_s = min(gen_s, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        matched = sum(1 for log in logs if parser.parse(log) is not None)
+        parse_s = min(parse_s, time.perf_counter() - started)
+
+    sample = min(ALLOCATION_SAMPLE, messages)
+    return {
+        "gen_us": round(gen_s / messages * 1e6, 2),
+        "parse_us": round(parse_s / messages * 1e6, 2),
+        "gen_bytes": round(peak_bytes_per_call(generator.generate_log, [(template,)] * sample)),
+        "parse_bytes": round(peak_bytes_per_call(parser.parse, [(log,) for log in logs[:sample]])),
+        "match_rate": round(matched / messages, 4),
+    }
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """List human-readable regressions of results against the baseline."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in TIMED_METRICS:
+            if previous.get(metric) and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]} -> {current[metric]} "
+                    f"(+{current[metric] / previous[metric] - 1:.0%})"
+                )
+        if current["match_rate"] < previous.get("match_rate", 0) - MATCH_RATE_TOLERANCE:
+            regressions.append(
+                f"{name}: match_rate {previous['match_rate']:.2%} -> {current['match_rate']:.2%}"
+            )
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Generate -> parse round-trip benchmark")
+    arg_parser.add_argument("-n", "--messages", type=int, default=1000, help="Messages per template")
+    arg_parser.add_argument("-r", "--repeat", type=int, default=3, help="Timing runs, the fastest is kept")
+    arg_parser.add_argument("--glob", default="*.yml", help="Template files to benchmark")
+    arg_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    arg_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="Relative slowdown/allocation growth flagged as a regression")
+    arg_parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Random seed for generated values")
+    args = arg_parser.parse_args()
+
+    random.seed(args.seed)
+    Faker.seed(args.seed)
+    generator = LogGenerator()
+
+    results = {}
+    print(f"{'template':<32} {'gen µs':>8} {'parse µs':>9} {'gen B':>8} {'parse B':>8} {'match':>7}")
+    for yaml_file in sorted(TEMPLATES_DIR.glob(args.glob)):
+        template = yaml.safe_load(yaml_file.read_text(encoding="utf-8"))["content_format"]
+        result = benchmark_template(generator, template, args.messages, args.repeat)
+        results[yaml_file.stem] = result
+        print(
+            f"{yaml_file.stem:<32} {result['gen_us']:>8.2f} {result['parse_us']:>9.2f} "
+            f"{result['gen_bytes']:>8} {result['parse_bytes']:>8} {result['match_rate']:>7.1%}"
+        )
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "messages": args.messages,
+                "repeat": args.repeat,
+                "seed": args.seed,
+            },
+            "templates": results,
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}, run with --update-baseline to create one")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = find_regressions(results, baseline["templates"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Receiver for sequence-numbered jobs (embed_sequence) with loss/latency stats.
+
+Listens on UDP and/or TCP (newline-terminated or octet-counted), feeds
+every message to a SequenceTracker and prints per-job counters every
+--interval seconds:
+
+    received    distinct sequence numbers received
+    lost        sequences that left the tracking window unseen
+    gaps        sequences currently missing inside the window
+    dup/reord   duplicated and out-of-order messages
+    p50/p99/max one-way latency in ms (sender and receiver clocks must agree)
+
+With --redis each report is also published per job on the
+RECEIVER_REPORT_CHANNEL, where the worker picks up receiver loss for RAMP
+jobs.
+
+Usage:
+    python scripts/sequence_receiver.py [--udp 5140] [--tcp 5140] [--interval 5]
+        [--redis redis://localhost:6379/0]
+"""
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+import redis.asyncio as redis
+
+# Add the parent directory to sys.path to import from app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.framing import split_octet_counted
+from services.sequence_tracker import DEFAULT_WINDOW_BITS, RECEIVER_REPORT_CHANNEL, SequenceTracker
+
+UDP_RECEIVE_BUFFER = 8 * 1024 * 1024
+
+
+class UdpReceiver(asyncio.DatagramProtocol):
+    """One message per datagram."""
+
+    def __init__(self, tracker: SequenceTracker) -> None:
+        self.tracker = tracker
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.tracker.observe(data, time.time_ns())
+
+
+def tcp_handler(tracker: SequenceTracker):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # TCP messages are newline-terminated or octet-counted (they then
+        # start with a digit, RFC 6587) and may span reads
+        pending = b""
+        octet_counted = None
+        while data := await reader.read(65536):
+            received_ns = time.time_ns()
+            if octet_counted is None:
+                octet_counted = data[:1].isdigit()
+            if octet_counted:
+                messages, pending = split_octet_counted(pending + data)
+            else:
+                messages = (pending + data).split(b"\n")
+                pending = messages.pop()
+            for message in messages:
+                tracker.observe(message, received_ns)
+        if pending and not octet_counted:
+            tracker.observe(pending)
+        writer.close()
+    return handle
+
+
+async def publish_report(redis_client, report: dict) -> None:
+    """Publish every job's snapshot for the worker's RAMP loss checks."""
+    for job_id, stats in report.items():
+        try:
+            await redis_client.publish(RECEIVER_REPORT_CHANNEL, json.dumps({"job_id": job_id, **stats}))
+        except Exception as e:
+            print(f"Failed to publish report for {job_id}: {e}", file=sys.stderr)
+
+
+def print_report(tracker: SequenceTracker, report: dict, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps({"time": time.time(), "unsequenced": tracker.unsequenced, "jobs": report}), flush=True)
+        return
+    print(f"{'job':<38} {'received':>9} {'lost':>7} {'gaps':>6} {'dup':>5} {'reord':>6} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for job_id, stats in report.items():
+        print(
+            f"{job_id:<38} {stats['received']:>9} {stats['lost']:>7} {stats['gaps']:>6} "
+            f"{stats['duplicates']:>5} {stats['reordered']:>6} {stats['latency_p50_ms']:>8.2f} "
+            f"{stats['latency_p99_ms']:>8.2f} {stats['latency_max_ms']:>8.2f}"
+        )
+    if tracker.unsequenced:
+        print(f"{tracker.unsequenced} message(s) without sequence fields")
+    print(flush=True)
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description="Receive sequence-numbered logs and report loss/latency")
+    arg_parser.add_argument("--host", default="0.0.0.0", help="Listen address")
+    arg_parser.add_argument("--udp", type=int, help="UDP port to listen on")
+    arg_parser.add_argument("--tcp", type=int, help="TCP port to listen on")
+    arg_parser.add_argument("--interval", type=float, default=5.0, help="Seconds between reports")
+    arg_parser.add_argument("--window", type=int, default=DEFAULT_WINDOW_BITS,
+                            help="Sequence numbers tracked individually per job")
+    arg_parser.add_argument("--json", action="store_true", help="Print reports as JSON lines")
+    arg_parser.add_argument("--redis", help="Redis URI to publish per-job reports to (for RAMP jobs)")
+    args = arg_parser.parse_args()
+    if args.udp is None and args.tcp is None:
+        arg_parser.error("at least one of --udp or --tcp is required")
+
+    tracker = SequenceTracker(args.window)
+    loop = asyncio.get_running_loop()
+    closers = []
+
+    if args.udp is not None:
+        udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECEIVE_BUFFER)
+        udp_sock.bind((args.host, args.udp))
+        transport, _ = await loop.create_datagram_endpoint(lambda: UdpReceiver(tracker), sock=udp_sock)
+        closers.append(transport.close)
+        print(f"Listening on udp://{args.host}:{args.udp}")
+    if args.tcp is not None:
+        server = await asyncio.start_server(tcp_handler(tracker), args.host, args.tcp, backlog=4096)
+        closers.append(server.close)
+        print(f"Listening on tcp://{args.host}:{args.tcp}")
+
+    redis_client = None
+    if args.redis:
+        redis_client = redis.from_url(args.redis)
+        closers.append(redis_client.aclose)
+
+    try:
+        while True:
+            await asyncio.sleep(args.interval)
+            report = tracker.snapshot()
+            print_report(tracker, report, args.json)
+            if redis_client is not None:
+                await publish_report(redis_client, report)
+    finally:
+        for close in closers:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
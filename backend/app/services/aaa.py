@@ -3,7 +3,7 @@ import random
 import string
 from fastapi import HTTPException, Request
 from core.dependencies.db import DBSession
-from core.security import verify_password, get_password_hash
+from core.security import verify_password_async, get_password_hash
 from fastapi.exceptions import HTTPException
 from models.aaa import Account
 from services.account import get_account_by_username, get_role_by_name
@@ -19,7 +19,7 @@ async def auth_user(db: DBSession, username: str, password: str) -> Account:
             status_code=404,
             detail="User not found",
         )
-    if not verify_password(password, user.password_hashed):
+    if not await verify_password_async(password, user.password_hashed):
         raise HTTPException(
             status_code=400,
             detail="Incorrect password",
@@ -9,11 +9,12 @@ from schemas import (
     AccountSetting,
     CreateAPIAccountIn,
 )
-from core.security import get_password_hash
+from core.security import get_password_hash_async
 from fastapi.exceptions import HTTPException
 from core.security import gen_uuid
 from datetime import timedelta, datetime, timezone
 from core.auth_jwt.auth_jwt import AuthJWT
+from core.auth_cache import publish_auth_invalidation
 
 # async def get_asset_by_id(db: DBSession, asset_id: str) -> Asset:
 #     res = await db.execute(select(Asset).where(Asset.asset_id == asset_id))
@@ -43,7 +44,7 @@ async def get_account_by_id(db: DBSession, user_account_id: str) -> Account:
 
 async def create_account(db: DBSession, req: AccountCreate):
     try:
-        password_hashed = get_password_hash(req.password)
+        password_hashed = await get_password_hash_async(req.password)
 
         user_data = req.model_dump(exclude_none=True)
         del user_data["password"]
@@ -76,6 +77,7 @@ async def delete_account(db: DBSession, account: Account):
         if account:
             await db.delete(account)
             await db.commit()
+            await publish_auth_invalidation(account.id)
             return True
         else:
             return False
@@ -94,8 +96,8 @@ async def update_account(
         user_data = patch_config.model_dump(exclude_none=True)
         for item in user_data:
             if item == "password":
-                hashed_password = get_password_hash(user_data["password"])
-                setattr(patch_account, "hashed_password", hashed_password)
+                hashed_password = await get_password_hash_async(user_data["password"])
+                setattr(patch_account, "password_hashed", hashed_password)
             elif item == "role":
                 role = await get_role_by_name(db, user_data[item])
                 if role:
@@ -105,6 +107,7 @@ async def update_account(
 
         await db.commit()
         await db.refresh(patch_account)
+        await publish_auth_invalidation(patch_account.id)
         return patch_account
     except Exception as err:
         await db.rollback()
@@ -127,6 +130,7 @@ async def account_setting(
     try:
         await db.commit()
         await db.refresh(patch_account)
+        await publish_auth_invalidation(patch_account.id)
         return patch_account
     except Exception as err:
         await db.rollback()
@@ -139,7 +143,9 @@ async def account_setting(
 async def change_password(
     db: DBSession, new_password: AccountPassword, current_user: Account
 ):
-    current_user.set_password(new_password.password)
+    current_user.password_hashed = await get_password_hash_async(
+        new_password.password
+    )
     await db.commit()
     await db.refresh(current_user)
     return current_user
@@ -0,0 +1,142 @@
+"""
+One generated stream sent to several destinations.
+
+Comparing collectors (a production candidate against a reference) with one
+job per collector renders every log once per job and sends each collector
+different content. A job with extra destinations renders each log once and
+FanOutSender hands the same encoded line (a memoryview of a pre-rendered
+corpus included) to the sender of every destination, so all of them
+receive identical streams for the generation cost of one.
+
+Every destination keeps its own sender (connection, HTTP batches or file)
+and its own DeliveryStats. A failing destination does not hold the others
+back: it is skipped for RETRY_SECONDS, then its failed write is retried and
+it gets the following logs again. Like a single destination, the job fails
+only once its logs cannot be delivered anywhere.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# A destination whose write failed is skipped this long before it is tried again
+RETRY_SECONDS = 1.0
+
+
+@dataclass
+class DeliveryStats:
+    """What one destination of a job run accepted, persisted on the job or its destination."""
+
+    destination: str
+    sent: int = 0
+    errors: int = 0
+    reconnects: int = 0
+    drain_seconds: float = 0.0
+    last_error: Optional[str] = None
+
+    @classmethod
+    def of(cls, destination: str, sender, sent: int) -> "DeliveryStats":
+        """Stats of a sender (None for the per-log sends of CONSTANT UDP/TCP jobs)."""
+        if sender is None:
+            return cls(destination, sent)
+        last_error = sender.last_error
+        return cls(
+            destination, sent, sender.errors, sender.reconnects, sender.drain_seconds,
+            f"{type(last_error).__name__}: {last_error}" if last_error else None
+        )
+
+
+class FanOutSender:
+    """
+    Sends every log to several senders; same interface as the persistent
+    sender of send_engine.
+
+    send() and send_line() report success while at least one destination
+    accepted the log. errors, reconnects and drain_seconds are the sums
+    over all destinations, so a RAMP job settles at the rate its slowest
+    destination sustains.
+    """
+
+    def __init__(self, senders: Sequence, destinations: Sequence[str]) -> None:
+        """
+        Args:
+            senders: Sender of every destination
+            destinations: Name of every destination, for its DeliveryStats
+        """
+        self.senders = list(senders)
+        self.destinations = list(destinations)
+        self.sent = [0] * len(self.senders)
+        self.last_error: Optional[Exception] = None
+        self._retry_at = [0.0] * len(self.senders)
+
+    @property
+    def errors(self) -> int:
+        return sum(sender.errors for sender in self.senders)
+
+    @property
+    def reconnects(self) -> int:
+        return sum(sender.reconnects for sender in self.senders)
+
+    @property
+    def drain_seconds(self) -> float:
+        return sum(sender.drain_seconds for sender in self.senders)
+
+    async def send(self, message: str, epoch_us: Optional[int] = None) -> bool:
+        """Send one log to every destination, encoding it once."""
+        return await self.send_line((message + '\n').encode('utf-8'), epoch_us)
+
+    async def send_line(self, line, epoch_us: Optional[int] = None) -> bool:
+        """
+        Send one encoded log given with its trailing newline to every destination, see send.
+
+        `line` may be a memoryview; it is not used after the call returns.
+        """
+        delivered = False
+        now = time.monotonic()
+        for index, sender in enumerate(self.senders):
+            retry_at = self._retry_at[index]
+            if retry_at:
+                if now < retry_at:
+                    continue
+                self._retry_at[index] = 0.0
+                # the log lost when the destination failed goes first
+                await sender.resend()
+            if await sender.send_line(line, epoch_us):
+                self.sent[index] += 1
+                delivered = True
+            else:
+                self._failed(index, sender)
+        return delivered
+
+    async def flush(self) -> bool:
+        """Write what every destination buffered, concurrently."""
+        active = [index for index, retry_at in enumerate(self._retry_at) if not retry_at]
+        results = await asyncio.gather(*(self.senders[index].flush() for index in active))
+        for index, flushed in zip(active, results):
+            if not flushed:
+                self._failed(index, self.senders[index])
+        return any(results) or not active
+
+    async def resend(self) -> bool:
+        """Retry the failed write of every destination once, right away."""
+        delivered = False
+        for index, sender in enumerate(self.senders):
+            if self._retry_at[index] and await sender.resend():
+                self._retry_at[index] = 0.0
+                delivered = True
+        return delivered
+
+    async def close(self) -> None:
+        """Close every destination's sender; logs not yet flushed are dropped."""
+        await asyncio.gather(*(sender.close() for sender in self.senders))
+
+    def delivery_stats(self) -> List[DeliveryStats]:
+        """DeliveryStats of every destination, in the order they were given."""
+        return [
+            DeliveryStats.of(destination, sender, sent)
+            for destination, sender, sent in zip(self.destinations, self.senders, self.sent)
+        ]
+
+    def _failed(self, index: int, sender) -> None:
+        self.last_error = sender.last_error
+        self._retry_at[index] = time.monotonic() + RETRY_SECONDS
@@ -0,0 +1,268 @@
+"""
+File and named-pipe output for jobs with the FILE protocol.
+
+A FILE job writes its logs, one per line, to a local path, which lets
+file-tailing agents (Filebeat, Fluent Bit) be tested without a network hop.
+Logs are packed into chunks of up to WRITE_BYTES and each chunk is one
+write() from a worker thread, so the event loop never waits for the disk
+and a slow reader of a named pipe becomes back-pressure.
+
+Regular files can be rotated by size and/or age, logrotate style: the
+file is renamed to PATH-YYYYmmdd-HHMMSS (PATH-YYYYmmdd-HHMMSS.gz for a .gz
+path) and a new one is started, keeping the newest `keep` rotated files.
+Rotation is checked after every chunk, so a file can exceed the size
+limit by up to one chunk.
+
+With gzip the file is written as a gzip stream, sync-flushed per chunk so
+everything written so far can be decompressed while the file grows; each
+file (and each restart of a job) is one gzip member.
+
+fsync policy:
+    NONE      leave it to the OS (default)
+    ROTATE    before a file is rotated or closed
+    WRITE     after every chunk
+"""
+import asyncio
+import errno
+import logging
+import os
+import stat
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+
+from services.framing import Framer
+
+logger = logging.getLogger(__name__)
+
+FSYNC_NONE = "NONE"
+FSYNC_ROTATE = "ROTATE"
+FSYNC_WRITE = "WRITE"
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_ROTATE, FSYNC_WRITE)
+
+# Logs are packed into writes of up to this many bytes
+WRITE_BYTES = 1024 * 1024
+
+# Logs compress well, the fastest level gets most of the ratio
+GZIP_LEVEL = 1
+
+# A named pipe without a reader is retried this often until one opens it
+PIPE_RETRY_SECONDS = 0.1
+
+
+class FileSender:
+    """
+    Writes a job's logs to a file or named pipe; same interface as the
+    persistent sender of send_engine.
+
+    send() and send_line() buffer and only block while a full chunk is
+    written; flush() writes what is buffered.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        framer: Optional[Framer] = None,
+        rotate_bytes: Optional[int] = None,
+        rotate_seconds: Optional[float] = None,
+        keep: Optional[int] = None,
+        gzip: bool = False,
+        fsync: Optional[str] = None
+    ) -> None:
+        """
+        Args:
+            path: File or named pipe to write to; missing directories are created
+            framer: Syslog header of every line (default: none)
+            rotate_bytes: Rotate once the file holds this many bytes (on disk)
+            rotate_seconds: Rotate files this many seconds after they were started
+            keep: Rotated files to keep, older ones are deleted (default: all)
+            gzip: Write a gzip stream
+            fsync: NONE, ROTATE or WRITE (default: NONE)
+        """
+        fsync = fsync or FSYNC_NONE
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
+        self.path = Path(path)
+        self.framer = framer or Framer()
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.keep = keep
+        self.gzip = gzip
+        self.fsync = fsync
+        self.errors = 0
+        self.reconnects = 0
+        self.drain_seconds = 0.0
+        self.last_error: Optional[Exception] = None
+        self.rotations = 0
+        self._pending = bytearray()
+        self._failed: Optional[bytes] = None
+        self._fd: Optional[int] = None
+        self._pipe = False
+        self._compressor = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._opens = 0
+
+    async def send(self, message: str, epoch_us: Optional[int] = None) -> bool:
+        """Buffer one log, returning whether it was written (or buffered)."""
+        return await self.send_line((message + '\n').encode('utf-8'), epoch_us)
+
+    async def send_line(self, line, epoch_us: Optional[int] = None) -> bool:
+        """Buffer one encoded log given with its trailing newline, see send."""
+        self._pending += self.framer.tcp(line, epoch_us)
+        if len(self._pending) < WRITE_BYTES:
+            return True
+        return await self.flush()
+
+    async def flush(self) -> bool:
+        """Write the logs buffered so far."""
+        if not self._pending:
+            return True
+        data = bytes(self._pending)
+        self._pending.clear()
+        return await self._write(data)
+
+    async def resend(self) -> bool:
+        """Retry the data of the last failed write once, on a reopened file."""
+        data, self._failed = self._failed, None
+        return data is not None and await self._write(data)
+
+    async def close(self) -> None:
+        """Close the file; logs not yet flushed are dropped."""
+        if self._fd is not None:
+            await asyncio.to_thread(self._close, self.fsync != FSYNC_NONE)
+
+    async def _write(self, data: bytes) -> bool:
+        started = time.perf_counter()
+        try:
+            if self._fd is None:
+                await self._open()
+            await asyncio.to_thread(self._write_chunk, data)
+            return True
+        except OSError as e:
+            self.errors += 1
+            self.last_error = e
+            self._failed = data
+            logger.debug(f"Write to {self.path} failed: {type(e).__name__}: {e}")
+            self._discard()
+            return False
+        finally:
+            self.drain_seconds += time.perf_counter() - started
+
+    async def _open(self) -> None:
+        """Open the file for appending, or wait for a reader of a named pipe."""
+        try:
+            self._pipe = stat.S_ISFIFO(os.stat(self.path).st_mode)
+        except FileNotFoundError:
+            self._pipe = False
+        if self._pipe:
+            while True:
+                try:
+                    # without O_NONBLOCK, open() would block until a reader appears
+                    fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+                    break
+                except OSError as e:
+                    if e.errno != errno.ENXIO:
+                        raise
+                    await asyncio.sleep(PIPE_RETRY_SECONDS)
+            os.set_blocking(fd, True)
+        else:
+            fd = await asyncio.to_thread(self._open_file)
+        self._fd = fd
+        self._size = 0 if self._pipe else os.fstat(fd).st_size
+        self._opened_at = time.monotonic()
+        if self.gzip:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        if self._opens:
+            self.reconnects += 1
+        self._opens += 1
+
+    def _open_file(self) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _write_chunk(self, data: bytes) -> None:
+        """Write one chunk (in a worker thread), then rotate if due."""
+        if self._compressor is not None:
+            data = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self._write_all(data)
+        if self.fsync == FSYNC_WRITE:
+            os.fsync(self._fd)
+        if not self._pipe and self._rotation_due():
+            self._rotate()
+
+    def _write_all(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        self._size += len(data)
+
+    def _rotation_due(self) -> bool:
+        if self.rotate_bytes and self._size >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_seconds) and time.monotonic() - self._opened_at >= self.rotate_seconds
+
+    def _rotate(self) -> None:
+        """Rename the file aside, start a new one and delete the oldest rotated files."""
+        self._close(self.fsync != FSYNC_NONE)
+        target = self._rotated_name(datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.rename(self.path, target)
+        self.rotations += 1
+        self._fd = self._open_file()
+        self._size = 0
+        self._opened_at = time.monotonic()
+        if self.gzip:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        if self.keep is not None:
+            for old in self._rotated_files()[:-self.keep or None]:
+                old.unlink(missing_ok=True)
+
+    def _rotated_name(self, stamp: str) -> Path:
+        base, suffix = self._rotation_parts()
+        target = self.path.with_name(f"{base}-{stamp}{suffix}")
+        counter = 1
+        while target.exists():
+            target = self.path.with_name(f"{base}-{stamp}-{counter}{suffix}")
+            counter += 1
+        return target
+
+    def _rotated_files(self) -> List[Path]:
+        """Rotated files of the path, oldest first."""
+        base, suffix = self._rotation_parts()
+        rotated = [
+            candidate for candidate in self.path.parent.glob(f"{base}-*{suffix}")
+            if candidate.name[len(base) + 1:len(base) + 9].isdigit()
+        ]
+        # by last write, names of files rotated within a second differ by a counter
+        return sorted(rotated, key=lambda candidate: candidate.stat().st_mtime_ns)
+
+    def _rotation_parts(self) -> tuple:
+        name = self.path.name
+        if self.gzip and name.endswith(".gz"):
+            return name[:-3], ".gz"
+        return name, ""
+
+    def _close(self, fsync: bool) -> None:
+        """Finish the gzip member, fsync if asked to and close the file."""
+        try:
+            if self._compressor is not None:
+                compressor, self._compressor = self._compressor, None
+                self._write_all(compressor.flush())
+            if fsync and not self._pipe:
+                os.fsync(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def _discard(self) -> None:
+        """Close the file after a failed write, without writing to it again."""
+        self._compressor = None
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            try:
+                os.close(fd)
+            except OSError:
+                pass
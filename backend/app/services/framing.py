@@ -0,0 +1,138 @@
+"""
+Syslog headers and TCP framing of the messages a job sends.
+
+A job's messages can be sent as they are (RAW) or behind an RFC 3164 or
+RFC 5424 header:
+
+    RFC3164   <PRI>Mmm dd hh:mm:ss HOSTNAME APPNAME: MSG
+    RFC5424   <PRI>1 YYYY-MM-DDThh:mm:ss.ffffffZ HOSTNAME APPNAME - - - MSG
+
+On TCP every message is either terminated by a newline or prefixed with
+its length in octets (RFC 6587 octet counting), which lets a receiver
+split the stream without scanning it and keeps messages containing
+newlines intact, so many messages can be packed into one write.
+
+The header is precomputed per job; only its timestamp changes, and that
+is re-encoded once per second (RFC 5424 appends the microseconds per
+message). RFC 3164 timestamps are local time, RFC 5424 ones UTC.
+"""
+import socket
+import time
+from datetime import timezone
+from typing import List, Optional, Tuple
+
+from services.virtual_clock import US_PER_SECOND, TimestampFormatter
+
+RAW = "RAW"
+RFC3164 = "RFC3164"
+RFC5424 = "RFC5424"
+NEWLINE = "NEWLINE"
+OCTET_COUNTING = "OCTET_COUNTING"
+
+# local0.info, as most network devices send by default
+DEFAULT_PRI = 134
+DEFAULT_APPNAME = "log-simulator"
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+class Framer:
+    """
+    Turns a message into the bytes sent for it over UDP or TCP.
+
+    Messages are passed with a trailing newline (as the senders hold them);
+    RAW messages with newline framing are returned without copying.
+    """
+
+    def __init__(
+        self,
+        header: str = RAW,
+        framing: str = NEWLINE,
+        pri: Optional[int] = None,
+        hostname: Optional[str] = None,
+        appname: Optional[str] = None
+    ) -> None:
+        if header not in (RAW, RFC3164, RFC5424):
+            raise ValueError(f"Unsupported syslog header: {header}")
+        if framing not in (NEWLINE, OCTET_COUNTING):
+            raise ValueError(f"Unsupported TCP framing: {framing}")
+        self.header = header
+        self.octet_counting = framing == OCTET_COUNTING
+        pri = DEFAULT_PRI if pri is None else pri
+        hostname = hostname or socket.gethostname() or "-"
+        appname = appname or DEFAULT_APPNAME
+        if header == RFC5424:
+            self._pri = f"<{pri}>1 ".encode()
+            self._suffix = f"Z {hostname} {appname} - - - ".encode()
+            self._formatter = TimestampFormatter(timezone.utc)
+        else:
+            self._pri = f"<{pri}>".encode()
+            self._suffix = f" {hostname} {appname}: ".encode()
+            self._formatter = TimestampFormatter()
+        self._second: Optional[int] = None
+        self._prefix = b""
+
+    def udp(self, line, epoch_us: Optional[int] = None):
+        """Datagram for a message: header and message, without the newline."""
+        body = memoryview(line)[:-1]
+        if self.header == RAW:
+            return body
+        return self._header(epoch_us) + body
+
+    def tcp(self, line, epoch_us: Optional[int] = None):
+        """Stream bytes for a message: header and message, newline-terminated or octet-counted."""
+        if self.header == RAW:
+            if not self.octet_counting:
+                return line
+            body = memoryview(line)[:-1]
+            return b"%d " % len(body) + body
+        header = self._header(epoch_us)
+        if not self.octet_counting:
+            return header + line
+        body = memoryview(line)[:-1]
+        return b"%d " % (len(header) + len(body)) + header + body
+
+    def _header(self, epoch_us: Optional[int]) -> bytes:
+        """Header for the event time `epoch_us` (default: now)."""
+        if epoch_us is None:
+            epoch_us = time.time_ns() // 1000
+        second, fraction = divmod(epoch_us, US_PER_SECOND)
+        if second != self._second:
+            self._second = second
+            context = self._formatter.context(second * US_PER_SECOND)
+            if self.header == RFC5424:
+                stamp = f"{context['@timestamp.date']}T{context['@timestamp.time']}"
+                self._prefix = self._pri + stamp.encode()
+            else:
+                date = context["@timestamp.date"]
+                stamp = f"{MONTHS[int(date[5:7]) - 1]} {int(date[8:10]):2d} {context['@timestamp.time']}"
+                self._prefix = self._pri + stamp.encode() + self._suffix
+        if self.header == RFC5424:
+            return self._prefix + b".%06d" % fraction + self._suffix
+        return self._prefix
+
+
+def split_octet_counted(data: bytes) -> Tuple[List[bytes], bytes]:
+    """
+    Split a stream of octet-counted frames ("LENGTH SP MESSAGE").
+
+    Returns:
+        tuple: (complete messages, bytes of the incomplete last frame)
+
+    Raises:
+        ValueError: If the stream is not octet-counted
+    """
+    messages = []
+    position = 0
+    while True:
+        space = data.find(b" ", position, position + 11)
+        if space < 0:
+            if len(data) - position > 10:
+                raise ValueError("octet count expected")
+            break
+        end = space + 1 + int(data[position:space])
+        if end > len(data):
+            break
+        messages.append(data[space + 1:end])
+        position = end
+    return messages, data[position:]
@@ -0,0 +1,456 @@
+"""
+HTTP bulk output: Elasticsearch _bulk, Splunk HEC and generic JSON.
+
+Many receivers ingest over HTTP instead of syslog. An HttpBulkSender
+collects a job's logs into batches that are posted as one request each:
+
+    ES_BULK      NDJSON "create" actions for http_index (default log-simulator);
+                 logs that are JSON objects are indexed as they are, others
+                 as {"@timestamp", "message"}
+    SPLUNK_HEC   concatenated {"time", "event"} HEC events
+    HTTP_JSON    a JSON array of {"@timestamp", "message"} objects
+
+A batch is sent when it holds batch_size logs or its first log is
+batch_age_ms old. Requests go over a pool of keep-alive connections, at
+most max_in_flight at a time; when all of them are in flight the next full
+batch waits for one, which is the back-pressure the sending loops pace by
+(counted as drain time, as with TCP). 429 and 502-504 responses, bulk
+items rejected with 429, and connection errors are retried with
+exponential backoff (honouring Retry-After), and every failed attempt is
+counted as a send error; a batch is dropped once its retries are used up.
+Connecting and each request/response exchange are bounded by
+request_timeout, so a receiver that accepts but never answers counts as a
+failed, retried attempt instead of holding its request slot forever.
+
+HTTP/1.1 is spoken over asyncio streams with h11, so the sink needs no
+client library and shares the TLS contexts of services/tls.py.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import time
+from array import array
+from datetime import timezone
+from typing import List, Optional
+
+import h11
+
+from services.virtual_clock import US_PER_SECOND, TimestampFormatter
+
+logger = logging.getLogger(__name__)
+
+ES_BULK = "ES_BULK"
+SPLUNK_HEC = "SPLUNK_HEC"
+HTTP_JSON = "HTTP_JSON"
+HTTP_PROTOCOLS = (ES_BULK, SPLUNK_HEC, HTTP_JSON)
+
+DEFAULT_PATHS = {ES_BULK: "/_bulk", SPLUNK_HEC: "/services/collector/event", HTTP_JSON: "/"}
+CONTENT_TYPES = {ES_BULK: "application/x-ndjson", SPLUNK_HEC: "application/json", HTTP_JSON: "application/json"}
+DEFAULT_INDEX = "log-simulator"
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_BATCH_AGE_MS = 1000
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Failed requests are retried this many times, after RETRY_BASE_SECONDS doubling per attempt
+MAX_RETRIES = 3
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 30.0
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+# Seconds to connect, or to send a request and read its response; close()
+# gives the requests still in flight as long to finish
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 30.0
+
+# Logs compress well, the fastest level gets most of the ratio
+GZIP_LEVEL = 1
+READ_BYTES = 64 * 1024
+
+
+class HttpSinkError(OSError):
+    """A request the receiver failed; an OSError so callers handle it like a socket error."""
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.http = h11.Connection(h11.CLIENT)
+
+    def close(self) -> None:
+        self.writer.close()
+
+    async def wait_closed(self) -> None:
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+
+class HttpBulkSender:
+    """
+    Sends a job's logs as bulk HTTP requests; same interface as the
+    persistent sender of send_engine.
+
+    send() and send_line() only block while a full batch waits for a free
+    request slot. They return False once after a batch was dropped, so jobs
+    notice a receiver that keeps failing. flush() sends the batch if it is
+    due (its age timer does so too) and close() sends the rest and waits
+    for the requests in flight.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        protocol: str,
+        path: Optional[str] = None,
+        index: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        batch_age_ms: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        gzip_bodies: bool = False,
+        tls=None,
+        authorization: Optional[str] = None,
+        hostname: Optional[str] = None,
+        request_timeout: Optional[float] = None
+    ) -> None:
+        """
+        Args:
+            host: Receiver host
+            port: Receiver port
+            protocol: ES_BULK, SPLUNK_HEC or HTTP_JSON
+            path: Request target (default: the protocol's usual endpoint)
+            index: Elasticsearch index or Splunk index (default: log-simulator
+                for Elasticsearch, the token's default index for Splunk)
+            batch_size: Logs per request
+            batch_age_ms: Longest a log waits for its batch to fill
+            max_in_flight: Concurrent requests, and connections in the pool
+            gzip_bodies: gzip the request bodies
+            tls: SSLContext for HTTPS (default: plain HTTP)
+            authorization: Authorization header value, e.g. "Splunk <token>"
+            hostname: Splunk "host" field of the events
+            request_timeout: Seconds to connect, or to send a request and read
+                its response, before the attempt fails and is retried
+        """
+        if protocol not in HTTP_PROTOCOLS:
+            raise ValueError(f"Unsupported HTTP protocol: {protocol}")
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.path = path or DEFAULT_PATHS[protocol]
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.batch_age = (batch_age_ms or DEFAULT_BATCH_AGE_MS) / 1000
+        self.max_in_flight = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+        self.gzip_bodies = gzip_bodies
+        self.tls = tls
+        self.request_timeout = request_timeout or DEFAULT_REQUEST_TIMEOUT_SECONDS
+        self.errors = 0
+        self.reconnects = 0
+        self.drain_seconds = 0.0
+        self.last_error: Optional[Exception] = None
+        self.requests = 0
+        self.retries = 0
+        self.dropped = 0
+        # seconds from sending a request until its response, per request
+        self.latencies = array("d")
+
+        headers = [
+            ("Host", f"{host}:{port}"),
+            ("User-Agent", "log-simulator"),
+            ("Content-Type", CONTENT_TYPES[protocol]),
+        ]
+        if gzip_bodies:
+            headers.append(("Content-Encoding", "gzip"))
+        if authorization:
+            headers.append(("Authorization", authorization))
+        self._headers = headers
+
+        if protocol == ES_BULK:
+            action = {"create": {"_index": index or DEFAULT_INDEX}}
+            self._action = json.dumps(action, separators=(",", ":")).encode() + b"\n"
+        fields = {"index": index, "host": hostname}
+        self._hec_fields = b"".join(
+            b',"%s":%s' % (name.encode(), json.dumps(value).encode()) for name, value in fields.items() if value
+        )
+        self._formatter = TimestampFormatter(timezone.utc)
+        self._second: Optional[int] = None
+        self._iso_second = b""
+
+        self._items: List[bytes] = []
+        self._batch_started = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._tasks = set()
+        self._idle: List[_Connection] = []
+        self._lost = 0
+        self._failed = False
+
+    async def send(self, message: str, epoch_us: Optional[int] = None) -> bool:
+        """Add one log to the batch; epoch_us is its event time (default: now)."""
+        if self._failed:
+            self._failed = False
+            return False
+        if epoch_us is None:
+            epoch_us = time.time_ns() // 1000
+        self._items.append(self._encode(message, epoch_us))
+        if len(self._items) == 1:
+            self._batch_started = time.monotonic()
+            self._timer = asyncio.get_running_loop().call_later(self.batch_age, self._age_expired)
+        if len(self._items) >= self.batch_size:
+            await self._dispatch()
+        return True
+
+    async def send_line(self, line, epoch_us: Optional[int] = None) -> bool:
+        """Add one encoded log given with its trailing newline, see send."""
+        return await self.send(bytes(line[:-1]).decode("utf-8", "replace"), epoch_us)
+
+    async def flush(self) -> bool:
+        """Send the batch if its first log is batch_age old."""
+        if self._items and time.monotonic() - self._batch_started >= self.batch_age:
+            await self._dispatch()
+        return True
+
+    async def resend(self) -> bool:
+        """Failed batches were retried already."""
+        return False
+
+    async def close(self) -> None:
+        """
+        Send the batch, wait up to request_timeout for the requests in flight
+        (dropping the batches still unsent then) and close the connections.
+        """
+        await self._dispatch()
+        if self._tasks:
+            _, pending = await asyncio.wait(set(self._tasks), timeout=self.request_timeout)
+            if pending:
+                logger.warning(
+                    f"HTTP {self.protocol} to {self.host}:{self.port}: {len(pending)} requests "
+                    f"still in flight after {self.request_timeout:g}s, giving up"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+            await connection.wait_closed()
+        if self.requests:
+            latencies = sorted(self.latencies)
+            logger.info(
+                f"HTTP {self.protocol} to {self.host}:{self.port}: {self.requests} requests, latency "
+                f"p50 {latencies[len(latencies) // 2] * 1000:.1f}ms "
+                f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms, "
+                f"{self.retries} retries, {self.dropped} logs dropped"
+            )
+
+    def _encode(self, message: str, epoch_us: int) -> bytes:
+        """Bulk item of one log."""
+        if self.protocol == SPLUNK_HEC:
+            seconds, micros = divmod(epoch_us, US_PER_SECOND)
+            return b'{"time":%d.%06d,"event":%s%s}' % (seconds, micros, json.dumps(message).encode(), self._hec_fields)
+        if self.protocol == ES_BULK and message.startswith("{"):
+            return self._action + message.encode("utf-8") + b"\n"
+        document = b'{"@timestamp":"%s","message":%s}' % (self._timestamp(epoch_us), json.dumps(message).encode())
+        if self.protocol == ES_BULK:
+            return self._action + document + b"\n"
+        return document
+
+    def _timestamp(self, epoch_us: int) -> bytes:
+        """ISO 8601 UTC time with microseconds, the date part re-encoded once per second."""
+        second, fraction = divmod(epoch_us, US_PER_SECOND)
+        if second != self._second:
+            self._second = second
+            context = self._formatter.context(second * US_PER_SECOND)
+            self._iso_second = f"{context['@timestamp.date']}T{context['@timestamp.time']}.".encode()
+        return self._iso_second + b"%06dZ" % fraction
+
+    def _body(self, items: List[bytes]) -> bytes:
+        body = b"[" + b",".join(items) + b"]" if self.protocol == HTTP_JSON else b"".join(items)
+        if self.gzip_bodies:
+            body = gzip.compress(body, GZIP_LEVEL, mtime=0)
+        return body
+
+    def _age_expired(self) -> None:
+        self._timer = None
+        if self._items:
+            self._track(asyncio.ensure_future(self._dispatch()))
+
+    def _track(self, task: asyncio.Future) -> None:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        """Hand the batch to a request, waiting for a free slot."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._items = self._items, []
+        if not items:
+            return
+        started = time.perf_counter()
+        await self._slots.acquire()
+        self.drain_seconds += time.perf_counter() - started
+        self._track(asyncio.ensure_future(self._deliver(items)))
+
+    async def _deliver(self, items: List[bytes]) -> None:
+        """Post a batch, retrying it (or its items rejected with 429) with backoff."""
+        try:
+            attempt = 0
+            while True:
+                delay = None
+                try:
+                    status, headers, response = await self._post(self._body(items))
+                except (OSError, h11.ProtocolError) as e:
+                    error = e
+                else:
+                    if 200 <= status < 300:
+                        items = self._throttled_items(items, response) if self.protocol == ES_BULK else []
+                        if not items:
+                            return
+                        error = HttpSinkError(f"{len(items)} bulk item(s) rejected with 429")
+                    elif status in RETRY_STATUSES:
+                        error = HttpSinkError(self._describe(status, response))
+                        delay = _retry_after(headers)
+                    else:
+                        self._fail(HttpSinkError(self._describe(status, response)), len(items))
+                        return
+                attempt += 1
+                if attempt > MAX_RETRIES:
+                    self._fail(error, len(items))
+                    return
+                self.errors += 1
+                self.last_error = error
+                self.retries += 1
+                logger.debug(f"HTTP {self.protocol} to {self.host}:{self.port} retrying: {error}")
+                if delay is None:
+                    delay = min(RETRY_BASE_SECONDS * 2 ** (attempt - 1), RETRY_MAX_SECONDS)
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # close() gave up on the batch
+            self.dropped += len(items)
+            raise
+        finally:
+            self._slots.release()
+
+    def _fail(self, error: Exception, count: int) -> None:
+        """Drop a batch of `count` logs."""
+        self.errors += 1
+        self.last_error = error
+        self.dropped += count
+        self._failed = True
+        logger.warning(f"HTTP {self.protocol} to {self.host}:{self.port} dropped {count} logs: {error}")
+
+    def _describe(self, status: int, response: bytes) -> str:
+        return f"HTTP {status} from {self.host}:{self.port}{self.path}: {response[:200].decode('utf-8', 'replace')}"
+
+    def _throttled_items(self, items: List[bytes], response: bytes) -> List[bytes]:
+        """Items of a _bulk request rejected with 429; other rejected items are dropped."""
+        if b'"errors":true' not in response[:256].replace(b" ", b""):
+            return []
+        throttled = []
+        rejected = 0
+        reason = None
+        for item, result in zip(items, json.loads(response).get("items", ())):
+            result = next(iter(result.values()), {})
+            status = result.get("status", 0)
+            if status == 429:
+                throttled.append(item)
+            elif status >= 300:
+                rejected += 1
+                reason = reason or result.get("error")
+        if rejected:
+            self.dropped += rejected
+            logger.warning(f"HTTP {self.protocol} to {self.host}:{self.port} rejected {rejected} logs: {reason}")
+        return throttled
+
+    async def _post(self, body: bytes) -> tuple:
+        """
+        POST a body on a pooled connection.
+
+        Returns:
+            tuple: (status, response headers, response body)
+        """
+        connection = await self._connection()
+        started = time.perf_counter()
+        try:
+            status, response_headers, response = await asyncio.wait_for(
+                self._exchange(connection, body), self.request_timeout
+            )
+        except asyncio.TimeoutError:
+            connection.close()
+            self._lost += 1
+            raise TimeoutError(
+                f"no response from {self.host}:{self.port}{self.path} within {self.request_timeout:g}s"
+            ) from None
+        except BaseException:
+            connection.close()
+            self._lost += 1
+            raise
+
+        self.requests += 1
+        self.latencies.append(time.perf_counter() - started)
+        http = connection.http
+        if http.our_state is h11.DONE and http.their_state is h11.DONE:
+            http.start_next_cycle()
+            self._idle.append(connection)
+        else:
+            connection.close()
+        return status, response_headers, response
+
+    async def _exchange(self, connection: _Connection, body: bytes) -> tuple:
+        """Send a POST on a connection and read its response, see _post."""
+        http = connection.http
+        headers = self._headers + [("Content-Length", str(len(body)))]
+        connection.writer.write(http.send(h11.Request(method="POST", target=self.path, headers=headers)))
+        connection.writer.write(http.send(h11.Data(data=body)))
+        connection.writer.write(http.send(h11.EndOfMessage()))
+        await connection.writer.drain()
+
+        status, response_headers, chunks = 0, [], []
+        while True:
+            event = http.next_event()
+            if event is h11.NEED_DATA:
+                http.receive_data(await connection.reader.read(READ_BYTES))
+            elif isinstance(event, h11.Response):
+                status, response_headers = event.status_code, event.headers
+            elif isinstance(event, h11.Data):
+                chunks.append(event.data)
+            elif isinstance(event, h11.EndOfMessage):
+                return status, response_headers, b"".join(chunks)
+            elif isinstance(event, h11.ConnectionClosed):
+                raise ConnectionResetError("connection closed before the response")
+
+    async def _connection(self) -> _Connection:
+        """An idle pooled connection, or a new one."""
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.reader.at_eof():
+                return connection
+            connection.close()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.tls), self.request_timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"connecting to {self.host}:{self.port} took longer than {self.request_timeout:g}s"
+            ) from None
+        if self._lost:
+            # replaces a connection lost to an error
+            self._lost -= 1
+            self.reconnects += 1
+        return _Connection(reader, writer)
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds of a Retry-After header, if it has them."""
+    for name, value in headers:
+        if name == b"retry-after":
+            try:
+                return min(max(float(value), 0.0), RETRY_MAX_SECONDS)
+            except ValueError:
+                return None
+    return None
@@ -1,16 +1,19 @@
 """
 Service layer for job management business logic.
 """
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Select, select
 from fastapi import HTTPException, status
 import redis
-from models.job import Job, JobStatusEnum
+from models.job import Job, JobDestination, JobModeEnum, JobStatusEnum, JobTemplate, ProtocolEnum
 from models.log_template import LogTemplate
 from schemas.job import JobCreate, JobUpdate
+from core.paths import resolve_within
 from core.settings import cfg
+from core.custom_page import total_count_cache
 
 
 # Redis client for sending commands to worker
@@ -29,7 +32,7 @@ async def create_job(db: Session, job_data: JobCreate) -> Job:
         Job: Created job instance
         
     Raises:
-        HTTPException: If template doesn't exist
+        HTTPException: If a template doesn't exist
     """
     # Validate that the template exists
     template_id = str(job_data.template_id)
@@ -41,9 +44,11 @@ async def create_job(db: Session, job_data: JobCreate) -> Job:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Template with id {job_data.template_id} not found"
         )
+    templates = await _job_templates(db, job_data.model_dump()["templates"])
     
-    # Validate destination (basic validation)
-    if not _is_valid_destination(job_data.destination_host, job_data.destination_port):
+    # Validate destination (basic validation), FILE jobs write to file_path instead
+    if job_data.protocol != ProtocolEnum.FILE and \
+            not _is_valid_destination(job_data.destination_host, job_data.destination_port):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid destination host or port"
@@ -52,23 +57,123 @@ async def create_job(db: Session, job_data: JobCreate) -> Job:
     # Create the job
     db_job = Job(
         template_id=template_id,
+        template_weight=job_data.template_weight,
+        templates=templates,
         protocol=job_data.protocol,
         destination_host=job_data.destination_host,
         destination_port=job_data.destination_port,
+        syslog_format=job_data.syslog_format,
+        tcp_framing=job_data.tcp_framing,
+        syslog_pri=job_data.syslog_pri,
+        syslog_hostname=job_data.syslog_hostname,
+        syslog_appname=job_data.syslog_appname,
+        http_path=job_data.http_path,
+        http_index=job_data.http_index,
+        http_batch_size=job_data.http_batch_size,
+        http_batch_age_ms=job_data.http_batch_age_ms,
+        http_max_in_flight=job_data.http_max_in_flight,
+        http_gzip=job_data.http_gzip,
+        http_tls=job_data.http_tls,
+        file_path=job_data.file_path,
+        file_rotate_mb=job_data.file_rotate_mb,
+        file_rotate_seconds=job_data.file_rotate_seconds,
+        file_rotate_keep=job_data.file_rotate_keep,
+        file_gzip=job_data.file_gzip,
+        file_fsync=job_data.file_fsync,
         status=JobStatusEnum.IDLE,
         start_time=job_data.start_time,
         end_time=job_data.end_time,
         send_count=job_data.send_count,
-        send_interval_ms=job_data.send_interval_ms
+        send_interval_ms=job_data.send_interval_ms,
+        embed_sequence=job_data.embed_sequence,
+        mode=job_data.mode,
+        ramp_base_eps=job_data.ramp_base_eps,
+        ramp_factor=job_data.ramp_factor,
+        ramp_step_seconds=job_data.ramp_step_seconds,
+        ramp_max_eps=job_data.ramp_max_eps,
+        backfill_eps=job_data.backfill_eps,
+        prerender_pool=job_data.prerender_pool,
+        replay_path=job_data.replay_path,
+        replay_speed=job_data.replay_speed,
+        replay_loop=job_data.replay_loop,
+        replay_rewrite_timestamps=job_data.replay_rewrite_timestamps,
+        destinations=_job_destinations(job_data.model_dump()["destinations"])
     )
+    _validate_mode_settings(db_job)
     
     db.add(db_job)
     await db.commit()
-    await db.refresh(db_job)
+    await db.refresh(db_job, attribute_names=_REFRESHED)
+    total_count_cache.invalidate("jobs")
 
     return db_job
 
 
+# refresh() leaves lazy="raise" relationships expired unless they are named
+_REFRESHED = [column.key for column in Job.__table__.columns] + ["templates", "destinations"]
+
+
+async def _job_templates(db: Session, templates: List[dict]) -> List[JobTemplate]:
+    """
+    JobTemplate rows for the extra templates of a create or update request.
+    
+    Raises:
+        HTTPException: If a template doesn't exist
+    """
+    template_ids = {str(template["template_id"]) for template in templates}
+    if template_ids:
+        statement = select(LogTemplate.id).where(LogTemplate.id.in_(template_ids))
+        missing = template_ids - set((await db.execute(statement)).scalars())
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Template with id {min(missing)} not found"
+            )
+    return [
+        JobTemplate(position=position, template_id=str(template["template_id"]), weight=template["weight"])
+        for position, template in enumerate(templates)
+    ]
+
+
+def _job_destinations(destinations: List[dict]) -> List[JobDestination]:
+    """JobDestination rows for the extra destinations of a create or update request."""
+    return [
+        JobDestination(position=position, **destination)
+        for position, destination in enumerate(destinations)
+    ]
+
+
+# Columns shown by the console job list, selected instead of full ORM rows
+JOB_LIST_COLUMNS = (
+    Job.id,
+    Job.template_id,
+    Job.protocol,
+    Job.destination_host,
+    Job.destination_port,
+    Job.status,
+    Job.start_time,
+    Job.end_time,
+    Job.send_count,
+    Job.send_interval_ms,
+    Job.created_at,
+    Job.updated_at,
+)
+
+
+def job_list_query() -> Select:
+    """
+    Build the projection query behind the job list endpoint.
+    
+    Returns:
+        Select: Job list columns plus the template name, newest first
+    """
+    return (
+        select(*JOB_LIST_COLUMNS, LogTemplate.name.label("template_name"))
+        .join(LogTemplate, Job.template_id == LogTemplate.id)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+    )
+
+
 def get_jobs(db: Session, skip: int = 0, limit: int = 100) -> List[Job]:
     """
     Get all jobs with pagination.
@@ -87,7 +192,7 @@ def get_jobs(db: Session, skip: int = 0, limit: int = 100) -> List[Job]:
 
 async def get_job_by_id(db: Session, job_id: str) -> Optional[Job]:
     """
-    Get a job by its ID.
+    Get a job by its ID, with its extra templates and destinations.
     
     Args:
         db: Database session
@@ -96,7 +201,11 @@ async def get_job_by_id(db: Session, job_id: str) -> Optional[Job]:
     Returns:
         Optional[Job]: Job instance if found, None otherwise
     """
-    statement = select(Job).where(Job.id == job_id)
+    statement = (
+        select(Job)
+        .options(selectinload(Job.templates), selectinload(Job.destinations))
+        .where(Job.id == job_id)
+    )
     result = await db.execute(statement)
     return result.scalar_one_or_none()
 
@@ -135,7 +244,7 @@ async def start_job(db: Session, job_id: str) -> Job:
         # Update status to indicate we've dispatched the start command
         job.status = JobStatusEnum.RUNNING
         await db.commit()
-        await db.refresh(job)
+        await db.refresh(job, attribute_names=_REFRESHED)
         
         print(f"[REDIS] Sent START command for job {job_id}")
         
@@ -232,10 +341,17 @@ async def update_job(db: Session, job_id: UUID, job_data: JobUpdate) -> Job:
                     detail=f"Template with id {value} not found"
                 )
         
+        if field == "templates":
+            value = await _job_templates(db, value)
+        
+        if field == "destinations":
+            value = _job_destinations(value)
+        
         setattr(job, field, value)
     
+    _validate_mode_settings(job)
     await db.commit()
-    await db.refresh(job)
+    await db.refresh(job, attribute_names=_REFRESHED)
 
     return job
 
@@ -257,6 +373,7 @@ async def delete_job(db: Session, job_id: UUID) -> bool:
     
     await db.delete(job)
     await db.commit()
+    total_count_cache.invalidate("jobs")
     
     return True
 
@@ -276,7 +393,72 @@ def _is_valid_destination(host: str, port: int) -> bool:
     if not host or not host.strip():
         return False
     
-    if port < 1 or port > 65535:
+    if port is None or port < 1 or port > 65535:
         return False
     
-    return True
\ No newline at end of file
+    return True
+
+
+def _validate_mode_settings(job: Job) -> None:
+    """
+    Check the settings a job's mode depends on.
+    
+    Args:
+        job: Job with its new values applied
+        
+    Raises:
+        HTTPException: If a BACKFILL job lacks its time range or event rate,
+            a REPLAY job its capture file (or it lies outside
+            REPLAY_CAPTURE_ROOT), a FILE job or destination its
+            file_path (or it lies outside FILE_SINK_ROOT), another job or destination its host and port, or a
+            mode without a persistent connection has a prerender_pool
+    """
+    for destination in [job, *job.destinations]:
+        if destination.protocol == ProtocolEnum.FILE:
+            if not destination.file_path:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="FILE jobs and destinations need file_path"
+                )
+            if resolve_within(destination.file_path, cfg.FILE_SINK_ROOT) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"file_path must be an absolute path under {cfg.FILE_SINK_ROOT}"
+                )
+        elif not _is_valid_destination(destination.destination_host, destination.destination_port):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid destination host or port"
+            )
+    if job.prerender_pool and job.mode not in (JobModeEnum.RAMP, JobModeEnum.BACKFILL):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="prerender_pool is only supported by RAMP and BACKFILL jobs"
+        )
+    if job.mode == JobModeEnum.REPLAY and not job.replay_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="REPLAY jobs need replay_path"
+        )
+    if job.mode == JobModeEnum.REPLAY and resolve_within(job.replay_path, cfg.REPLAY_CAPTURE_ROOT) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"replay_path must be an absolute path under {cfg.REPLAY_CAPTURE_ROOT}"
+        )
+    if job.mode != JobModeEnum.BACKFILL:
+        return
+    if not job.start_time or not job.end_time or _as_utc(job.end_time) <= _as_utc(job.start_time):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="BACKFILL jobs need a start_time before their end_time"
+        )
+    if not job.backfill_eps:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="BACKFILL jobs need backfill_eps"
+        )
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Treat naive datetimes as UTC so request and stored values compare."""
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
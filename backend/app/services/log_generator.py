@@ -10,16 +10,56 @@ import re
 import time
 import uuid
 from datetime import datetime
-from typing import Dict, Callable, List
+from typing import Dict, Callable, List, Optional, Tuple, Union
 from faker import Faker
 import string
 import random
 
 
+PLACEHOLDER_PATTERN = re.compile(r'\{([^}]+)\}')
+LEGACY_PLACEHOLDER_PATTERN = re.compile(r'<([^>]+)>')
+
+
 def generate_random_string(length=10, chars=string.ascii_letters + string.digits):
     """Generates a random string of a specified length and character set."""
     return ''.join(random.choice(chars) for _ in range(length))
 
+
+class CompiledTemplate:
+    """
+    A template split once into literal text and the generators of its placeholders.
+    
+    render() joins the parts, so a message costs its generator calls instead
+    of two regex substitutions over the template. Placeholders without a
+    generator render as written unless the context fills them; generated
+    values are not searched for legacy <placeholder>s again, unlike
+    generate_log().
+    """
+    
+    def __init__(self, template_string: str, parts: List[Union[str, Tuple[str, Callable[[], str]]]]) -> None:
+        self.template_string = template_string
+        self._parts = parts
+    
+    def render(self, context: Optional[Dict[str, str]] = None) -> str:
+        """
+        Generate one log, see LogGenerator.generate_log.
+        
+        Args:
+            context: Optional fixed values for placeholders of this message
+            
+        Returns:
+            A log string with all placeholders replaced with generated data
+        """
+        out = []
+        for part in self._parts:
+            if part.__class__ is str:
+                out.append(part)
+            elif context and part[0] in context:
+                out.append(context[part[0]])
+            else:
+                out.append(part[1]())
+        return ''.join(out)
+
 class LogGenerator:
     """
     A service class for generating randomized log entries from template strings.
@@ -154,6 +194,12 @@ class LogGenerator:
             "orchestrator.cluster.name": lambda: self.fake.random_element(elements=("prod-cluster", "dev-cluster", "test-cluster")),
             "kubernetes.pod.name": lambda: f"pod-{generate_random_string(length=8)}",
             
+            # Simulator metadata, filled per message from the job's context
+            # (see generate_log); these defaults only apply without a context
+            "sim.job_id": lambda: "-",
+            "sim.seq": lambda: "0",
+            "sim.sent_ns": lambda: str(time.time_ns()),
+            
             # Legacy placeholders for backward compatibility
             "srcip": self.fake.ipv4,
             "dstip": self.fake.ipv4,
@@ -176,7 +222,7 @@ class LogGenerator:
             "rcvdpkt": lambda: str(self.fake.random_int(min=1, max=1000)),
         }
     
-    def generate_log(self, template_string: str) -> str:
+    def generate_log(self, template_string: str, context: Optional[Dict[str, str]] = None) -> str:
         """
         Generate a randomized log entry from a template string.
         
@@ -186,6 +232,8 @@ class LogGenerator:
         
         Args:
             template_string: The template string containing placeholders to replace
+            context: Optional fixed values for placeholders of this message
+                (e.g. {"sim.seq": "42"}), taking precedence over the generators
             
         Returns:
             A log string with all placeholders replaced with generated data
@@ -199,25 +247,66 @@ class LogGenerator:
         """
         def replace_placeholder(match):
             placeholder = match.group(1)
+            if context and placeholder in context:
+                return context[placeholder]
             if placeholder in self._placeholder_generators:
                 return self._placeholder_generators[placeholder]()
             # If placeholder not found, return the original match
             return match.group(0)
         
         # Replace ECS format placeholders {placeholder}
-        result = re.sub(r'\{([^}]+)\}', replace_placeholder, template_string)
+        result = PLACEHOLDER_PATTERN.sub(replace_placeholder, template_string)
         
         # For backward compatibility, also replace legacy format <placeholder>
         def replace_legacy_placeholder(match):
             placeholder = match.group(1)
+            if context and placeholder in context:
+                return context[placeholder]
             if placeholder in self._placeholder_generators:
                 return self._placeholder_generators[placeholder]()
             return match.group(0)
         
-        result = re.sub(r'<([^>]+)>', replace_legacy_placeholder, result)
+        result = LEGACY_PLACEHOLDER_PATTERN.sub(replace_legacy_placeholder, result)
         
         return result
     
+    def compile(self, template_string: str) -> CompiledTemplate:
+        """
+        Compile a template for generating many logs from it.
+        
+        Args:
+            template_string: The template string containing placeholders to replace
+            
+        Returns:
+            CompiledTemplate: Renders logs like generate_log, with the
+            generators of this LogGenerator
+        """
+        parts = []
+        for index, text in enumerate(PLACEHOLDER_PATTERN.split(template_string)):
+            if index % 2:
+                self._compile_placeholder(parts, text, '{%s}')
+                continue
+            for legacy_index, legacy_text in enumerate(LEGACY_PLACEHOLDER_PATTERN.split(text)):
+                if legacy_index % 2:
+                    self._compile_placeholder(parts, legacy_text, '<%s>')
+                elif legacy_text:
+                    parts.append(legacy_text)
+        # adjacent literal text is joined into one part
+        merged = []
+        for part in parts:
+            if merged and part.__class__ is str and merged[-1].__class__ is str:
+                merged[-1] += part
+            else:
+                merged.append(part)
+        return CompiledTemplate(template_string, merged)
+    
+    def _compile_placeholder(self, parts: list, placeholder: str, literal: str) -> None:
+        if placeholder in self._placeholder_generators:
+            parts.append((placeholder, self._placeholder_generators[placeholder]))
+        else:
+            # a context may still fill it, as in generate_log
+            parts.append((placeholder, lambda text=literal % placeholder: text))
+    
     def add_placeholder(self, placeholder: str, generator_func: Callable[[], str]) -> None:
         """
         Add a custom placeholder generator.
@@ -3,12 +3,56 @@ Service layer for template management business logic.
 """
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import Select, select
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from models.log_template import LogTemplate
+from core.custom_page import total_count_cache
+from services.template_detection import template_detection_index
 from schemas.log_template import LogTemplateCreate, LogTemplateUpdate
 
 
+# Columns shown by the console template list, selected instead of full ORM rows
+TEMPLATE_LIST_COLUMNS = (
+    LogTemplate.id,
+    LogTemplate.name,
+    LogTemplate.device_type,
+    LogTemplate.content_format,
+    LogTemplate.description,
+    LogTemplate.is_predefined,
+    LogTemplate.created_at,
+    LogTemplate.updated_at,
+)
+
+
+def template_list_query(
+    name: Optional[str] = None,
+    device_type: Optional[str] = None,
+    content_format: Optional[str] = None,
+) -> Select:
+    """
+    Build the projection query behind the template list endpoint.
+    
+    Args:
+        name: Optional filter by template name (substring, case-insensitive)
+        device_type: Optional filter by device type
+        content_format: Optional filter by content format
+        
+    Returns:
+        Select: Template list columns matching the filters, newest first
+    """
+    query = select(*TEMPLATE_LIST_COLUMNS).order_by(
+        LogTemplate.created_at.desc(), LogTemplate.id.desc()
+    )
+    if name and name != "undefined":
+        query = query.filter(LogTemplate.name.ilike(f"%{name}%"))
+    if device_type:
+        query = query.filter(LogTemplate.device_type == device_type)
+    if content_format:
+        query = query.filter(LogTemplate.content_format == content_format)
+    return query
+
+
 async def create_template(db: Session, template_data: LogTemplateCreate) -> LogTemplate:
     """
     Create a new log template.
@@ -31,6 +75,8 @@ async def create_template(db: Session, template_data: LogTemplateCreate) -> LogT
     db.add(db_template)
     await db.commit()
     await db.refresh(db_template)
+    total_count_cache.invalidate("log_templates")
+    template_detection_index.upsert(db_template.id, db_template.name, db_template.content_format)
     
     return db_template
 
@@ -52,18 +98,23 @@ async def get_templates(db: Session, skip: int = 0, limit: int = 100) -> List[Lo
     return result.scalars().all()
 
 
-async def get_template_by_id(db: Session, template_id: str) -> Optional[LogTemplate]:
+async def get_template_by_id(
+    db: Session, template_id: str, with_jobs: bool = False
+) -> Optional[LogTemplate]:
     """
     Get a template by its ID.
     
     Args:
         db: Database session
         template_id: Template ID
+        with_jobs: Also load the template's jobs (needed for cascading deletes)
         
     Returns:
         LogTemplate: Template instance or None if not found
     """
     statement = select(LogTemplate).where(LogTemplate.id == template_id)
+    if with_jobs:
+        statement = statement.options(selectinload(LogTemplate.jobs))
     result = await db.execute(statement)
     return result.scalar_one_or_none()
 
@@ -104,6 +155,7 @@ async def update_template(db: Session, template_id: str, template_data: LogTempl
     
     await db.commit()
     await db.refresh(db_template)
+    template_detection_index.upsert(db_template.id, db_template.name, db_template.content_format)
     
     return db_template
 
@@ -122,7 +174,7 @@ async def delete_template(db: Session, template_id: str) -> bool:
     Raises:
         HTTPException: If template not found or is predefined
     """
-    db_template = await get_template_by_id(db, template_id)
+    db_template = await get_template_by_id(db, template_id, with_jobs=True)
     
     if not db_template:
         raise HTTPException(
@@ -138,6 +190,10 @@ async def delete_template(db: Session, template_id: str) -> bool:
     
     await db.delete(db_template)
     await db.commit()
+    total_count_cache.invalidate("log_templates")
+    # the template's jobs were deleted with it
+    total_count_cache.invalidate("jobs")
+    template_detection_index.remove(template_id)
     
     return True
 
@@ -176,5 +232,7 @@ async def clone_template(db: Session, template_id: str) -> LogTemplate:
     db.add(cloned_template)
     await db.commit()
     await db.refresh(cloned_template)
+    total_count_cache.invalidate("log_templates")
+    template_detection_index.upsert(cloned_template.id, cloned_template.name, cloned_template.content_format)
     
     return cloned_template
\ No newline at end of file
@@ -1,74 +1,426 @@
+import asyncio
+import codecs
 import re
-from typing import Dict, Any, Optional
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
+from pydantic_core import to_json
 from schemas.tools import LogParseResponse
 
 
-def convert_template_to_regex(template: str) -> str:
+PLACEHOLDER_PATTERN = re.compile(r'\{([^}]+)\}')
+_INVALID_GROUP_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+
+# Number of distinct templates whose compiled parser is kept in memory
+PARSER_CACHE_SIZE = 512
+
+# Lines parsed per worker-thread hop when streaming bulk input
+PARSE_BATCH_LINES = 5000
+
+# Fixed pairs a line must contain before the key=value parser tokenizes it;
+# the first few tell templates apart, more cost more than they reject
+KEY_VALUE_ANCHORS = 3
+
+
+def _sanitize_group_name(placeholder: str) -> str:
+    """Create valid regex group name by replacing dots and other invalid chars."""
+    return _INVALID_GROUP_CHARS.sub('_', placeholder)
+
+
+def _split_template(template: str) -> Tuple[List[str], List[str]]:
+    """
+    Split a template into its literal parts and placeholders.
+
+    Returns:
+        (literals, placeholders) where literals has one more item than placeholders
+    """
+    parts = PLACEHOLDER_PATTERN.split(template)
+    return parts[0::2], parts[1::2]
+
+
+def _unique_group_names(placeholders: List[str]) -> List[str]:
+    """
+    Sanitize placeholders into group names, suffixing repeats so templates that
+    use a placeholder twice (e.g. {source.mac}) still compile.
+    """
+    seen: Dict[str, int] = {}
+    names = []
+    for placeholder in placeholders:
+        name = _sanitize_group_name(placeholder)
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name}__{count + 1}")
+    return names
+
+
+def convert_template_to_regex(template: str, stop_at_literal: bool = False) -> str:
     """
     Convert a template string with {place.holder} syntax to a regex pattern.
     
     Args:
         template: Template string like "srcip={source.ip} dstip={dest.ip}"
+        stop_at_literal: Also stop each placeholder at the first char of the
+            literal after it. Values may then not contain that char (e.g.
+            the colons of an IPv6 address before ":{port}"), but
+            delimiter-separated templates ({a},{b}) cannot backtrack
+            exponentially on lines they do not match
         
     Returns:
         Regex pattern with named capture groups
     """
-    # First, extract placeholders before escaping
-    placeholder_pattern = r'\{([^}]+)\}'
-    placeholders = []
-    
-    def extract_placeholder(match):
-        placeholder = match.group(1)
-        placeholders.append(placeholder)
-        # Return a temporary marker that we'll replace later
-        return f"__PLACEHOLDER_{len(placeholders)-1}__"
-    
-    # Replace placeholders with temporary markers
-    temp_template = re.sub(placeholder_pattern, extract_placeholder, template)
-    
-    # Now escape the template (which no longer contains placeholders)
-    escaped_template = re.escape(temp_template)
-    
-    # Replace the temporary markers with regex groups
-    for i, placeholder in enumerate(placeholders):
-        # Create valid regex group name by replacing dots and other invalid chars
-        group_name = re.sub(r'[^a-zA-Z0-9_]', '_', placeholder)
-        marker = re.escape(f"__PLACEHOLDER_{i}__")
-        # Use non-greedy matching that stops at whitespace or end of string
-        escaped_template = escaped_template.replace(marker, f'(?P<{group_name}>[^\\s]+)')
-    
-    return escaped_template
+    literals, placeholders = _split_template(template)
+    group_names = _unique_group_names(placeholders)
+
+    regex_parts = [re.escape(literals[0])]
+    for group_name, literal in zip(group_names, literals[1:]):
+        stop = literal[:1]
+        if stop_at_literal and stop and not stop.isspace():
+            regex_parts.append(f'(?P<{group_name}>[^\\s{re.escape(stop)}]+)')
+        else:
+            regex_parts.append(f'(?P<{group_name}>[^\\s]+)')
+        regex_parts.append(re.escape(literal))
+
+    return ''.join(regex_parts)
 
 
-def unflatten_dict(flat_dict: Dict[str, str], original_placeholders: Dict[str, str]) -> Dict[str, Any]:
+def _insert_path(result: Dict[str, Any], path: Tuple[str, ...], value: str) -> None:
+    current = result
+    for k in path[:-1]:
+        nested = current.get(k)
+        if nested is None:
+            nested = current[k] = {}
+        current = nested
+    current[path[-1]] = value
+
+
+def _result_layout(group_paths: Tuple[Optional[Tuple[str, ...]], ...]) -> Tuple[int, Tuple[Tuple[int, str, int], ...]]:
     """
-    Convert a flat dictionary with sanitized group names back to nested dictionary.
-    
+    Precompute how captured values are assembled into the nested ECS dict.
+
+    Values and the dicts nesting them share one slot list per parse: values
+    first, then the root dict, then one dict per nested path. Each op is
+    (target slot, key, source slot), so building a result is a flat loop of
+    item assignments in first-seen key order.
+
+    Returns:
+        (number of dicts, ops)
+    """
+    root = len(group_paths)
+    containers: Dict[Tuple[str, ...], int] = {(): root}
+    ops = []
+    for index, path in enumerate(group_paths):
+        if path is None:
+            continue
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            if prefix not in containers:
+                containers[prefix] = root + len(containers)
+                ops.append((containers[path[:depth - 1]], path[depth - 1], containers[prefix]))
+        ops.append((containers[path[:-1]], path[-1], index))
+    return len(containers), tuple(ops)
+
+
+class TemplateParser(ABC):
+    """Base class of parsers compiled once per template for repeated parsing."""
+
+    __slots__ = ("template",)
+
+    @abstractmethod
+    def parse(self, log_message: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a log message into nested ECS data.
+
+        Returns:
+            The nested dict, or None when the message does not match
+        """
+        raise NotImplementedError
+
+    def parse_response(self, log_message: str) -> LogParseResponse:
+        """Parse a log message and wrap the result for the API."""
+        structured_data = self.parse(log_message)
+        if structured_data is None:
+            return LogParseResponse(
+                is_match=False,
+                error_message="Log message does not match the template pattern"
+            )
+        return LogParseResponse(
+            is_match=True,
+            parsed_ecs=structured_data
+        )
+
+
+class CompiledTemplateParser(TemplateParser):
+    """
+    A template compiled once into a regex.
+
+    Holds the compiled regex and, per capture group, the nested ECS path its
+    value is written to, so parsing a message is a single match plus dict
+    inserts. Repeated placeholders keep the value of their first occurrence.
+    """
+
+    __slots__ = ("pattern", "group_paths")
+
+    def __init__(self, template: str, stop_at_literal: bool = False) -> None:
+        self.template = template
+        self.pattern: re.Pattern = re.compile(convert_template_to_regex(template, stop_at_literal))
+
+        _, placeholders = _split_template(template)
+        seen = set()
+        group_paths: List[Optional[Tuple[str, ...]]] = []
+        for placeholder in placeholders:
+            if placeholder in seen:
+                group_paths.append(None)
+            else:
+                seen.add(placeholder)
+                group_paths.append(tuple(placeholder.split('.')))
+        self.group_paths: Tuple[Optional[Tuple[str, ...]], ...] = tuple(group_paths)
+
+    def parse(self, log_message: str) -> Optional[Dict[str, Any]]:
+        match = self.pattern.match(log_message)
+        if match is None:
+            return None
+
+        result: Dict[str, Any] = {}
+        for path, value in zip(self.group_paths, match.groups()):
+            if path is not None:
+                _insert_path(result, path, value)
+        return result
+
+
+def split_key_values(text: str, keep_quotes: bool = False) -> Optional[List[Tuple[str, str]]]:
+    """
+    Tokenize a `key=value key="quoted value"` line without regex.
+
+    Splitting on double quotes leaves quoted values at odd positions, so only
+    the unquoted segments need splitting on spaces.
+
     Args:
-        flat_dict: Flat dict like {'source_ip': '1.2.3.4', 'dest_port': '80'}
-        original_placeholders: Mapping from sanitized names to original placeholder names
-        
+        text: Line of space separated pairs, values optionally double-quoted
+        keep_quotes: Keep the quotes around quoted values
+
     Returns:
-        Nested dict like {'source': {'ip': '1.2.3.4'}, 'dest': {'port': '80'}}
+        (key, value) pairs in order, or None when the line
+        is not key=value shaped
     """
-    result = {}
-    
-    for sanitized_key, value in flat_dict.items():
-        # Get the original placeholder name
-        original_key = original_placeholders.get(sanitized_key, sanitized_key)
-        keys = original_key.split('.')
-        
-        # Navigate/create the nested structure
-        current = result
-        for k in keys[:-1]:
-            if k not in current:
-                current[k] = {}
-            current = current[k]
-        
-        # Set the final value
-        current[keys[-1]] = value
-    
-    return result
+    parts = text.split('"')
+    last = len(parts) - 1
+    if last % 2:
+        return None
+    # every unquoted token needs an '=', counted in C before looping over them
+    unquoted = ' '.join(parts[0::2])
+    if len(unquoted.split()) > unquoted.count('='):
+        return None
+
+    pairs = []
+    key = ""
+    for i, segment in enumerate(parts):
+        if i % 2:
+            pairs.append((key, f'"{segment}"' if keep_quotes else segment))
+            continue
+        if i and segment and segment[0] != ' ':
+            return None
+        tokens = segment.split(' ')
+        if i < last:
+            opener = tokens.pop()
+            key = opener[:-1]
+            if not opener.endswith('=') or not key or '=' in key:
+                return None
+        for token in tokens:
+            if token:
+                k, sep, v = token.partition('=')
+                if not sep or not k:
+                    return None
+                pairs.append((k, v))
+    return pairs
+
+
+def _match_value(literals: Tuple[str, ...], value: str) -> Optional[List[str]]:
+    """
+    Split a value around the literal parts of its template, None on mismatch.
+
+    Literals are searched from the right, so earlier placeholders take the
+    longest value, as the greedy groups of the regex parsers do.
+    """
+    if len(literals) == 1:
+        return [] if value == literals[0] else None
+    if len(literals) == 2 and not literals[0] and not literals[1]:
+        return [value]
+    start = len(literals[0])
+    end = len(value) - len(literals[-1])
+    if end < start or not value.startswith(literals[0]) or not value.endswith(literals[-1]):
+        return None
+    captured = []
+    for literal in reversed(literals[1:-1]):
+        idx = value.rfind(literal, start, end)
+        if idx < 0:
+            return None
+        captured.append(value[idx + len(literal):end])
+        end = idx
+    captured.append(value[start:end])
+    captured.reverse()
+    return captured
+
+
+def _key_value_regex(pairs: List[Tuple[str, str, bool]], group_names: List[str]) -> str:
+    """
+    Build the fast-path regex of a key=value template.
+
+    Placeholders inside quotes may contain anything but a quote, so quoted
+    values with spaces parse; bare ones stop at whitespace, as in
+    convert_template_to_regex.
+    """
+    names = iter(group_names)
+    regex_parts = []
+    for key, value_template, is_quoted in pairs:
+        literals, placeholders = _split_template(value_template)
+        value_parts = [re.escape(literals[0])]
+        for _, literal in zip(placeholders, literals[1:]):
+            group = '[^"]*' if is_quoted else '[^\\s]+'
+            value_parts.append(f'(?P<{next(names)}>{group})')
+            value_parts.append(re.escape(literal))
+        value_regex = ''.join(value_parts)
+        if is_quoted:
+            value_regex = f'"{value_regex}"'
+        regex_parts.append(f'{re.escape(key)}={value_regex}')
+    return ' '.join(regex_parts)
+
+
+class KeyValueTemplateParser(TemplateParser):
+    """
+    Parser for `key=value` / `key="value"` templates.
+
+    Lines in template order go through one quote-aware compiled pattern, so
+    quoted values may contain spaces. Lines that do not fit it are tokenized
+    instead and each template key is looked up in a precomputed
+    key -> value literals table, so extra or reordered keys (common across
+    firmware versions) still match. Literal values must be equal either way,
+    so e.g. type="traffic" does not match type="event".
+
+    Before tokenizing, a line must contain the first few fixed pairs of the
+    template (e.g. `type="traffic" subtype="forward"`); those substring
+    checks run in C and turn away lines of other templates without a
+    Python tokenizer pass.
+
+    Either way the captured values are assembled by a precomputed layout
+    rather than walking each ECS path, which is where most of the time of
+    parsing a long FortiGate line goes.
+    """
+
+    __slots__ = ("pattern", "anchors", "fields", "dict_count", "layout")
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        quoted_pairs = split_key_values(template, keep_quotes=True)
+        if quoted_pairs is None:
+            raise ValueError("Template is not key=value shaped")
+        pairs = [
+            (key, value[1:-1], True) if value.startswith('"') else (key, value, False)
+            for key, value in quoted_pairs
+        ]
+
+        _, placeholders = _split_template(template)
+        self.pattern: re.Pattern = re.compile(
+            _key_value_regex(pairs, _unique_group_names(placeholders))
+        )
+
+        seen = set()
+        group_paths: List[Optional[Tuple[str, ...]]] = []
+        for placeholder in placeholders:
+            if placeholder in seen:
+                group_paths.append(None)
+            else:
+                seen.add(placeholder)
+                group_paths.append(tuple(placeholder.split('.')))
+        self.fields: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+            (key, tuple(_split_template(value_template)[0])) for key, value_template, _ in pairs
+        )
+        self.anchors: Tuple[str, ...] = tuple(
+            f"{key}={value}" for key, value in quoted_pairs if not PLACEHOLDER_PATTERN.search(value)
+        )[:KEY_VALUE_ANCHORS]
+        self.dict_count, self.layout = _result_layout(tuple(group_paths))
+
+    def _build(self, values: List[str]) -> Dict[str, Any]:
+        root = len(values)
+        slots: List[Any] = values
+        slots.extend({} for _ in range(self.dict_count))
+        for target, key, source in self.layout:
+            slots[target][key] = slots[source]
+        return slots[root]
+
+    def parse(self, log_message: str) -> Optional[Dict[str, Any]]:
+        match = self.pattern.match(log_message)
+        if match is not None:
+            return self._build(list(match.groups()))
+
+        for anchor in self.anchors:
+            if anchor not in log_message:
+                return None
+        pairs = split_key_values(log_message)
+        if pairs is None:
+            return None
+        values = dict(pairs)
+        captured: List[str] = []
+        for key, literals in self.fields:
+            value = values.get(key)
+            if value is None:
+                return None
+            parts = _match_value(literals, value)
+            if parts is None:
+                return None
+            captured.extend(parts)
+        return self._build(captured)
+
+
+def is_key_value_template(template: str) -> bool:
+    """
+    Check whether a template is a sequence of distinct key=value pairs whose
+    values can be split around their literals unambiguously.
+    """
+    if not PLACEHOLDER_PATTERN.search(template):
+        return False
+    pairs = split_key_values(template)
+    if not pairs or len(pairs) < 2:
+        return False
+    keys = set()
+    for key, value_template in pairs:
+        if key in keys or '{' in key or '}' in key:
+            return False
+        keys.add(key)
+        literals, _ = _split_template(value_template)
+        # adjacent placeholders ({a}{b}) have no literal to split on
+        if any(not literal for literal in literals[1:-1]):
+            return False
+    return True
+
+
+@lru_cache(maxsize=PARSER_CACHE_SIZE)
+def get_compiled_parser(template_content_format: str) -> TemplateParser:
+    """
+    Get the compiled parser for a template, compiling it on first use.
+
+    key=value shaped templates get the key=value parser, anything else the
+    regex one. The cache is keyed by the template content, so edited
+    templates get a new parser and unchanged ones are never recompiled.
+    """
+    if is_key_value_template(template_content_format):
+        return KeyValueTemplateParser(template_content_format)
+    return CompiledTemplateParser(template_content_format)
+
+
+@lru_cache(maxsize=PARSER_CACHE_SIZE)
+def get_detection_parser(template_content_format: str) -> TemplateParser:
+    """
+    Get the parser template detection verifies candidates with.
+
+    Detection tries many templates a line does not match, so regex templates
+    are compiled with stop_at_literal to keep rejection linear. A line it
+    matches is also matched by get_compiled_parser, whose captures are the
+    ones to report.
+    """
+    if is_key_value_template(template_content_format):
+        return get_compiled_parser(template_content_format)
+    return CompiledTemplateParser(template_content_format, stop_at_literal=True)
 
 
 def parse_log_with_template(template_content_format: str, log_message: str) -> LogParseResponse:
@@ -83,41 +435,116 @@ def parse_log_with_template(template_content_format: str, log_message: str) -> L
         LogParseResponse with parsing results
     """
     try:
-        # Extract placeholders for mapping back later
-        placeholder_pattern = r'\{([^}]+)\}'
-        placeholders = re.findall(placeholder_pattern, template_content_format)
-        
-        # Create mapping from sanitized names back to original placeholders
-        original_placeholders = {}
-        for placeholder in placeholders:
-            sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', placeholder)
-            original_placeholders[sanitized] = placeholder
-        
-        # Convert template to regex pattern
-        regex_pattern = convert_template_to_regex(template_content_format)
-        
-        # Try to match the log message against the pattern
-        match = re.match(regex_pattern, log_message)
-        
-        if not match:
-            return LogParseResponse(
-                is_match=False,
-                error_message="Log message does not match the template pattern"
-            )
-        
-        # Extract the matched groups
-        flat_data = match.groupdict()
-        
-        # Convert to nested ECS format
-        structured_data = unflatten_dict(flat_data, original_placeholders)
-        
-        return LogParseResponse(
-            is_match=True,
-            parsed_ecs=structured_data
-        )
+        parser = get_compiled_parser(template_content_format)
+        return parser.parse_response(log_message)
         
     except Exception as e:
         return LogParseResponse(
             is_match=False,
             error_message=f"Error parsing log: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+def parse_lines_to_ndjson(
+    parser: TemplateParser,
+    lines: List[str],
+    first_line_no: int,
+    only_misses: bool = False,
+) -> Tuple[bytes, int]:
+    """
+    Parse a batch of log lines into NDJSON result records.
+
+    Args:
+        parser: Compiled parser for the template
+        lines: Log lines without trailing newlines
+        first_line_no: 1-based line number of lines[0]
+        only_misses: Only emit records for lines that do not match
+
+    Returns:
+        (ndjson bytes, number of matched lines)
+    """
+    out = []
+    matched = 0
+    for line_no, line in enumerate(lines, first_line_no):
+        parsed = parser.parse(line)
+        if parsed is not None:
+            matched += 1
+            if not only_misses:
+                out.append(to_json({"line": line_no, "is_match": True, "parsed_ecs": parsed}))
+        else:
+            out.append(to_json({"line": line_no, "is_match": False}))
+    if out:
+        out.append(b"")
+    return b"\n".join(out), matched
+
+
+async def stream_ndjson_batches(
+    chunks: AsyncIterator[bytes],
+    process_batch: Callable[[List[str], int], Tuple[bytes, int]],
+) -> AsyncIterator[bytes]:
+    """
+    Split a byte stream into lines and yield NDJSON produced per batch.
+
+    Input is consumed chunk by chunk and each batch of lines is handed to
+    `process_batch(lines, first_line_no)` on a worker thread, so results start
+    flowing before the input is exhausted and the event loop is never blocked.
+    The last record is a summary with match/miss counts and throughput.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    started = time.perf_counter()
+    pending = ""
+    batch: List[str] = []
+    line_no = 1
+    total = matched = 0
+
+    async def flush() -> bytes:
+        nonlocal batch, line_no, total, matched
+        body, batch_matched = await asyncio.to_thread(process_batch, batch, line_no)
+        line_no += len(batch)
+        total += len(batch)
+        matched += batch_matched
+        batch = []
+        return body
+
+    async for chunk in chunks:
+        text = pending + decoder.decode(chunk)
+        lines = text.split("\n")
+        pending = lines.pop()
+        batch.extend(line.rstrip("\r") for line in lines)
+        if len(batch) >= PARSE_BATCH_LINES:
+            body = await flush()
+            if body:
+                yield body
+
+    pending += decoder.decode(b"", final=True)
+    if pending.rstrip("\r"):
+        batch.append(pending.rstrip("\r"))
+    if batch:
+        body = await flush()
+        if body:
+            yield body
+
+    elapsed = time.perf_counter() - started
+    yield to_json({
+        "summary": {
+            "lines": total,
+            "matched": matched,
+            "missed": total - matched,
+            "elapsed_s": round(elapsed, 3),
+            "lines_per_sec": round(total / elapsed, 1) if elapsed > 0 else None,
+        }
+    }) + b"\n"
+
+
+def stream_parse_ndjson(
+    parser: TemplateParser,
+    chunks: AsyncIterator[bytes],
+    only_misses: bool = False,
+) -> AsyncIterator[bytes]:
+    """Parse newline-delimited logs from a byte stream and yield NDJSON results."""
+    return stream_ndjson_batches(
+        chunks,
+        lambda lines, first_line_no: parse_lines_to_ndjson(
+            parser, lines, first_line_no, only_misses
+        ),
+    )
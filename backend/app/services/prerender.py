@@ -0,0 +1,170 @@
+"""
+Pre-rendered message pools for the highest-EPS jobs.
+
+Rendering a template costs far more than sending the result, and at high
+rates only the timestamps of a message need to be fresh. A
+PrerenderedCorpus renders a pool of messages once into one contiguous
+buffer, with every time-dependent placeholder (the ones VirtualClock fills,
+plus {sim.seq} and {sim.sent_ns} of sequence-numbered jobs) rendered at a
+fixed width. The offsets of those spans are kept, and per send only they
+are overwritten in place before the message goes out as a memoryview slice
+of the buffer, so sending is a loop of small copies and socket writes.
+
+Messages repeat every `size` sends: every other generated value (addresses,
+ports, ids) cycles through the pool. The pool of a template mix is drawn
+by weight, so the mix holds over any `size` consecutive sends.
+"""
+import random
+import re
+import time
+from array import array
+from typing import Optional, Union
+
+from services.log_generator import LogGenerator
+from services.template_mix import TemplateMix
+from services.virtual_clock import US_PER_SECOND, TimestampFormatter
+
+# Kinds of patched spans
+DATE, DATE2, TIME, ISO, EPOCH, START, SEQ, SENT_NS = range(8)
+
+# Rendered width of each kind; ISO always carries microseconds so its width is fixed
+WIDTHS = {DATE: 10, DATE2: 10, TIME: 8, ISO: 26, EPOCH: 10, START: 10, SEQ: 10, SENT_NS: 19}
+
+TIME_PLACEHOLDERS = {
+    "@timestamp.date": DATE,
+    "date": DATE,
+    "@timestamp.date2": DATE2,
+    "@timestamp.time": TIME,
+    "time": TIME,
+    "@timestamp": ISO,
+    "@timestamp.high_res": ISO,
+    "event.created": EPOCH,
+    "eventtime": EPOCH,
+    "event.start": START,
+}
+SEQUENCE_PLACEHOLDERS = {"sim.seq": SEQ, "sim.sent_ns": SENT_NS}
+
+# Rendered in place of a placeholder to find its span afterwards
+SENTINEL = re.compile(rb"\x00(\d)\x00")
+
+
+class PrerenderedCorpus:
+    """
+    A pool of rendered messages whose timestamp spans are patched per send.
+
+    Every message is stored with its trailing newline; message() returns
+    it as a memoryview slice that stays valid until the next call.
+    """
+
+    def __init__(
+        self,
+        template: Union[str, TemplateMix],
+        size: int,
+        generator: Optional[LogGenerator] = None,
+        job_id: Optional[str] = None
+    ) -> None:
+        """
+        Render `size` messages of `template`.
+
+        Args:
+            template: Template, or mix of templates, to render
+            size: Number of messages in the pool
+            generator: LogGenerator to render with (default: a new one)
+            job_id: Fills {sim.job_id} and makes {sim.seq} and {sim.sent_ns}
+                patched spans, for sequence-numbered jobs
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        generator = generator or LogGenerator()
+        if isinstance(template, TemplateMix):
+            # compiled again, with the generator of the rendering thread
+            mix = TemplateMix(template.templates, template.weights, generator)
+        else:
+            mix = TemplateMix([template], generator=generator)
+        placeholders = dict(TIME_PLACEHOLDERS)
+        context = {}
+        if job_id is not None:
+            placeholders.update(SEQUENCE_PLACEHOLDERS)
+            context["sim.job_id"] = job_id
+        context.update({name: f"\x00{kind}\x00" for name, kind in placeholders.items()})
+
+        buffer = bytearray()
+        self._bounds = array("q", [0])
+        self._first_span = array("q", [0])
+        self._span_offsets = array("q")
+        self._span_kinds = array("B")
+        # seconds event.start lies before the send time, drawn once per span
+        self._span_deltas = array("q")
+        for _ in range(size):
+            rendered = mix.render(context).encode("utf-8")
+            position = 0
+            for match in SENTINEL.finditer(rendered):
+                buffer += rendered[position:match.start()]
+                kind = int(match.group(1))
+                self._span_offsets.append(len(buffer))
+                self._span_kinds.append(kind)
+                self._span_deltas.append(random.randint(0, 3600) if kind == START else 0)
+                buffer += b"0" * WIDTHS[kind]
+                position = match.end()
+            buffer += rendered[position:]
+            buffer += b"\n"
+            self._bounds.append(len(buffer))
+            self._first_span.append(len(self._span_offsets))
+
+        self.size = size
+        self.buffer = buffer
+        self._view = memoryview(buffer)
+        self._formatter = TimestampFormatter()
+        self._second: Optional[int] = None
+        self._fixed = {}
+        self._iso_second = b""
+
+    def __len__(self) -> int:
+        return self.size
+
+    def message(self, index: int, epoch_us: int, seq: int = 0) -> memoryview:
+        """
+        Message `index` (modulo the pool size) stamped with `epoch_us`.
+
+        Args:
+            index: Send index, wraps around the pool
+            epoch_us: Event time in microseconds since the epoch
+            seq: Sequence number for {sim.seq}
+
+        Returns:
+            memoryview: The message including its trailing newline
+        """
+        index %= self.size
+        second, fraction = divmod(epoch_us, US_PER_SECOND)
+        if second != self._second:
+            self._refresh(second)
+        buffer = self.buffer
+        fixed = self._fixed
+        kinds = self._span_kinds
+        offsets = self._span_offsets
+        for span in range(self._first_span[index], self._first_span[index + 1]):
+            offset = offsets[span]
+            kind = kinds[span]
+            if kind == ISO:
+                buffer[offset:offset + 26] = self._iso_second + b"%06d" % fraction
+            elif kind == START:
+                buffer[offset:offset + 10] = b"%010d" % (second - self._span_deltas[span])
+            elif kind == SEQ:
+                buffer[offset:offset + 10] = b"%010d" % seq
+            elif kind == SENT_NS:
+                buffer[offset:offset + 19] = b"%019d" % time.time_ns()
+            else:
+                buffer[offset:offset + WIDTHS[kind]] = fixed[kind]
+        return self._view[self._bounds[index]:self._bounds[index + 1]]
+
+    def _refresh(self, second: int) -> None:
+        """Re-encode the second-resolution spans when the second changes."""
+        self._second = second
+        context = self._formatter.context(second * US_PER_SECOND)
+        self._fixed = {
+            DATE: context["@timestamp.date"].encode(),
+            DATE2: context["@timestamp.date2"].encode(),
+            TIME: context["@timestamp.time"].encode(),
+            EPOCH: context["event.created"].encode(),
+        }
+        self._iso_second = f"{context['@timestamp.date']}T{context['@timestamp.time']}.".encode()
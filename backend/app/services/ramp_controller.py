@@ -0,0 +1,161 @@
+"""
+Adaptive EPS ramp to find a collector's saturation point.
+
+A RAMP job starts at ramp_base_eps and multiplies the rate by ramp_factor
+every ramp_step_seconds. Each step is judged on send-side signals (time spent
+waiting in TCP drain(), send errors, reconnects, whether the target rate was
+reached at all) and, when a sequence receiver reports for the job, on receiver
+loss. After the first step that is not sustainable the controller bisects
+between the last sustainable rate and the rate the destination accepted
+under pressure, then settles on the highest sustainable rate for the rest of
+the job.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Used where a RAMP job leaves a ramp_* setting empty
+DEFAULT_BASE_EPS = 100
+DEFAULT_FACTOR = 1.5
+DEFAULT_STEP_SECONDS = 10
+
+# A step is sustainable when it reached this share of its target rate ...
+MIN_ACHIEVED_RATIO = 0.95
+# ... spent at most this share of its duration blocked in drain() ...
+MAX_DRAIN_STALL_RATIO = 0.2
+# ... had no send errors or reconnects, and the receiver lost at most this share
+MAX_LOSS_RATIO = 0.001
+
+# Bisection stops once the ceiling is within this factor of the sustainable rate
+REFINE_PRECISION = 1.05
+MAX_REFINE_STEPS = 5
+# Share of the ceiling probed when no sustainable rate below it is known
+PROBE_RATIO = 0.8
+
+
+@dataclass
+class RampStep:
+    """Signals collected while sending at one target rate."""
+
+    target_eps: float
+    elapsed: float
+    sent: int
+    errors: int = 0
+    reconnects: int = 0
+    drain_seconds: float = 0.0
+    # None when no receiver reported for the job during the step
+    loss_ratio: Optional[float] = None
+
+    @property
+    def achieved_eps(self) -> float:
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+    def problems(self) -> List[str]:
+        """Why the step is not sustainable (empty when it is)."""
+        problems = []
+        if self.errors:
+            problems.append(f"{self.errors} send error(s)")
+        if self.reconnects:
+            problems.append(f"{self.reconnects} reconnect(s)")
+        if self.elapsed > 0 and self.drain_seconds / self.elapsed > MAX_DRAIN_STALL_RATIO:
+            problems.append(f"drain() stalled {self.drain_seconds / self.elapsed:.0%} of the step")
+        if self.loss_ratio is not None and self.loss_ratio > MAX_LOSS_RATIO:
+            problems.append(f"receiver lost {self.loss_ratio:.2%}")
+        if self.achieved_eps < self.target_eps * MIN_ACHIEVED_RATIO:
+            # without any other signal the sender itself could not keep up
+            limit = "" if problems else " (sender-bound)"
+            problems.append(f"achieved {self.achieved_eps:.0f} of {self.target_eps:.0f} eps{limit}")
+        return problems
+
+
+@dataclass
+class RampResult:
+    """Outcome of a ramp, persisted on the job."""
+
+    saturation_eps: Optional[int]
+    reason: str
+
+
+@dataclass
+class RampController:
+    """
+    Chooses the target rate of the next step from the outcome of the last one.
+
+    Call `record(step)` after every step; `target_eps` is the rate of the next
+    step and `result` is set once the ramp settled. A failed step bounds the
+    destination's capacity by the rate it actually accepted; an earlier step
+    at or above that bound was carried by socket buffers and is discarded.
+    """
+
+    base_eps: float
+    factor: float
+    max_eps: Optional[float] = None
+    target_eps: float = field(init=False)
+    sustainable: Optional[RampStep] = field(default=None, init=False)
+    failed: Optional[RampStep] = field(default=None, init=False)
+    ceiling: Optional[float] = field(default=None, init=False)
+    refine_steps: int = field(default=0, init=False)
+    result: Optional[RampResult] = field(default=None, init=False)
+    steps: List[RampStep] = field(default_factory=list, init=False)
+
+    def __post_init__(self) -> None:
+        self.target_eps = self.base_eps
+        if self.max_eps:
+            self.target_eps = min(self.target_eps, self.max_eps)
+
+    @property
+    def settled(self) -> bool:
+        return self.result is not None
+
+    def record(self, step: RampStep) -> None:
+        """Judge a finished step and pick the next target rate."""
+        if self.settled:
+            return
+        self.steps.append(step)
+
+        if not step.problems():
+            self.sustainable = step
+            if self.ceiling is None:
+                # still ramping up
+                if self.max_eps and step.target_eps >= self.max_eps:
+                    self._settle(f"reached ramp_max_eps {self.max_eps:.0f} without saturating")
+                    return
+                self.target_eps = step.target_eps * self.factor
+                if self.max_eps:
+                    self.target_eps = min(self.target_eps, self.max_eps)
+                return
+        else:
+            self.failed = step
+            ceiling = min(step.target_eps, step.achieved_eps / MIN_ACHIEVED_RATIO)
+            self.ceiling = ceiling if self.ceiling is None else min(self.ceiling, ceiling)
+            if self.sustainable and self.sustainable.target_eps >= self.ceiling:
+                self.sustainable = None
+
+        reason = "; ".join(self.failed.problems())
+        if self.refine_steps >= MAX_REFINE_STEPS:
+            self._settle(f"saturated below {self.ceiling:.0f} eps: {reason}")
+            return
+
+        if self.sustainable is None:
+            # probe below what the destination accepted under pressure
+            probe = self.ceiling * PROBE_RATIO
+            if probe < 1:
+                self._settle(f"no sustainable rate: {reason}")
+                return
+            self.refine_steps += 1
+            self.target_eps = probe
+            return
+
+        # bisect (geometrically) between the sustainable rate and the ceiling
+        low, high = self.sustainable.target_eps, self.ceiling
+        if high / low <= REFINE_PRECISION:
+            self._settle(f"saturated below {high:.0f} eps: {reason}")
+            return
+        self.refine_steps += 1
+        self.target_eps = math.sqrt(low * high)
+
+    def _settle(self, reason: str) -> None:
+        saturation = int(self.sustainable.target_eps) if self.sustainable else None
+        self.result = RampResult(saturation, reason)
+        if self.sustainable:
+            self.target_eps = self.sustainable.target_eps
@@ -0,0 +1,179 @@
+"""
+Capture files for REPLAY jobs.
+
+A REPLAY job sends the lines of a recorded log file instead of generating
+logs from its template. Captures can be tens of gigabytes, so a
+CaptureFile is memory-mapped and split into lines while it is read: no
+line index is built up front and only the pages being sent are resident.
+
+Lines may start with an event timestamp, optionally after a syslog <PRI>
+and version, in one of these forms:
+
+    2026-10-01T00:00:00.123456+02:00    ISO 8601 / RFC 5424 (zone optional)
+    date=2026-10-01 time=00:00:00       FortiGate key=value
+    Oct  1 00:00:00                     BSD syslog (RFC 3164, no year)
+
+CaptureTimestamps parses them, so a replay can keep the capture's timing,
+and rewrites them in place through TimestampFormatter in the same form and
+zone, so a replayed incident carries current timestamps.
+"""
+import mmap
+import os
+import re
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from services.virtual_clock import US_PER_SECOND, TimestampFormatter
+
+# Only this many leading bytes of a line are searched for its timestamp
+TIMESTAMP_SCAN_BYTES = 128
+
+MONTHS = (b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun", b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec")
+
+LINE_TIMESTAMP = re.compile(
+    rb"(?P<date>\d{4}-\d\d-\d\d)(?P<sep>T| |\s+time=)(?P<time>\d\d:\d\d:\d\d)"
+    rb"(?P<fraction>\.\d{1,9})?(?P<zone>Z|[+-]\d\d:?\d\d)?"
+    rb"|(?P<month>" + b"|".join(MONTHS) + rb") (?P<day>[ \d]\d) (?P<clock>\d\d:\d\d:\d\d)"
+)
+
+# A BSD timestamp this far before the previous one is taken to be in the next year
+YEAR_ROLLOVER = timedelta(days=180)
+
+
+class CaptureFile:
+    """A captured log file, memory-mapped and split into lines lazily."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map: Optional[mmap.mmap] = None
+        if self.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self._map, "madvise"):
+                self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def lines(self) -> Iterator[bytes]:
+        """Yield the non-empty lines of the capture without their line ending."""
+        data = self._map
+        if data is None:
+            return
+        position, size = 0, self.size
+        while position < size:
+            end = data.find(b"\n", position)
+            if end < 0:
+                end = size
+            line = data[position:end]
+            position = end + 1
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if line:
+                yield line
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "CaptureFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class CaptureTimestamps:
+    """
+    Parses and rewrites the leading event timestamps of captured lines.
+
+    Consecutive lines mostly share their second, so the last parsed second
+    is cached and only the fraction is parsed per line.
+    """
+
+    def __init__(self, year: Optional[int] = None) -> None:
+        # BSD timestamps have no year, the capture is assumed to start in this one
+        self.year = year or datetime.now().year
+        self._key = None
+        self._second = 0
+        self._last_bsd: Optional[int] = None
+        self._formatters: Dict[Optional[bytes], TimestampFormatter] = {}
+
+    def parse(self, line: bytes) -> Optional[Tuple[int, re.Match]]:
+        """
+        Find the event timestamp of a line.
+
+        Returns:
+            tuple: (microseconds since the epoch, match) or None without a timestamp
+        """
+        match = LINE_TIMESTAMP.search(line, 0, TIMESTAMP_SCAN_BYTES)
+        if match is None:
+            return None
+        if match.group("date"):
+            key = (match.group("date"), match.group("time"), match.group("zone"))
+        else:
+            key = (match.group("month"), match.group("day"), match.group("clock"))
+        if key != self._key:
+            try:
+                self._second = self._parse_second(match)
+            except ValueError:
+                return None
+            self._key = key
+
+        fraction = match.group("fraction")
+        micros = int(fraction[1:7].ljust(6, b"0")) if fraction else 0
+        return self._second * US_PER_SECOND + micros, match
+
+    def rewrite(self, line: bytes, match: re.Match, epoch_us: int) -> bytes:
+        """Replace the timestamp `match` of a line by `epoch_us` in the same form and zone."""
+        if match.group("date"):
+            zone = match.group("zone")
+            context = self._formatter(zone).context(epoch_us)
+            fraction = match.group("fraction") or b""
+            if fraction:
+                digits = f"{epoch_us % US_PER_SECOND:06d}".ljust(len(fraction) - 1, "0")
+                fraction = b"." + digits[:len(fraction) - 1].encode()
+            stamp = b"".join((
+                context["@timestamp.date"].encode(), match.group("sep"),
+                context["@timestamp.time"].encode(), fraction, zone or b"",
+            ))
+        else:
+            context = self._formatter(None).context(epoch_us)
+            date = context["@timestamp.date"]
+            stamp = b"%s %2d %s" % (MONTHS[int(date[5:7]) - 1], int(date[8:10]), context["@timestamp.time"].encode())
+        return line[:match.start()] + stamp + line[match.end():]
+
+    def _parse_second(self, match: re.Match) -> int:
+        if match.group("date"):
+            year, month, day = (int(part) for part in match.group("date").split(b"-"))
+            hour, minute, second = (int(part) for part in match.group("time").split(b":"))
+            moment = datetime(year, month, day, hour, minute, second, tzinfo=_zone(match.group("zone")))
+            return int(moment.timestamp())
+
+        month = MONTHS.index(match.group("month")) + 1
+        day = int(match.group("day"))
+        hour, minute, second = (int(part) for part in match.group("clock").split(b":"))
+        result = int(datetime(self.year, month, day, hour, minute, second).timestamp())
+        if self._last_bsd is not None and result < self._last_bsd - YEAR_ROLLOVER.total_seconds():
+            self.year += 1
+            result = int(datetime(self.year, month, day, hour, minute, second).timestamp())
+        self._last_bsd = result
+        return result
+
+    def _formatter(self, zone: Optional[bytes]) -> TimestampFormatter:
+        formatter = self._formatters.get(zone)
+        if formatter is None:
+            formatter = self._formatters[zone] = TimestampFormatter(_zone(zone))
+        return formatter
+
+
+def _zone(zone: Optional[bytes]) -> Optional[tzinfo]:
+    """tzinfo of an ISO 8601 zone suffix, None (local time) without one."""
+    if not zone:
+        return None
+    if zone == b"Z":
+        return timezone.utc
+    sign = -1 if zone[:1] == b"-" else 1
+    digits = zone[1:].replace(b":", b"")
+    return timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
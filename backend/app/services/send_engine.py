@@ -0,0 +1,1000 @@
+"""
+Sending engine shared by the worker and the standalone runner.
+
+Generates logs from a template and sends them to a destination for one job,
+paced by the job's mode (CONSTANT interval, adaptive RAMP or BACKFILL), or
+replays a capture file (REPLAY). It has no database, Redis or settings
+access: a job is described by a plain job_config dict and results are
+reported through callbacks, so it imports quickly and runs where the
+control plane cannot be reached (see standalone.py). Protocol and mode may be given as the ORM enums or as
+their string values.
+
+A job_config with 'destinations' sends every log, rendered once, to each of
+them as well as to the job's own destination (see services/fan_out.py).
+One with 'templates' draws every log from its template or one of those by
+weight (see services/template_mix.py).
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from core.paths import resolve_within
+from services.fan_out import DeliveryStats, FanOutSender
+from services.file_sink import FileSender
+from services.framing import NEWLINE, Framer
+from services.http_sink import HTTP_PROTOCOLS, HttpBulkSender
+from services.log_generator import LogGenerator
+from services.prerender import PrerenderedCorpus
+from services.ramp_controller import (
+    DEFAULT_BASE_EPS,
+    DEFAULT_FACTOR,
+    DEFAULT_STEP_SECONDS,
+    RampController,
+    RampResult,
+    RampStep,
+)
+from services.replay import CaptureFile, CaptureTimestamps
+from services.sequence_tracker import SEQUENCE_TRAILER, with_sequence_trailer
+from services.template_mix import TemplateMix
+from services.tls import ResumingContext, client_context
+from services.virtual_clock import VirtualClock
+
+logger = logging.getLogger(__name__)
+
+# Log generator instance
+log_generator = LogGenerator()
+
+# Latest sequence receiver report per job id (see scripts/sequence_receiver.py)
+receiver_reports: Dict[str, dict] = {}
+
+# RAMP jobs send at most this many logs before yielding to other jobs
+RAMP_MAX_BATCH = 500
+
+# BACKFILL jobs yield to other jobs after this many logs and log their progress this often
+BACKFILL_BATCH = 500
+BACKFILL_PROGRESS_SECONDS = 10
+
+# REPLAY jobs at maximum speed yield to other jobs after this many lines
+REPLAY_BATCH = 500
+
+# Octet-counted TCP logs are packed into writes of up to this many bytes
+COALESCE_BYTES = 64 * 1024
+
+# Settings of the job's own destination that each of its extra destinations sets for itself
+DESTINATION_FIELDS = (
+    'protocol', 'destination_host', 'destination_port', 'file_path', 'http_path', 'http_index'
+)
+
+# Awaited with the DeliveryStats of every destination when a job's loop ends
+DeliveryCallback = Callable[[List[DeliveryStats]], Awaitable[None]]
+
+
+async def run_job(
+    job_id: str,
+    job_config: dict,
+    template_content: str,
+    on_result: Optional[Callable[[RampResult], Awaitable[None]]] = None,
+    on_delivery: Optional[DeliveryCallback] = None
+) -> int:
+    """
+    Run the sending loop of the job's mode until the job completes or is cancelled.
+    
+    Args:
+        job_id: Job identifier used in log messages
+        job_config: Job settings, see run_send_loop, run_ramp_loop,
+            run_backfill_loop and run_replay_loop; 'mode' defaults to CONSTANT
+        template_content: Template to generate logs from, mixed with the
+            job's extra 'templates' (see _template_mix); unused by REPLAY
+        on_result: Awaited with the result of a RAMP job
+        on_delivery: Awaited with the DeliveryStats of the job's destination
+            followed by those of its extra destinations when the loop ends,
+            also when it fails
+        
+    Returns:
+        int: Number of logs sent
+    """
+    mode = _value(job_config.get('mode') or 'CONSTANT')
+    if mode == 'RAMP':
+        return await run_ramp_loop(job_id, job_config, template_content, on_result=on_result, on_delivery=on_delivery)
+    if mode == 'BACKFILL':
+        return await run_backfill_loop(job_id, job_config, template_content, on_delivery=on_delivery)
+    if mode == 'REPLAY':
+        return await run_replay_loop(job_id, job_config, on_delivery=on_delivery)
+    return await run_send_loop(job_id, job_config, template_content, on_delivery=on_delivery)
+
+
+def _value(choice) -> str:
+    """String value of an enum member or of a plain string."""
+    return getattr(choice, 'value', choice)
+
+
+async def _wait_for_start(job_id: str, start_time: Optional[datetime]) -> None:
+    """Sleep until start_time if it is set and in the future."""
+    start_time = _ensure_timezone_aware(start_time)
+    if start_time:
+        now = datetime.now(timezone.utc)
+        if start_time > now:
+            wait_seconds = (start_time - now).total_seconds()
+            logger.info(f"Job {job_id} waiting {wait_seconds:.1f}s until start time {start_time}")
+            await asyncio.sleep(wait_seconds)
+
+
+def _generate_log(
+    job_id: str,
+    mix: TemplateMix,
+    seq: int,
+    embed_sequence: bool,
+    context: Optional[Dict[str, str]] = None
+) -> str:
+    """Generate one log from the job's mix, filling the {sim.*} fields for sequence-numbered jobs."""
+    if embed_sequence:
+        context = dict(context) if context else {}
+        context['sim.job_id'] = job_id
+        context['sim.seq'] = str(seq)
+        context['sim.sent_ns'] = str(time.time_ns())
+    return mix.render(context)
+
+
+def _template_mix(job_id: str, job_config: dict, template_content: str) -> TemplateMix:
+    """
+    The job's templates, compiled once for the whole run.
+    
+    template_content has the weight template_weight (default 1), each of
+    the job's extra 'templates' (dicts of content and weight) its own;
+    sequence-numbered jobs get the sequence trailer on every template.
+    """
+    extra = job_config.get('templates') or ()
+    templates = [template_content] + [template['content'] for template in extra]
+    weights = [job_config.get('template_weight') or 1] + [template['weight'] for template in extra]
+    if job_config.get('embed_sequence', False):
+        templates = [with_sequence_trailer(template) for template in templates]
+    if extra:
+        logger.info(f"Job {job_id} mixing {len(templates)} templates with weights {weights}")
+    return TemplateMix(templates, weights, log_generator)
+
+
+def _ensure_timezone_aware(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        # Assume naive datetime is in UTC
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+async def run_send_loop(
+    job_id: str,
+    job_config: dict,
+    template_content: str,
+    on_delivery: Optional[DeliveryCallback] = None
+) -> int:
+    """
+    Generate and send logs for a job until its end_time or send_count is reached.
+    
+    Also driven directly by scripts/benchmark_eps.py.
+    
+    Args:
+        job_id: Job identifier used in log messages
+        job_config: destination_host, destination_port, protocol, start_time,
+            end_time, send_count, send_interval_ms, embed_sequence, the
+            framing settings (see _framer), for TLS and HTTPS the tls_*
+            settings (see _tls_context), for HTTP protocols and FILE the
+            http_* and file_* settings (see _sender), the extra
+            destinations (see _destination_configs) and the template mix
+            (see _template_mix) of the job
+        template_content: Template to generate logs from
+        on_delivery: See run_job
+        
+    Returns:
+        int: Number of logs sent
+        
+    Raises:
+        Exception: Any error while generating or sending a log
+    """
+    end_time = _ensure_timezone_aware(job_config['end_time'])
+    await _wait_for_start(job_id, job_config['start_time'])
+    
+    # Initialize counters
+    logs_sent = 0
+    interval_seconds = job_config['send_interval_ms'] / 1000.0
+    
+    # Sequence-numbered messages carry job id, sequence and send time
+    embed_sequence = job_config.get('embed_sequence', False)
+    mix = _template_mix(job_id, job_config, template_content)
+    framer = _framer(job_config)
+    # A TLS handshake per log would cost more than the log, TLS keeps its
+    # connection; HTTP protocols send in batches, FILE keeps its file open
+    # and jobs with extra destinations keep a sender per destination
+    persistent = _value(job_config['protocol']) not in ('UDP', 'TCP') or job_config.get('destinations')
+    sender = _sender(job_config) if persistent else None
+    
+    # Main sending loop
+    try:
+        while True:
+            try:
+                # Check if we should stop due to end_time
+                if end_time:
+                    now = datetime.now(timezone.utc)
+                    if now >= end_time:
+                        logger.info(f"Job {job_id} reached end_time {end_time}, stopping")
+                        break
+                
+                # Check if we should stop due to send_count limit
+                if job_config['send_count'] and logs_sent >= job_config['send_count']:
+                    logger.info(f"Job {job_id} reached send_count limit of {job_config['send_count']}, stopping")
+                    break
+                
+                # Generate log content from template
+                log_content = _generate_log(job_id, mix, logs_sent + 1, embed_sequence)
+                
+                # Send the log
+                if sender is None:
+                    await _send_log_message(
+                        log_content,
+                        job_config['destination_host'],
+                        job_config['destination_port'],
+                        job_config['protocol'],
+                        framer
+                    )
+                elif not (await sender.send(log_content) and await sender.flush()) and not await sender.resend():
+                    raise sender.last_error
+                
+                logs_sent += 1
+                logger.debug(f"Sent log {logs_sent} for job {job_id}: {log_content[:100]}...")
+                
+                # Sleep for the configured interval
+                await asyncio.sleep(interval_seconds)
+                
+            except asyncio.CancelledError:
+                logger.info(f"Job {job_id} was cancelled")
+                break
+    finally:
+        if sender is not None:
+            await sender.close()
+        await _report_delivery(job_id, job_config, sender, logs_sent, on_delivery)
+    
+    return logs_sent
+
+
+async def run_ramp_loop(
+    job_id: str,
+    job_config: dict,
+    template_content: str,
+    on_result: Optional[Callable[[RampResult], Awaitable[None]]] = None,
+    on_delivery: Optional[DeliveryCallback] = None
+) -> int:
+    """
+    Send logs at a geometrically rising rate until the destination saturates.
+    
+    Every ramp_step_seconds the step's send-side signals (drain() stall time,
+    send errors, reconnects) and, if a sequence receiver reports for the job,
+    its loss are handed to a RampController, which picks the next rate. Once
+    it settled the job keeps sending at the highest sustainable rate until
+    its end_time or send_count. send_interval_ms is not used. With
+    prerender_pool, logs come from a PrerenderedCorpus stamped with the
+    send time. A job with extra destinations settles at the rate the
+    slowest of them sustains.
+    
+    Args:
+        job_id: Job identifier used in log messages and receiver reports
+        job_config: As for run_send_loop plus mode, ramp_base_eps,
+            ramp_factor, ramp_step_seconds, ramp_max_eps and prerender_pool
+        template_content: Template to generate logs from
+        on_result: Awaited with the result once the ramp settled, or with the
+            best rate so far when the job ends before that
+        on_delivery: See run_job
+        
+    Returns:
+        int: Number of logs sent
+        
+    Raises:
+        Exception: A generation error, or the last send error when not a
+            single log could be sent
+    """
+    end_time = _ensure_timezone_aware(job_config['end_time'])
+    await _wait_for_start(job_id, job_config['start_time'])
+    
+    embed_sequence = job_config.get('embed_sequence', False)
+    mix = _template_mix(job_id, job_config, template_content)
+    corpus = await _prerender(job_id, job_config, mix)
+    
+    controller = RampController(
+        base_eps=job_config.get('ramp_base_eps') or DEFAULT_BASE_EPS,
+        factor=job_config.get('ramp_factor') or DEFAULT_FACTOR,
+        max_eps=job_config.get('ramp_max_eps'),
+    )
+    step_seconds = job_config.get('ramp_step_seconds') or DEFAULT_STEP_SECONDS
+    sender = _sender(job_config)
+    
+    logs_sent = 0
+    attempts = 0
+    finished = False
+    try:
+        while not finished:
+            target_eps = controller.target_eps
+            step_started = time.monotonic()
+            step_end = step_started + step_seconds
+            step_attempts = 0
+            sent_before, errors_before = logs_sent, sender.errors
+            reconnects_before, drain_before = sender.reconnects, sender.drain_seconds
+            report_before = receiver_reports.get(job_id)
+            
+            # Pace by sending whatever is due at the target rate, in batches
+            while (now := time.monotonic()) < step_end:
+                if (end_time and datetime.now(timezone.utc) >= end_time) or \
+                        (job_config['send_count'] and attempts >= job_config['send_count']):
+                    logger.info(f"Job {job_id} reached its end_time or send_count, stopping ramp")
+                    finished = True
+                    break
+                due = int((now - step_started) * target_eps) - step_attempts
+                if job_config['send_count']:
+                    due = min(due, job_config['send_count'] - attempts)
+                if due <= 0:
+                    await sender.flush()
+                    await asyncio.sleep(min(1 / target_eps, step_end - now))
+                    continue
+                for _ in range(min(due, RAMP_MAX_BATCH)):
+                    if time.monotonic() >= step_end:
+                        break
+                    attempts += 1
+                    step_attempts += 1
+                    if corpus:
+                        sent = await sender.send_line(corpus.message(attempts, time.time_ns() // 1000, attempts))
+                    else:
+                        sent = await sender.send(_generate_log(job_id, mix, attempts, embed_sequence))
+                    if sent:
+                        logs_sent += 1
+                await sender.flush()
+                await asyncio.sleep(0)
+            
+            if finished or controller.settled:
+                continue
+            
+            step = RampStep(
+                target_eps=target_eps,
+                elapsed=time.monotonic() - step_started,
+                sent=logs_sent - sent_before,
+                errors=sender.errors - errors_before,
+                reconnects=sender.reconnects - reconnects_before,
+                drain_seconds=sender.drain_seconds - drain_before,
+                loss_ratio=_receiver_loss_ratio(report_before, receiver_reports.get(job_id), step_started),
+            )
+            controller.record(step)
+            logger.info(
+                f"Job {job_id} ramp step {target_eps:.0f} eps: achieved {step.achieved_eps:.0f} eps, "
+                f"{'; '.join(step.problems()) or 'sustainable'}"
+            )
+            
+            if step.problems() and not controller.settled:
+                # let the backlog queued in socket buffers drain before the next step
+                await asyncio.sleep(step_seconds)
+            
+            if controller.settled:
+                result = controller.result
+                logger.info(f"Job {job_id} ramp settled at {result.saturation_eps} eps: {result.reason}")
+                if on_result:
+                    await on_result(result)
+                if result.saturation_eps is None:
+                    if logs_sent == 0 and sender.last_error:
+                        raise sender.last_error
+                    break
+    
+    except asyncio.CancelledError:
+        logger.info(f"Job {job_id} was cancelled")
+    finally:
+        await sender.flush()
+        await sender.close()
+        await _report_delivery(job_id, job_config, sender, logs_sent, on_delivery)
+    
+    if not controller.settled and controller.sustainable and on_result:
+        await on_result(RampResult(
+            int(controller.sustainable.target_eps),
+            "job ended before the ramp saturated the destination",
+        ))
+    
+    return logs_sent
+
+
+async def run_backfill_loop(
+    job_id: str,
+    job_config: dict,
+    template_content: str,
+    on_delivery: Optional[DeliveryCallback] = None
+) -> int:
+    """
+    Send the logs of the event time range [start_time, end_time) as fast as possible.
+    
+    Log i is stamped start_time + i / backfill_eps by a VirtualClock instead
+    of the wall clock, and logs are sent back to back over one persistent
+    connection, so TCP back-pressure sets the pace (UDP has none and sends
+    as fast as logs are generated). A failed send is retried once on a new
+    connection before the job fails. send_count caps the number of logs.
+    With prerender_pool, logs come from a PrerenderedCorpus stamped with
+    the virtual time.
+    
+    Args:
+        job_id: Job identifier used in log messages
+        job_config: As for run_send_loop plus backfill_eps and prerender_pool
+        template_content: Template to generate logs from
+        on_delivery: See run_job
+        
+    Returns:
+        int: Number of logs sent
+        
+    Raises:
+        Exception: Any error while generating a log, or a send error that
+            persisted after reconnecting
+    """
+    start_time = _ensure_timezone_aware(job_config['start_time'])
+    end_time = _ensure_timezone_aware(job_config['end_time'])
+    if not start_time or not end_time or not job_config.get('backfill_eps'):
+        raise ValueError("BACKFILL jobs need start_time, end_time and backfill_eps")
+    clock = VirtualClock(start_time, end_time, job_config['backfill_eps'])
+    total = min(len(clock), job_config['send_count'] or len(clock))
+    
+    embed_sequence = job_config.get('embed_sequence', False)
+    mix = _template_mix(job_id, job_config, template_content)
+    corpus = await _prerender(job_id, job_config, mix)
+    
+    logger.info(f"Job {job_id} backfilling {total} logs from {start_time} to {end_time}")
+    sender = _sender(job_config)
+    logs_sent = 0
+    started = last_progress = time.monotonic()
+    try:
+        messages = ((index, None) for index in range(total)) if corpus else clock.contexts()
+        for index, context in messages:
+            if index >= total:
+                break
+            if corpus:
+                line = corpus.message(index, clock.time_us(index), index + 1)
+            else:
+                log_content = _generate_log(job_id, mix, index + 1, embed_sequence, context)
+                line = (log_content + '\n').encode('utf-8')
+            if not await sender.send_line(line, clock.time_us(index)) and not await sender.resend():
+                raise sender.last_error
+            logs_sent += 1
+            
+            if logs_sent % BACKFILL_BATCH == 0:
+                if not await sender.flush() and not await sender.resend():
+                    raise sender.last_error
+                await asyncio.sleep(0)
+                now = time.monotonic()
+                if now - last_progress >= BACKFILL_PROGRESS_SECONDS:
+                    last_progress = now
+                    event_time = datetime.fromtimestamp(clock.time_us(index) / 1e6, timezone.utc)
+                    logger.info(
+                        f"Job {job_id} backfilled {logs_sent}/{total} logs up to {event_time.isoformat()} "
+                        f"({logs_sent / (now - started):.0f} logs/s)"
+                    )
+        if not await sender.flush() and not await sender.resend():
+            raise sender.last_error
+    except asyncio.CancelledError:
+        logger.info(f"Job {job_id} was cancelled")
+    finally:
+        await sender.flush()
+        await sender.close()
+        await _report_delivery(job_id, job_config, sender, logs_sent, on_delivery)
+    
+    logger.info(f"Job {job_id} backfilled {logs_sent} logs in {time.monotonic() - started:.1f}s")
+    return logs_sent
+
+
+async def run_replay_loop(job_id: str, job_config: dict, on_delivery: Optional[DeliveryCallback] = None) -> int:
+    """
+    Send the lines of a capture file, keeping the timing of their timestamps.
+    
+    Line i is sent (t_i - t_0) / replay_speed after the first line, where t
+    is the line's leading timestamp (see services/replay.py); lines without
+    one go out with the line before them. A capture without any timestamps
+    is paced by send_interval_ms / replay_speed. replay_speed 0 sends as
+    fast as the destination accepts. With replay_loop the capture restarts
+    when it ends, until end_time or send_count. With
+    replay_rewrite_timestamps every timestamp is replaced by the time the
+    line is due. Lines go over one persistent connection; a failed send is
+    retried once on a new connection before the job fails.
+    
+    Args:
+        job_id: Job identifier used in log messages
+        job_config: As for run_send_loop plus replay_path, replay_speed,
+            replay_loop and replay_rewrite_timestamps
+        on_delivery: See run_job
+        
+    Returns:
+        int: Number of lines sent
+        
+    Raises:
+        OSError: If the capture cannot be read, or a send error that
+            persisted after reconnecting
+    """
+    end_time = _ensure_timezone_aware(job_config['end_time'])
+    await _wait_for_start(job_id, job_config['start_time'])
+    
+    speed = job_config.get('replay_speed')
+    speed = 1.0 if speed is None else float(speed)
+    untimed_step_us = job_config['send_interval_ms'] * 1000
+    send_count = job_config['send_count']
+    rewrite = job_config.get('replay_rewrite_timestamps', False)
+    embed_sequence = job_config.get('embed_sequence', False)
+    trailer = SEQUENCE_TRAILER.replace('{sim.job_id}', job_id)
+    
+    capture = CaptureFile(job_config['replay_path'])
+    logger.info(
+        f"Job {job_id} replaying {capture.path} ({capture.size} bytes) at "
+        f"{f'{speed:g}x' if speed else 'maximum'} speed{', looping' if job_config.get('replay_loop') else ''}"
+    )
+    sender = _sender(job_config)
+    logs_sent = 0
+    passes = 0
+    finished = False
+    started = last_progress = time.monotonic()
+    try:
+        while not finished:
+            passes += 1
+            timestamps = CaptureTimestamps()
+            pass_started = time.monotonic()
+            wall_started_us = time.time_ns() // 1000
+            first_us = None
+            offset_us = 0
+            pass_sent = 0
+            for line in capture.lines():
+                if (end_time and datetime.now(timezone.utc) >= end_time) or \
+                        (send_count and logs_sent >= send_count):
+                    logger.info(f"Job {job_id} reached its end_time or send_count, stopping replay")
+                    finished = True
+                    break
+                
+                # Offset of the line from the start of the capture, in capture time
+                parsed = timestamps.parse(line)
+                if parsed:
+                    if first_us is None:
+                        first_us = parsed[0]
+                    offset_us = parsed[0] - first_us
+                elif first_us is None:
+                    offset_us = pass_sent * untimed_step_us
+                
+                if speed:
+                    due_us = int(offset_us / speed)
+                    wait = pass_started + due_us / 1e6 - time.monotonic()
+                    stamp_us = wall_started_us + due_us
+                else:
+                    wait = 0
+                    stamp_us = time.time_ns() // 1000
+                # Lines sharing a timestamp, or a replay running behind, never
+                # wait; yield every batch so other jobs and STOP commands run
+                if wait > 0 or (pass_sent + 1) % REPLAY_BATCH == 0:
+                    if not await sender.flush() and not await sender.resend():
+                        raise sender.last_error
+                    await asyncio.sleep(max(wait, 0))
+                
+                if rewrite and parsed:
+                    line = timestamps.rewrite(line, parsed[1], stamp_us)
+                if embed_sequence:
+                    line += trailer.replace('{sim.seq}', str(logs_sent + 1)) \
+                        .replace('{sim.sent_ns}', str(time.time_ns())).encode()
+                if not await sender.send_line(line + b'\n', stamp_us) and not await sender.resend():
+                    raise sender.last_error
+                logs_sent += 1
+                pass_sent += 1
+                
+                now = time.monotonic()
+                if now - last_progress >= BACKFILL_PROGRESS_SECONDS:
+                    last_progress = now
+                    logger.info(
+                        f"Job {job_id} replayed {logs_sent} lines, pass {passes} "
+                        f"({logs_sent / (now - started):.0f} lines/s)"
+                    )
+            
+            if not job_config.get('replay_loop') or not pass_sent:
+                finished = True
+        if not await sender.flush() and not await sender.resend():
+            raise sender.last_error
+    except asyncio.CancelledError:
+        logger.info(f"Job {job_id} was cancelled")
+    finally:
+        await sender.flush()
+        await sender.close()
+        capture.close()
+        await _report_delivery(job_id, job_config, sender, logs_sent, on_delivery)
+    
+    logger.info(f"Job {job_id} replayed {logs_sent} lines in {passes} pass(es) in {time.monotonic() - started:.1f}s")
+    return logs_sent
+
+
+def confine_job_paths(job_config: dict, replay_root: str, file_root: str) -> None:
+    """
+    Check the capture a REPLAY job reads against replay_root, and the
+    file_path of a FILE job and of each FILE destination against file_root,
+    on this host, and replace them by their resolved paths, so the files
+    opened are the ones checked. The worker does this for every job; the
+    standalone runner reads and writes whatever its config names.
+
+    Raises:
+        ValueError: If one of the paths is relative or resolves outside its root
+    """
+    if _value(job_config.get('mode')) == 'REPLAY':
+        job_config['replay_path'] = _confined(job_config, 'replay_path', replay_root)
+    for config in [job_config, *(job_config.get('destinations') or ())]:
+        if _value(config.get('protocol')) == 'FILE':
+            config['file_path'] = _confined(config, 'file_path', file_root)
+
+
+def _confined(config: dict, field: str, root: str) -> str:
+    """The resolved path of config[field], see confine_job_paths."""
+    resolved = resolve_within(config.get(field), root)
+    if resolved is None:
+        raise ValueError(f"{field} {config.get(field)!r} is not under {root}")
+    return resolved
+
+
+def _sender(job_config: dict) -> Union["_PersistentSender", HttpBulkSender, FileSender, FanOutSender]:
+    """
+    Persistent sender to the job's destination, see _framer and _tls_context.
+    
+    Jobs with an HTTP protocol (ES_BULK, SPLUNK_HEC, HTTP_JSON) get an
+    HttpBulkSender configured by http_path, http_index, http_batch_size,
+    http_batch_age_ms, http_max_in_flight, http_gzip, http_tls and
+    http_authorization; FILE jobs a FileSender configured by file_path,
+    file_rotate_mb, file_rotate_seconds, file_rotate_keep, file_gzip and
+    file_fsync. Jobs with extra destinations get a FanOutSender over one
+    such sender per destination.
+    """
+    if job_config.get('destinations'):
+        configs = _destination_configs(job_config)
+        return FanOutSender(
+            [_sender(config) for config in configs],
+            [_destination_name(config) for config in configs]
+        )
+    protocol = _value(job_config['protocol'])
+    if protocol == 'FILE':
+        rotate_mb = job_config.get('file_rotate_mb')
+        return FileSender(
+            job_config['file_path'],
+            _framer(job_config),
+            rotate_bytes=rotate_mb * 1024 * 1024 if rotate_mb else None,
+            rotate_seconds=job_config.get('file_rotate_seconds'),
+            keep=job_config.get('file_rotate_keep'),
+            gzip=bool(job_config.get('file_gzip')),
+            fsync=_value(job_config.get('file_fsync') or 'NONE'),
+        )
+    if protocol in HTTP_PROTOCOLS:
+        return HttpBulkSender(
+            job_config['destination_host'],
+            job_config['destination_port'],
+            protocol,
+            path=job_config.get('http_path'),
+            index=job_config.get('http_index'),
+            batch_size=job_config.get('http_batch_size'),
+            batch_age_ms=job_config.get('http_batch_age_ms'),
+            max_in_flight=job_config.get('http_max_in_flight'),
+            gzip_bodies=bool(job_config.get('http_gzip')),
+            tls=_tls_context(job_config),
+            authorization=job_config.get('http_authorization'),
+            hostname=job_config.get('syslog_hostname'),
+        )
+    return _PersistentSender(
+        job_config['destination_host'], job_config['destination_port'], job_config['protocol'],
+        _framer(job_config), _tls_context(job_config)
+    )
+
+
+def _destination_configs(job_config: dict) -> List[dict]:
+    """
+    job_config of the job's own destination and of each of its extra destinations.
+    
+    'destinations' holds a dict of DESTINATION_FIELDS per extra destination
+    (missing fields are None); every other setting is shared with the job,
+    except that framing follows each destination's protocol (see _framer).
+    """
+    own = dict(job_config, destinations=None)
+    return [own] + [
+        dict(own, **{field: destination.get(field) for field in DESTINATION_FIELDS})
+        for destination in job_config.get('destinations') or ()
+    ]
+
+
+def _destination_name(job_config: dict) -> str:
+    """Protocol and host:port, or file path, of the job's destination."""
+    protocol = _value(job_config['protocol'])
+    if protocol == 'FILE':
+        return f"FILE {job_config['file_path']}"
+    return f"{protocol} {job_config['destination_host']}:{job_config['destination_port']}"
+
+
+async def _report_delivery(
+    job_id: str,
+    job_config: dict,
+    sender,
+    logs_sent: int,
+    on_delivery: Optional[DeliveryCallback]
+) -> None:
+    """Log the delivery of every destination of a job with extra destinations and hand it to on_delivery."""
+    if isinstance(sender, FanOutSender):
+        stats = sender.delivery_stats()
+        for destination in stats:
+            logger.info(
+                f"Job {job_id} sent {destination.sent} logs to {destination.destination} "
+                f"({destination.errors} errors, {destination.reconnects} reconnects)"
+            )
+    else:
+        stats = [DeliveryStats.of(_destination_name(job_config), sender, logs_sent)]
+    if on_delivery:
+        await on_delivery(stats)
+
+
+def _tls_context(job_config: dict) -> Optional[ResumingContext]:
+    """Shared TLS context of a TLS or HTTPS job's destination, from its tls_* settings."""
+    if _value(job_config['protocol']) != 'TLS' and not job_config.get('http_tls'):
+        return None
+    return client_context(
+        job_config['destination_host'],
+        job_config['destination_port'],
+        mode=job_config.get('tls_mode'),
+        ca_file=job_config.get('tls_ca_file'),
+        cert_file=job_config.get('tls_cert_file'),
+        key_file=job_config.get('tls_key_file'),
+    )
+
+
+def _framer(job_config: dict) -> Framer:
+    """Framer for the job's syslog_format, tcp_framing and syslog_* header fields."""
+    # files hold one log per line
+    framing = NEWLINE if _value(job_config['protocol']) == 'FILE' else job_config.get('tcp_framing')
+    return Framer(
+        header=_value(job_config.get('syslog_format') or 'RAW'),
+        framing=_value(framing or 'NEWLINE'),
+        pri=job_config.get('syslog_pri'),
+        hostname=job_config.get('syslog_hostname'),
+        appname=job_config.get('syslog_appname'),
+    )
+
+
+async def _prerender(job_id: str, job_config: dict, mix: TemplateMix) -> Optional[PrerenderedCorpus]:
+    """
+    Render the job's prerender_pool messages from its template mix, if it has one.
+    
+    Rendering runs in a thread with its own LogGenerator so other jobs keep
+    sending meanwhile.
+    """
+    size = job_config.get('prerender_pool')
+    if not size:
+        return None
+    started = time.monotonic()
+    corpus = await asyncio.to_thread(
+        PrerenderedCorpus, mix, size, LogGenerator(),
+        job_id if job_config.get('embed_sequence') else None
+    )
+    logger.info(
+        f"Job {job_id} pre-rendered {size} logs ({len(corpus.buffer)} bytes) "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+    return corpus
+
+
+def _receiver_loss_ratio(before: Optional[dict], after: Optional[dict], step_started: float) -> Optional[float]:
+    """Share of messages a sequence receiver lost between two of its reports."""
+    if after is None or after['received_at'] < step_started:
+        return None
+    before = before or {'received': 0, 'lost': 0, 'gaps': 0}
+    received = after['received'] - before['received']
+    lost = (after['lost'] + after['gaps']) - (before['lost'] + before['gaps'])
+    if received + lost <= 0:
+        return None
+    return max(lost, 0) / (received + lost)
+
+
+class _PersistentSender:
+    """
+    Sender with one persistent connection, used by RAMP, BACKFILL and REPLAY
+    jobs and by TLS jobs of every mode.
+    
+    Unlike _send_log_message, which opens a TCP connection per log, the
+    connection is kept so time spent in drain() reflects the destination's
+    back-pressure. Send errors are counted and the connection is re-opened
+    on the next log instead of failing the job; resend() retries the data
+    of the last failed write once.
+    
+    With octet-counted TCP framing, logs are packed into writes of up to
+    COALESCE_BYTES; callers flush() before they sleep.
+    
+    TLS is sent like TCP over a TLS connection; the session of a closed
+    connection is kept in the destination's context so reconnects resume
+    it (see services/tls.py).
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        protocol: str,
+        framer: Optional[Framer] = None,
+        tls: Optional[ResumingContext] = None
+    ) -> None:
+        if protocol not in ('UDP', 'TCP', 'TLS'):
+            raise ValueError(f"Unsupported protocol: {protocol}")
+        self.host = host
+        self.port = port
+        self.protocol = _value(protocol)
+        self.framer = framer or Framer()
+        self.tls = tls
+        if self.protocol == 'TLS' and tls is None:
+            self.tls = client_context(host, port)
+        self.errors = 0
+        self.reconnects = 0
+        self.resumed = 0
+        self.drain_seconds = 0.0
+        self.last_error: Optional[Exception] = None
+        self._coalesce = self.protocol != 'UDP' and self.framer.octet_counting
+        self._pending = bytearray()
+        self._failed: Optional[bytes] = None
+        self._connections = 0
+        self._sock: Optional[socket.socket] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+    
+    async def send(self, message: str, epoch_us: Optional[int] = None) -> bool:
+        """Send one log, returning whether it was handed to the network (or buffered)."""
+        return await self.send_line((message + '\n').encode('utf-8'), epoch_us)
+    
+    async def send_line(self, line, epoch_us: Optional[int] = None) -> bool:
+        """
+        Send one encoded log given with its trailing newline, see send.
+        
+        `line` may be a memoryview; it is not used after the call returns.
+        epoch_us is the time in the syslog header (default: now).
+        """
+        if self.protocol == 'UDP':
+            return await self._transmit(self.framer.udp(line, epoch_us))
+        data = self.framer.tcp(line, epoch_us)
+        if not self._coalesce:
+            return await self._transmit(data)
+        self._pending += data
+        if len(self._pending) < COALESCE_BYTES:
+            return True
+        return await self.flush()
+    
+    async def flush(self) -> bool:
+        """Write the logs packed so far."""
+        if not self._pending:
+            return True
+        data = bytes(self._pending)
+        self._pending.clear()
+        return await self._transmit(data)
+    
+    async def resend(self) -> bool:
+        """Retry the data of the last failed write once, on a new connection."""
+        data, self._failed = self._failed, None
+        return data is not None and await self._transmit(data)
+    
+    async def _transmit(self, data) -> bool:
+        try:
+            if self.protocol == 'UDP':
+                if self._sock is None:
+                    self._open_udp()
+                self._sock.send(data)
+            else:
+                if self._writer is None:
+                    await self._open_tcp()
+                self._writer.write(data)
+                started = time.perf_counter()
+                await self._writer.drain()
+                self.drain_seconds += time.perf_counter() - started
+            return True
+        except OSError as e:
+            self.errors += 1
+            self.last_error = e
+            # data may be a view of a buffer the caller reuses
+            self._failed = bytes(data)
+            logger.debug(f"Send to {self.host}:{self.port} failed: {type(e).__name__}: {e}")
+            await self.close()
+            return False
+    
+    def _open_udp(self) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        try:
+            sock.connect((self.host, self.port))
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._opened()
+    
+    async def _open_tcp(self) -> None:
+        _, self._writer = await asyncio.open_connection(self.host, self.port, ssl=self.tls)
+        ssl_object = self._writer.get_extra_info('ssl_object')
+        if ssl_object is not None and ssl_object.session_reused:
+            self.resumed += 1
+        self._opened()
+    
+    def _opened(self) -> None:
+        if self._connections:
+            self.reconnects += 1
+        self._connections += 1
+    
+    async def close(self) -> None:
+        """Close the connection; logs not yet flushed are dropped."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            if self.tls is not None:
+                self.tls.remember(writer.get_extra_info('ssl_object'))
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+async def _send_log_message(
+    message: str, host: str, port: int, protocol: str, framer: Optional[Framer] = None
+) -> None:
+    """
+    Send a log message to the specified destination.
+    
+    Args:
+        message: The log message to send
+        host: Destination host
+        port: Destination port  
+        protocol: Protocol to use (TCP or UDP; TLS is sent by _PersistentSender)
+        framer: Syslog header and TCP framing (default: raw, newline-terminated)
+    """
+    framer = framer or Framer()
+    line = (message + '\n').encode('utf-8')
+    try:
+        logger.debug(f"Sending message via {protocol} to {host}:{port} - {message[:50]}...")
+        logger.debug(f"full message: {message}")
+        if protocol == 'UDP':
+            await _send_udp_message(framer.udp(line), host, port)
+        elif protocol == 'TCP':
+            await _send_tcp_message(framer.tcp(line), host, port)
+        else:
+            raise ValueError(f"Unsupported protocol: {protocol}")
+        logger.debug(f"Successfully sent message via {protocol} to {host}:{port}")
+    except Exception as e:
+        logger.error(f"Failed to send message to {host}:{port} via {protocol}: {type(e).__name__}: {e}")
+        raise
+
+
+async def _send_udp_message(data: bytes, host: str, port: int) -> None:
+    """Send a framed message via UDP."""
+    loop = asyncio.get_event_loop()
+    
+    def send_udp():
+        logger.debug(f"Creating UDP socket for {host}:{port}")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            logger.debug(f"Sending {len(data)} bytes via UDP to {host}:{port}")
+            sock.sendto(data, (host, port))
+            logger.debug(f"UDP message sent successfully to {host}:{port}")
+        except Exception as e:
+            logger.error(f"UDP socket error: {type(e).__name__}: {e}")
+            raise
+        finally:
+            sock.close()
+    
+    await loop.run_in_executor(None, send_udp)
+
+
+async def _send_tcp_message(data: bytes, host: str, port: int) -> None:
+    """Send a framed message via TCP."""
+    try:
+        logger.debug(f"Opening TCP connection to {host}:{port}")
+        reader, writer = await asyncio.open_connection(host, port)
+        
+        logger.debug(f"Sending {len(data)} bytes via TCP")
+        
+        writer.write(data)
+        await writer.drain()
+        
+        logger.debug(f"TCP message sent, closing connection to {host}:{port}")
+        writer.close()
+        await writer.wait_closed()
+        
+    except Exception as e:
+        logger.error(f"TCP connection error to {host}:{port}: {type(e).__name__}: {e}")
+        raise
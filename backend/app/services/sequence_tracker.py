@@ -0,0 +1,214 @@
+"""
+Sequence-numbered messages and receiver-side loss/latency accounting.
+
+Jobs with `embed_sequence` fill the {sim.job_id}, {sim.seq} and {sim.sent_ns}
+placeholders per message; templates that do not place {sim.job_id} and
+{sim.seq} themselves get the SEQUENCE_TRAILER appended. A receiver feeds every message to a
+SequenceTracker, which keeps per job a sliding bitmap window of recently seen
+sequence numbers (to count gaps, duplicates and reordering in O(1) memory)
+and a log-bucketed one-way latency histogram.
+"""
+import re
+import time
+from typing import Dict, Optional
+
+# Appended to templates that do not place these fields themselves
+SEQUENCE_TRAILER = " simjob={sim.job_id} simseq={sim.seq} simsent={sim.sent_ns}"
+SEQUENCE_PATTERN = re.compile(rb"simjob=(\S+) simseq=(\d+) simsent=(\d+)")
+SEQUENCE_PLACEHOLDERS = ("{sim.job_id}", "{sim.seq}")
+
+# Redis channel receivers publish per-job snapshots on; RAMP jobs read receiver loss from it
+RECEIVER_REPORT_CHANNEL = "sequence_reports"
+
+# Sequence numbers tracked individually per job; older ones are settled as
+# received or lost when they leave the window
+DEFAULT_WINDOW_BITS = 1 << 16
+LATENCY_BUCKETS = 40
+
+
+def with_sequence_trailer(template: str) -> str:
+    """
+    Add the sequence trailer unless the template already places the job id
+    and sequence number. Receivers only account messages whose fields are in
+    the trailer's simjob=... simseq=... simsent=... form.
+    """
+    if all(placeholder in template for placeholder in SEQUENCE_PLACEHOLDERS):
+        return template
+    return template + SEQUENCE_TRAILER
+
+
+class SequenceWindow:
+    """
+    Gap, duplicate and reorder accounting for one job's sequence numbers.
+
+    Bit i of `bits` is set when sequence `base + i` was received. When a
+    sequence beyond the window arrives the window slides forward (in quarter
+    window steps, to amortize the shift) and unset bits leaving it are
+    counted as lost. Until it first slides, the window also extends back to
+    sequences below the first one seen, so the start of a reordered stream
+    is not counted as late.
+
+    Sequence 1 counts as a job restart only once the highest sequence seen
+    is at least a window step past it; earlier it is just reordered.
+    """
+
+    __slots__ = (
+        "size", "step", "base", "bits", "highest", "slid", "received",
+        "duplicates", "reordered", "lost", "late", "restarts",
+    )
+
+    def __init__(self, size: int = DEFAULT_WINDOW_BITS) -> None:
+        self.size = size
+        self.step = max(size // 4, 1)
+        self.base: Optional[int] = None
+        self.bits = 0
+        self.highest = 0
+        self.slid = False
+        self.received = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.lost = 0
+        self.late = 0
+        self.restarts = 0
+
+    def add(self, seq: int) -> None:
+        if self.base is None:
+            self.base = seq
+            self.highest = seq
+        offset = seq - self.base
+
+        if -offset > self.size or (seq == 1 and self.highest - seq >= self.step):
+            # sequence went back to the start: the job was restarted
+            self.restarts += 1
+            self.lost += self.gaps
+            self.base, self.bits, self.highest, self.slid = seq, 0, seq, False
+            offset = 0
+        elif offset < 0:
+            if self.slid or self.highest - seq >= self.size:
+                # its slot already left the window (and was counted as lost)
+                self.late += 1
+                return
+            self.bits <<= -offset
+            self.base = seq
+            offset = 0
+
+        if offset >= self.size:
+            shift = max(offset - self.size + 1, self.step)
+            if shift >= self.size:
+                self.lost += shift - self.bits.bit_count()
+                self.bits = 0
+            else:
+                leaving = self.bits & ((1 << shift) - 1)
+                self.lost += shift - leaving.bit_count()
+                self.bits >>= shift
+            self.base += shift
+            self.slid = True
+            offset -= shift
+
+        bit = 1 << offset
+        if self.bits & bit:
+            self.duplicates += 1
+            return
+        self.bits |= bit
+        self.received += 1
+        if seq < self.highest:
+            self.reordered += 1
+        else:
+            self.highest = seq
+
+    @property
+    def gaps(self) -> int:
+        """Sequences missing inside the window (may still arrive reordered)."""
+        if self.base is None:
+            return 0
+        return (self.highest - self.base + 1) - self.bits.bit_count()
+
+
+class LatencyHistogram:
+    """One-way latency histogram with power-of-two microsecond buckets."""
+
+    __slots__ = ("count", "total_us", "max_us", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.buckets = [0] * LATENCY_BUCKETS
+
+    def add(self, latency_us: int) -> None:
+        latency_us = max(latency_us, 0)
+        self.count += 1
+        self.total_us += latency_us
+        if latency_us > self.max_us:
+            self.max_us = latency_us
+        self.buckets[min(latency_us.bit_length(), LATENCY_BUCKETS - 1)] += 1
+
+    def percentile(self, p: float) -> int:
+        """Upper bound (µs) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min((1 << i) - 1 if i else 0, self.max_us)
+        return self.max_us
+
+
+class SequenceTracker:
+    """Per-job sequence windows and latency histograms of a receiver."""
+
+    def __init__(self, window_bits: int = DEFAULT_WINDOW_BITS) -> None:
+        self.window_bits = window_bits
+        self.windows: Dict[bytes, SequenceWindow] = {}
+        self.latencies: Dict[bytes, LatencyHistogram] = {}
+        self.unsequenced = 0
+
+    def observe(self, message: bytes, received_ns: Optional[int] = None) -> bool:
+        """
+        Account one received message.
+
+        Args:
+            message: Raw message bytes
+            received_ns: Receive time in ns since the epoch (default: now)
+
+        Returns:
+            bool: Whether the message carried sequence fields
+        """
+        match = SEQUENCE_PATTERN.search(message)
+        if match is None:
+            self.unsequenced += 1
+            return False
+        if received_ns is None:
+            received_ns = time.time_ns()
+
+        job_id = match.group(1)
+        window = self.windows.get(job_id)
+        if window is None:
+            window = self.windows[job_id] = SequenceWindow(self.window_bits)
+            self.latencies[job_id] = LatencyHistogram()
+        window.add(int(match.group(2)))
+        self.latencies[job_id].add((received_ns - int(match.group(3))) // 1000)
+        return True
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Current per-job counters, latencies in milliseconds."""
+        report = {}
+        for job_id, window in self.windows.items():
+            latency = self.latencies[job_id]
+            report[job_id.decode(errors="replace")] = {
+                "received": window.received,
+                "lost": window.lost,
+                "gaps": window.gaps,
+                "duplicates": window.duplicates,
+                "reordered": window.reordered,
+                "late": window.late,
+                "restarts": window.restarts,
+                "highest_seq": window.highest,
+                "latency_avg_ms": round(latency.total_us / latency.count / 1000, 3) if latency.count else 0.0,
+                "latency_p50_ms": latency.percentile(50) / 1000,
+                "latency_p99_ms": latency.percentile(99) / 1000,
+                "latency_max_ms": latency.max_us / 1000,
+            }
+        return report
@@ -0,0 +1,321 @@
+"""
+Template auto-detection: find which stored template a raw log line matches.
+
+Every template contributes the literal tokens between its placeholders as
+anchors (e.g. `type="traffic"`, `subtype="forward"`). A single Aho-Corasick pass over a
+line finds all anchors it contains, and only templates whose anchors are all
+present are verified with their cached compiled regex, whose placeholders
+stop at the next literal so rejecting a line stays linear.
+"""
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from pydantic_core import to_json
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.log_template import LogTemplate
+from services.parsing_service import _split_template, get_compiled_parser, get_detection_parser
+
+
+# Literal tokens shorter than this are too common to narrow down
+# candidates, e.g. `=`, `"`, `,`
+MIN_ANCHOR_LENGTH = 3
+
+
+class AhoCorasick:
+    """
+    Multi-substring matcher over a fixed set of patterns.
+
+    Builds a trie with failure links once, then finds every pattern that
+    occurs in a text in a single left-to-right pass.
+    """
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[str, ...]] = [()]
+
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (pattern,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def find_all(self, text: str) -> set:
+        """Return the set of patterns occurring anywhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+def extract_anchors(template: str) -> FrozenSet[str]:
+    """
+    Get the literal anchors of a template.
+
+    Args:
+        template: Template string with {place.holder} syntax
+
+    Returns:
+        The distinct whitespace-separated literal tokens long enough to be
+        selective, so key=value lines with extra or reordered keys still
+        contain every anchor
+    """
+    literals, _ = _split_template(template)
+    return frozenset(
+        token for literal in literals for token in literal.split()
+        if len(token) >= MIN_ANCHOR_LENGTH
+    )
+
+
+class _IndexedTemplate:
+    __slots__ = ("id", "name", "content_format", "anchors", "specificity")
+
+    def __init__(self, template_id: str, name: str, content_format: str) -> None:
+        self.id = template_id
+        self.name = name
+        self.content_format = content_format
+        self.anchors = extract_anchors(content_format)
+        literals, _ = _split_template(content_format)
+        # more literal text means a stricter template, preferred on ties
+        self.specificity = sum(len(literal) for literal in literals)
+
+
+class _Snapshot:
+    """Immutable view of the index used by detection (safe across threads)."""
+
+    __slots__ = ("templates", "matcher", "by_anchor", "unanchored")
+
+    def __init__(
+        self,
+        templates: Dict[str, _IndexedTemplate],
+        matcher: Optional[AhoCorasick] = None,
+    ) -> None:
+        self.templates = templates
+        by_anchor: Dict[str, List[str]] = {}
+        unanchored = []
+        for template in templates.values():
+            if not template.anchors:
+                unanchored.append(template.id)
+            for anchor in template.anchors:
+                by_anchor.setdefault(anchor, []).append(template.id)
+        self.by_anchor = by_anchor
+        self.unanchored = tuple(unanchored)
+        self.matcher = matcher if matcher is not None else AhoCorasick(by_anchor)
+
+
+class DetectionResult:
+    """Templates that matched a line, most specific first."""
+
+    __slots__ = ("matches", "parsed_ecs")
+
+    def __init__(
+        self,
+        matches: List[_IndexedTemplate],
+        parsed_ecs: Optional[Dict[str, Any]],
+    ) -> None:
+        self.matches = matches
+        self.parsed_ecs = parsed_ecs
+
+    @property
+    def best(self) -> Optional[_IndexedTemplate]:
+        return self.matches[0] if self.matches else None
+
+
+class TemplateDetectionIndex:
+    """
+    Prefilter index over the stored templates.
+
+    The template service upserts/removes templates as they are written, and
+    `refresh` picks up changes made by other processes by tracking each
+    template's `updated_at` and reloading only rows that changed. The
+    Aho-Corasick automaton is rebuilt only when the set of anchors changes,
+    so edits that keep the literal text (or add templates whose anchors are
+    already known) reuse it.
+    """
+
+    def __init__(self) -> None:
+        self._templates: Dict[str, _IndexedTemplate] = {}
+        self._versions: Dict[str, Optional[datetime]] = {}
+        self._signature: Optional[Tuple[int, Optional[datetime]]] = None
+        self._snapshot = _Snapshot({})
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def upsert(self, template_id: str, name: str, content_format: str) -> None:
+        """Add or replace a template in the index."""
+        self._templates[template_id] = _IndexedTemplate(template_id, name, content_format)
+        self._publish()
+
+    def remove(self, template_id: str) -> None:
+        """Drop a template from the index."""
+        if self._templates.pop(template_id, None) is not None:
+            self._versions.pop(template_id, None)
+            self._publish()
+
+    def _publish(self) -> None:
+        old = self._snapshot
+        templates = dict(self._templates)
+        anchors = {anchor for t in templates.values() for anchor in t.anchors}
+        # same anchor vocabulary: keep the automaton, only remap anchors to ids
+        matcher = old.matcher if anchors == set(old.by_anchor) else None
+        self._snapshot = _Snapshot(templates, matcher)
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """
+        Bring the index in line with the log_templates table.
+
+        A cheap count/max(updated_at) probe decides whether anything changed;
+        only then are ids and versions diffed and changed rows loaded.
+        """
+        signature_row = (await db.execute(
+            select(func.count(LogTemplate.id), func.max(LogTemplate.updated_at))
+        )).one()
+        signature = (signature_row[0], signature_row[1])
+        if signature == self._signature:
+            return
+
+        async with self._lock:
+            if signature == self._signature:
+                return
+            versions = dict((await db.execute(
+                select(LogTemplate.id, LogTemplate.updated_at)
+            )).all())
+
+            changed = [
+                template_id for template_id, updated_at in versions.items()
+                if template_id not in self._versions
+                or self._versions[template_id] != updated_at
+            ]
+            for template_id in set(self._templates) - set(versions):
+                self._templates.pop(template_id, None)
+            if changed:
+                rows = (await db.execute(
+                    select(LogTemplate.id, LogTemplate.name, LogTemplate.content_format)
+                    .where(LogTemplate.id.in_(changed))
+                )).all()
+                for row in rows:
+                    self._templates[row.id] = _IndexedTemplate(row.id, row.name, row.content_format)
+
+            self._versions = versions
+            self._signature = signature
+            self._publish()
+
+    def candidates(self, log_message: str) -> List[_IndexedTemplate]:
+        """Templates whose anchors all occur in the line (not yet verified)."""
+        snapshot = self._snapshot
+        found = snapshot.matcher.find_all(log_message)
+        hits: Dict[str, int] = {}
+        for anchor in found:
+            for template_id in snapshot.by_anchor[anchor]:
+                hits[template_id] = hits.get(template_id, 0) + 1
+        result = [
+            snapshot.templates[template_id]
+            for template_id, count in hits.items()
+            if count == len(snapshot.templates[template_id].anchors)
+        ]
+        result.extend(snapshot.templates[template_id] for template_id in snapshot.unanchored)
+        return result
+
+    def detect(self, log_message: str) -> DetectionResult:
+        """
+        Find the templates a log line matches.
+
+        Args:
+            log_message: Raw log line
+
+        Returns:
+            DetectionResult with verified matches, most specific first, and
+            the line parsed with the best match
+        """
+        matches = [
+            template for template in self._ranked_candidates(log_message)
+            if get_detection_parser(template.content_format).parse(log_message) is not None
+        ]
+        parsed_ecs = None
+        if matches:
+            parsed_ecs = get_compiled_parser(matches[0].content_format).parse(log_message)
+        return DetectionResult(matches, parsed_ecs)
+
+    def detect_best(self, log_message: str) -> Optional[_IndexedTemplate]:
+        """
+        Find the most specific template a log line matches.
+
+        Same as `detect(log_message).best`, but verification stops at the
+        first candidate that matches instead of checking them all.
+        """
+        for template in self._ranked_candidates(log_message):
+            if get_detection_parser(template.content_format).parse(log_message) is not None:
+                return template
+        return None
+
+    def _ranked_candidates(self, log_message: str) -> List[_IndexedTemplate]:
+        return sorted(self.candidates(log_message), key=lambda t: t.specificity, reverse=True)
+
+    def detect_lines_to_ndjson(
+        self,
+        lines: List[str],
+        first_line_no: int,
+        only_misses: bool = False,
+    ) -> Tuple[bytes, int]:
+        """
+        Detect a batch of log lines into NDJSON records.
+
+        Returns:
+            (ndjson bytes, number of lines matching a template)
+        """
+        out = []
+        matched = 0
+        for line_no, line in enumerate(lines, first_line_no):
+            best = self.detect_best(line)
+            if best is not None:
+                matched += 1
+                if not only_misses:
+                    out.append(to_json({
+                        "line": line_no,
+                        "is_match": True,
+                        "template_id": best.id,
+                        "template_name": best.name,
+                    }))
+            else:
+                out.append(to_json({"line": line_no, "is_match": False}))
+        if out:
+            out.append(b"")
+        return b"\n".join(out), matched
+
+
+template_detection_index = TemplateDetectionIndex()
@@ -0,0 +1,92 @@
+"""
+Weighted mixes of templates for jobs that interleave several log types.
+
+A real device interleaves traffic, UTM, event and VPN logs. A job with
+extra templates sends one stream in which every log comes from a template
+drawn by weight (e.g. 80 forward traffic, 10 IPS, 10 system events), over
+the job's one connection and paced by its one loop.
+
+Templates are compiled once when the mix is built (see
+LogGenerator.compile) and drawn with Vose's alias method: the weights are
+turned into a table of n (probability, alias) pairs up front, so a draw is
+one random number and a table lookup however many templates there are.
+"""
+import random
+from typing import Dict, List, Optional, Sequence
+
+from services.log_generator import LogGenerator
+
+
+class TemplateMix:
+    """Templates with weights, drawn in proportion to their weights."""
+
+    def __init__(
+        self,
+        templates: Sequence[str],
+        weights: Optional[Sequence[float]] = None,
+        generator: Optional[LogGenerator] = None
+    ) -> None:
+        """
+        Args:
+            templates: Templates to mix
+            weights: Relative weight of each template (default: equal weights)
+            generator: LogGenerator the templates are compiled with (default: a new one)
+
+        Raises:
+            ValueError: If there are no templates, or a weight is not positive
+        """
+        if not templates:
+            raise ValueError("a mix needs at least one template")
+        weights = [1.0] * len(templates) if weights is None else [float(weight) for weight in weights]
+        if len(weights) != len(templates):
+            raise ValueError("a mix needs one weight per template")
+        if any(not weight > 0 for weight in weights):
+            raise ValueError("template weights must be positive")
+        self.templates = list(templates)
+        self.weights = weights
+        self.generator = generator or LogGenerator()
+        self.compiled = [self.generator.compile(template) for template in self.templates]
+        self._probability, self._alias = _alias_table(weights)
+        self._random = random.random
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def pick(self) -> int:
+        """Index of a template drawn by weight."""
+        count = len(self._alias)
+        if count == 1:
+            return 0
+        # the integer part picks a column, the fraction decides between it and its alias
+        draw = self._random() * count
+        column = int(draw)
+        return column if draw - column < self._probability[column] else self._alias[column]
+
+    def render(self, context: Optional[Dict[str, str]] = None) -> str:
+        """Generate one log from a template drawn by weight."""
+        return self.compiled[self.pick()].render(context)
+
+
+def _alias_table(weights: List[float]) -> tuple:
+    """
+    Vose's alias table of the weights.
+
+    Column i is kept with probability[i], otherwise alias[i] is taken
+    instead; every column covers 1/n of the total weight.
+    """
+    count = len(weights)
+    total = sum(weights)
+    scaled = [weight * count / total for weight in weights]
+    probability = [1.0] * count
+    alias = list(range(count))
+    small = [column for column, share in enumerate(scaled) if share < 1.0]
+    large = [column for column, share in enumerate(scaled) if share >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        # the overfull column gives what the small one lacks
+        scaled[more] += scaled[less] - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    # columns left over are full up to rounding
+    return probability, alias
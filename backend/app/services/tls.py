@@ -0,0 +1,98 @@
+"""
+TLS client contexts for syslog over TLS (RFC 5425).
+
+A TLS job keeps one connection to its destination, but when it has to
+reconnect (the receiver restarted, a load balancer dropped the connection)
+a full handshake per reconnect is what limits a flapping job. Contexts
+therefore remember the last session of their destination and offer it on
+the next handshake, so reconnects resume it (a TLS 1.3 ticket or TLS 1.2
+session id) instead of repeating the key exchange and certificate checks.
+
+asyncio.open_connection() has no parameter for the session to offer, so
+ResumingContext injects it where asyncio wraps its transport.
+
+Contexts are shared per destination and settings, so a job started after
+another one to the same receiver resumes that job's session.
+
+Verification modes (SYSLOG_TLS_MODE):
+    verify-full   certificate chain and host name (default)
+    verify-ca     certificate chain only
+    require       encryption without any certificate check
+"""
+import ssl
+from typing import Dict, Optional, Tuple
+
+VERIFY_FULL = "verify-full"
+VERIFY_CA = "verify-ca"
+REQUIRE = "require"
+TLS_MODES = (VERIFY_FULL, VERIFY_CA, REQUIRE)
+
+
+class ResumingContext(ssl.SSLContext):
+    """Client SSLContext offering the last session it was given to new connections."""
+
+    session: Optional[ssl.SSLSession] = None
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        return super().wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=server_hostname,
+            session=session or self.session
+        )
+
+    def remember(self, ssl_object: Optional[ssl.SSLObject]) -> None:
+        """Keep the session of a connection (call it late: TLS 1.3 tickets arrive after the handshake)."""
+        session = ssl_object.session if ssl_object is not None else None
+        if session is not None:
+            self.session = session
+
+
+_contexts: Dict[Tuple, ResumingContext] = {}
+
+
+def client_context(
+    host: str,
+    port: int,
+    mode: Optional[str] = None,
+    ca_file: Optional[str] = None,
+    cert_file: Optional[str] = None,
+    key_file: Optional[str] = None
+) -> ResumingContext:
+    """
+    Shared client context for a destination.
+
+    Args:
+        host: Destination host
+        port: Destination port
+        mode: verify-full, verify-ca or require (default: verify-full)
+        ca_file: CA bundle to verify the receiver with (default: system CAs)
+        cert_file: Client certificate, for receivers requiring mutual TLS
+        key_file: Key of cert_file (default: read from cert_file)
+
+    Returns:
+        ResumingContext: The destination's context
+
+    Raises:
+        ValueError: If mode is unknown
+        OSError: If a certificate or key file cannot be read
+    """
+    mode = mode or VERIFY_FULL
+    if mode not in TLS_MODES:
+        raise ValueError(f"TLS mode must be one of {', '.join(TLS_MODES)}")
+    key = (host, port, mode, ca_file, cert_file, key_file)
+    context = _contexts.get(key)
+    if context is None:
+        context = ResumingContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        if mode == REQUIRE:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        else:
+            context.check_hostname = mode == VERIFY_FULL
+            if ca_file:
+                context.load_verify_locations(cafile=ca_file)
+            else:
+                context.load_default_certs(ssl.Purpose.SERVER_AUTH)
+        if cert_file:
+            context.load_cert_chain(cert_file, key_file)
+        _contexts[key] = context
+    return context
@@ -0,0 +1,120 @@
+"""
+Virtual clock for BACKFILL jobs and offline exports (app/export.py).
+
+TimestampFormatter also re-stamps captured lines of REPLAY jobs
+(services/replay.py).
+
+A backfill covers [start, end) in event time at a fixed event rate while
+sending as fast as the destination accepts. Message i carries the event time
+start + i / eps; the timestamp placeholders of LogGenerator (@timestamp.*,
+event.created, event.start and the legacy date/time/eventtime) are filled from
+it through the generate_log context instead of the wall clock.
+
+Formatting is incremental: the second-resolution strings are rebuilt only when
+the virtual second changes (the date strings only when the day changes), and
+per message only the fractional part is appended.
+"""
+import random
+from datetime import datetime, tzinfo
+from typing import Dict, Iterator, Optional, Tuple
+
+US_PER_SECOND = 1_000_000
+
+
+class VirtualClock:
+    """
+    Event times of the messages of a backfill.
+
+    Times are kept as integer microseconds since the epoch and messages are
+    spaced by the exact fraction step_us / step_div, so a long backfill does
+    not accumulate floating point drift.
+    """
+
+    def __init__(self, start: datetime, end: datetime, eps: int) -> None:
+        if eps < 1:
+            raise ValueError("eps must be at least 1")
+        self._init_range(start, end)
+        self.step_us, self.step_div = US_PER_SECOND, eps
+        # messages whose event time falls before end
+        self.total = -(-(self.end_us - self.start_us) * eps // US_PER_SECOND)
+
+    @classmethod
+    def spanning(cls, start: datetime, end: datetime, count: int) -> "VirtualClock":
+        """A clock spreading `count` messages evenly over [start, end)."""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        clock = cls.__new__(cls)
+        clock._init_range(start, end)
+        clock.step_us, clock.step_div = clock.end_us - clock.start_us, count
+        clock.total = count
+        return clock
+
+    def _init_range(self, start: datetime, end: datetime) -> None:
+        self.start_us = _epoch_us(start)
+        self.end_us = _epoch_us(end)
+        if self.end_us <= self.start_us:
+            raise ValueError("end must be after start")
+
+    def __len__(self) -> int:
+        return self.total
+
+    def time_us(self, index: int) -> int:
+        """Event time of message `index` in microseconds since the epoch."""
+        return self.start_us + index * self.step_us // self.step_div
+
+    def contexts(self, first: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Yield (index, placeholder context) for every message in [first, stop).
+
+        The same context dict is updated in place between messages; copy it
+        to keep a message's values.
+        """
+        formatter = TimestampFormatter()
+        stop = self.total if stop is None else min(stop, self.total)
+        for index in range(first, stop):
+            yield index, formatter.context(self.time_us(index))
+
+
+class TimestampFormatter:
+    """
+    Formats the timestamp placeholders for successive event times.
+
+    Times are formatted in local time, like the wall-clock placeholders
+    (datetime.now()), or in the zone `tz` if one is given.
+    """
+
+    def __init__(self, tz: Optional[tzinfo] = None) -> None:
+        self._tz = tz
+        self._second = None
+        self._day = None
+        self._iso_second = ""
+        self._context: Dict[str, str] = {}
+
+    def context(self, epoch_us: int) -> Dict[str, str]:
+        """Placeholder values for the event time `epoch_us`."""
+        second, fraction = divmod(epoch_us, US_PER_SECOND)
+        context = self._context
+        if second != self._second:
+            self._second = second
+            moment = datetime.fromtimestamp(second, self._tz)
+            day = moment.date()
+            if day != self._day:
+                self._day = day
+                context["@timestamp.date"] = context["date"] = moment.strftime('%Y-%m-%d')
+                context["@timestamp.date2"] = moment.strftime('%Y/%m/%d')
+            context["@timestamp.time"] = context["time"] = moment.strftime('%H:%M:%S')
+            self._iso_second = f"{context['@timestamp.date']}T{context['@timestamp.time']}"
+            context["event.created"] = context["eventtime"] = str(second)
+
+        digits = f"{fraction:06d}"
+        # datetime.isoformat() leaves out a zero fraction, strftime('%f') does not
+        context["@timestamp"] = f"{self._iso_second}.{digits}" if fraction else self._iso_second
+        context["@timestamp.high_res"] = f"{self._iso_second}.{digits}"
+        context["event.start"] = str(second - random.randint(0, 3600))
+        return context
+
+
+def _epoch_us(moment: datetime) -> int:
+    """Microseconds since the epoch, exact for any datetime (naive means local)."""
+    whole = int(moment.replace(microsecond=0).timestamp())
+    return whole * US_PER_SECOND + moment.microsecond
@@ -0,0 +1,374 @@
+"""
+Standalone runner: run one job locally without the API, database or Redis.
+
+The job is described by a YAML spec and/or command line flags (flags win)
+with the same fields as a job of the API, and is run by the worker's
+sending engine (services/send_engine.py) until it completes or is
+interrupted with Ctrl-C. Only the engine, LogGenerator and the template
+YAML are loaded, so it starts in well under a second and needs no
+configuration of the control plane.
+
+Spec fields:
+    template            predefined template id (file stem) or template YAML path
+    template_content    inline template, instead of template
+    template_weight     weight of the template among the job's templates (default 1)
+    templates           extra templates each log may be drawn from by weight,
+                        each a mapping of template (or template_content) and weight
+    destination         host:port (or destination_host and destination_port)
+    protocol            UDP, TCP, TLS, ES_BULK, SPLUNK_HEC, HTTP_JSON or FILE (default UDP)
+    file_path           FILE: file or named pipe to write to, instead of destination
+    syslog_format       RAW, RFC3164 or RFC5424 header (default RAW)
+    tcp_framing         NEWLINE or OCTET_COUNTING (default NEWLINE)
+    mode                CONSTANT, RAMP, BACKFILL or REPLAY (default CONSTANT)
+    eps                 CONSTANT rate, converted to send_interval_ms
+    start_time, end_time, send_count, send_interval_ms, embed_sequence,
+    ramp_base_eps, ramp_factor, ramp_step_seconds, ramp_max_eps,
+    backfill_eps, prerender_pool, replay_path, replay_speed,
+    replay_loop, replay_rewrite_timestamps, syslog_pri, syslog_hostname,
+    syslog_appname, job_id
+    tls_mode            verify-full, verify-ca or require (default verify-full)
+    tls_ca_file, tls_cert_file, tls_key_file
+    http_path, http_index, http_batch_size, http_batch_age_ms,
+    http_max_in_flight, http_gzip, http_tls, http_authorization,
+    file_rotate_mb, file_rotate_seconds, file_rotate_keep, file_gzip,
+    file_fsync (NONE, ROTATE or WRITE)
+    destinations        extra destinations every log is also sent to, each a
+                        mapping of protocol, destination (or file_path),
+                        http_path and http_index
+
+REPLAY jobs need replay_path instead of a template.
+
+Usage (from backend/):
+    python -m app.standalone job.yml
+    python -m app.standalone -t fortigate_forward_traffic -d 127.0.0.1:514 \\
+        --protocol tcp --mode ramp --embed-sequence
+    python -m app.standalone -d 127.0.0.1:514 --mode replay \
+        --replay-path capture.log --replay-speed 10 --rewrite-timestamps
+    python -m app.standalone -d logs.example.com:6514 --protocol tls \
+        --tcp-framing octet-counting --tls-ca-file ca.pem --mode ramp
+    python -m app.standalone -d splunk.example.com:8088 --protocol splunk_hec \
+        --http-tls --http-authorization "Splunk $HEC_TOKEN" --http-gzip --mode ramp
+    python -m app.standalone -t fortigate_forward_traffic --protocol file \
+        --file-path /var/log/sim/fw.log --file-rotate-mb 100 --mode ramp
+    python -m app.standalone -t fortigate_forward_traffic -d 10.0.0.1:514 --protocol tcp \
+        --also tcp:10.0.0.2:514 --also file:/tmp/reference.log --mode ramp
+    python -m app.standalone -t fortigate_forward_traffic --template-weight 80 \
+        --mix fortigate_ips_logs:10 --mix fortigate_system_events:10 -d 127.0.0.1:514 --eps 500
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+import time
+import uuid
+import yaml
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# App modules are imported relative to this directory, as in the API and worker
+sys.path.insert(0, str(Path(__file__).parent))
+
+from export import load_template, parse_time
+from services import send_engine
+from services.file_sink import FSYNC_POLICIES
+from services.http_sink import HTTP_PROTOCOLS
+from services.ramp_controller import RampResult
+from services.tls import TLS_MODES
+
+PROTOCOLS = ("UDP", "TCP", "TLS") + HTTP_PROTOCOLS + ("FILE",)
+SYSLOG_FORMATS = ("RAW", "RFC3164", "RFC5424")
+TCP_FRAMINGS = ("NEWLINE", "OCTET_COUNTING")
+MODES = ("CONSTANT", "RAMP", "BACKFILL", "REPLAY")
+# Same default as a job created through the API without send_interval_ms
+DEFAULT_SEND_INTERVAL_MS = 1000
+
+# Spec fields copied into the engine's job_config as they are
+JOB_FIELDS = (
+    "send_count", "send_interval_ms", "embed_sequence", "ramp_base_eps", "ramp_factor",
+    "ramp_step_seconds", "ramp_max_eps", "backfill_eps", "prerender_pool", "replay_path", "replay_speed",
+    "replay_loop", "replay_rewrite_timestamps", "syslog_pri", "syslog_hostname", "syslog_appname",
+    "tls_mode", "tls_ca_file", "tls_cert_file", "tls_key_file", "http_path", "http_index", "http_batch_size",
+    "http_batch_age_ms", "http_max_in_flight", "http_gzip", "http_tls", "http_authorization", "file_path",
+    "file_rotate_mb", "file_rotate_seconds", "file_rotate_keep", "file_gzip", "file_fsync", "template_weight",
+)
+
+
+def build_job(spec: dict) -> tuple:
+    """
+    Turn a job spec into the arguments of send_engine.run_job.
+
+    Args:
+        spec: Spec fields, see the module docstring
+
+    Returns:
+        tuple: (job_id, job_config, template_content)
+
+    Raises:
+        ValueError: If a field is missing or invalid
+    """
+    mode = str(spec.get("mode") or "CONSTANT").upper()
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+    if spec.get("template_content"):
+        template_content = spec["template_content"]
+    elif spec.get("template"):
+        template_content = load_template(spec["template"])[1]
+    elif mode == "REPLAY":
+        template_content = ""
+    else:
+        raise ValueError("a template or template_content is required")
+
+    templates = [_template(extra) for extra in spec.get("templates") or ()]
+    if templates and mode == "REPLAY":
+        raise ValueError("REPLAY jobs do not use templates")
+    if spec.get("template_weight") is not None and float(spec["template_weight"]) <= 0:
+        raise ValueError("template_weight must be positive")
+    destination = _destination(spec)
+    destinations = [
+        dict(_destination(extra), http_path=extra.get("http_path"), http_index=extra.get("http_index"))
+        for extra in spec.get("destinations") or ()
+    ]
+    syslog_format = str(spec.get("syslog_format") or "RAW").upper()
+    if syslog_format not in SYSLOG_FORMATS:
+        raise ValueError(f"syslog_format must be one of {', '.join(SYSLOG_FORMATS)}")
+    tcp_framing = str(spec.get("tcp_framing") or "NEWLINE").upper().replace("-", "_")
+    if tcp_framing not in TCP_FRAMINGS:
+        raise ValueError(f"tcp_framing must be one of {', '.join(TCP_FRAMINGS)}")
+
+    job_config = {field: spec.get(field) for field in JOB_FIELDS}
+    job_config.update(destination)
+    job_config.update(
+        templates=templates,
+        destinations=destinations,
+        syslog_format=syslog_format,
+        tcp_framing=tcp_framing,
+        mode=mode,
+        start_time=_as_time(spec.get("start_time")),
+        end_time=_as_time(spec.get("end_time")),
+        embed_sequence=bool(spec.get("embed_sequence")),
+    )
+    if spec.get("eps"):
+        # the CONSTANT loop sleeps whole milliseconds between logs
+        job_config["send_interval_ms"] = max(1, round(1000 / float(spec["eps"])))
+    job_config["send_interval_ms"] = job_config["send_interval_ms"] or DEFAULT_SEND_INTERVAL_MS
+
+    if mode == "BACKFILL":
+        start, end = job_config["start_time"], job_config["end_time"]
+        if not start or not end or end <= start:
+            raise ValueError("BACKFILL jobs need a start_time before their end_time")
+        if not job_config["backfill_eps"]:
+            raise ValueError("BACKFILL jobs need backfill_eps")
+    if isinstance(job_config["replay_speed"], str):
+        job_config["replay_speed"] = _speed(job_config["replay_speed"])
+    if job_config["prerender_pool"] and mode not in ("RAMP", "BACKFILL"):
+        raise ValueError("prerender_pool is only supported by RAMP and BACKFILL jobs")
+    if mode == "REPLAY" and not job_config["replay_path"]:
+        raise ValueError("REPLAY jobs need replay_path")
+    if job_config["tls_mode"] and job_config["tls_mode"] not in TLS_MODES:
+        raise ValueError(f"tls_mode must be one of {', '.join(TLS_MODES)}")
+    if job_config["file_fsync"]:
+        job_config["file_fsync"] = str(job_config["file_fsync"]).upper()
+        if job_config["file_fsync"] not in FSYNC_POLICIES:
+            raise ValueError(f"file_fsync must be one of {', '.join(FSYNC_POLICIES)}")
+
+    job_id = str(spec.get("job_id") or f"standalone-{uuid.uuid4().hex[:8]}")
+    return job_id, job_config, template_content
+
+
+def _destination(spec: dict) -> dict:
+    """protocol, destination_host, destination_port and file_path of a job or extra destination."""
+    protocol = str(spec.get("protocol") or "UDP").upper()
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"protocol must be one of {', '.join(PROTOCOLS)}")
+
+    host, port = spec.get("destination_host"), spec.get("destination_port")
+    if spec.get("destination"):
+        host, _, port = str(spec["destination"]).rpartition(":")
+    if protocol == "FILE":
+        if not spec.get("file_path"):
+            raise ValueError("FILE jobs need a file_path")
+        host, port = None, None
+    elif not host or not port:
+        raise ValueError("a destination host:port is required")
+    else:
+        port = int(port)
+        if not 1 <= port <= 65535:
+            raise ValueError(f"destination port {port} is out of range")
+    return {
+        "protocol": protocol,
+        "destination_host": host.strip("[]") if host else None,
+        "destination_port": port,
+        "file_path": spec.get("file_path"),
+    }
+
+
+def _template(spec: dict) -> dict:
+    """content and weight of an extra template."""
+    if spec.get("template_content"):
+        content = spec["template_content"]
+    elif spec.get("template"):
+        content = load_template(spec["template"])[1]
+    else:
+        raise ValueError("extra templates need a template or template_content")
+    weight = float(spec.get("weight") or 1)
+    if weight <= 0:
+        raise ValueError("template weights must be positive")
+    return {"content": content, "weight": weight}
+
+
+def _mix(value: str) -> dict:
+    """--mix: TEMPLATE:WEIGHT, or TEMPLATE for a weight of 1, of an extra template."""
+    template, _, weight = value.rpartition(":")
+    if not template:
+        return {"template": value}
+    return {"template": template, "weight": float(weight)}
+
+
+def _also(value: str) -> dict:
+    """--also: PROTOCOL:HOST:PORT, or FILE:PATH, of an extra destination."""
+    protocol, _, target = value.partition(":")
+    if protocol.upper() == "FILE":
+        return {"protocol": "FILE", "file_path": target}
+    return {"protocol": protocol, "destination": target}
+
+
+def _as_time(value) -> Optional[datetime]:
+    """Spec times may be YAML timestamps or ISO 8601 strings."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return parse_time(str(value))
+
+
+def _speed(value: str) -> float:
+    """--replay-speed: a positive multiplier, or max (0) for as fast as possible."""
+    if value.lower() == "max":
+        return 0.0
+    speed = float(value)
+    if speed <= 0:
+        raise ValueError("replay_speed must be positive or max")
+    return speed
+
+
+async def run(job_id: str, job_config: dict, template_content: str) -> int:
+    """Run the job, stopping it cleanly on SIGINT/SIGTERM."""
+    async def print_result(result: RampResult) -> None:
+        print(f"Saturation: {result.saturation_eps} eps ({result.reason})", file=sys.stderr)
+
+    sending = asyncio.ensure_future(
+        send_engine.run_job(job_id, job_config, template_content, on_result=print_result)
+    )
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, sending.cancel)
+        except (NotImplementedError, RuntimeError):
+            # no loop signal handlers (Windows): Ctrl-C ends the run without a summary
+            pass
+    return await sending
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m app.standalone", description="Run one log sending job without the API, database or Redis"
+    )
+    arg_parser.add_argument("spec", nargs="?", type=Path, help="Job spec YAML (flags override its fields)")
+    arg_parser.add_argument("-t", "--template", help="Predefined template id (file stem) or path to a template YAML")
+    arg_parser.add_argument("--template-weight", type=float, help="Weight of --template among the job's templates")
+    arg_parser.add_argument("--mix", dest="templates", type=_mix, action="append",
+                            help="Extra template each log may be drawn from by weight: TEMPLATE:WEIGHT (repeatable)")
+    arg_parser.add_argument("-d", "--destination", help="Destination host:port")
+    arg_parser.add_argument("--protocol", type=str.upper, choices=PROTOCOLS)
+    arg_parser.add_argument("--mode", type=str.upper, choices=MODES)
+    arg_parser.add_argument("--syslog-format", type=str.upper, choices=SYSLOG_FORMATS, help="Syslog header")
+    arg_parser.add_argument("--tcp-framing", type=lambda value: value.upper().replace("-", "_"), choices=TCP_FRAMINGS)
+    arg_parser.add_argument("--syslog-pri", type=int, help="Syslog PRI (default: 134, local0.info)")
+    arg_parser.add_argument("--syslog-hostname", help="Syslog HOSTNAME (default: this host)")
+    arg_parser.add_argument("--syslog-appname", help="Syslog APP-NAME / TAG (default: log-simulator)")
+    arg_parser.add_argument("--tls-mode", type=str.lower, choices=TLS_MODES,
+                            help="TLS: receiver certificate check (default: verify-full)")
+    arg_parser.add_argument("--tls-ca-file", help="TLS: CA bundle to verify the receiver with (default: system CAs)")
+    arg_parser.add_argument("--tls-cert-file", help="TLS: client certificate for mutual TLS")
+    arg_parser.add_argument("--tls-key-file", help="TLS: key of the client certificate")
+    arg_parser.add_argument("--http-path", help="HTTP: request path (default: the API's usual endpoint)")
+    arg_parser.add_argument("--http-index", help="HTTP: Elasticsearch or Splunk index")
+    arg_parser.add_argument("--http-batch-size", type=int, help="HTTP: logs per request (default: 500)")
+    arg_parser.add_argument("--http-batch-age-ms", type=int,
+                            help="HTTP: longest a log waits for its batch to fill (default: 1000)")
+    arg_parser.add_argument("--http-max-in-flight", type=int, help="HTTP: concurrent requests (default: 4)")
+    arg_parser.add_argument("--http-gzip", action="store_true", default=None, help="HTTP: gzip request bodies")
+    arg_parser.add_argument("--http-tls", action="store_true", default=None, help="HTTP: use HTTPS (see --tls-*)")
+    arg_parser.add_argument("--http-authorization", help='HTTP: Authorization header, e.g. "Splunk <token>"')
+    arg_parser.add_argument("--file-path", help="FILE: file or named pipe to write to")
+    arg_parser.add_argument("--file-rotate-mb", type=int, help="FILE: rotate the file at this size in MiB")
+    arg_parser.add_argument("--file-rotate-seconds", type=int, help="FILE: rotate the file at this age")
+    arg_parser.add_argument("--file-rotate-keep", type=int, help="FILE: rotated files to keep (default: all)")
+    arg_parser.add_argument("--file-gzip", action="store_true", default=None, help="FILE: write a gzip stream")
+    arg_parser.add_argument("--file-fsync", type=str.upper, choices=FSYNC_POLICIES,
+                            help="FILE: fsync after every WRITE, on ROTATE and close, or NONE (default)")
+    arg_parser.add_argument("--also", dest="destinations", type=_also, action="append",
+                            help="Extra destination every log is also sent to: PROTOCOL:HOST:PORT or FILE:PATH "
+                                 "(repeatable)")
+    arg_parser.add_argument("--eps", type=float, help="CONSTANT mode rate (sets send_interval_ms)")
+    arg_parser.add_argument("--send-interval-ms", type=int)
+    arg_parser.add_argument("-n", "--send-count", type=int, help="Stop after this many logs")
+    arg_parser.add_argument("--start-time", type=parse_time)
+    arg_parser.add_argument("--end-time", type=parse_time)
+    arg_parser.add_argument("--embed-sequence", action="store_true", default=None,
+                            help="Append job id, sequence number and send time to every log")
+    arg_parser.add_argument("--ramp-base-eps", type=int)
+    arg_parser.add_argument("--ramp-factor", type=float)
+    arg_parser.add_argument("--ramp-step-seconds", type=int)
+    arg_parser.add_argument("--ramp-max-eps", type=int)
+    arg_parser.add_argument("--backfill-eps", type=int)
+    arg_parser.add_argument("--prerender-pool", type=int,
+                            help="RAMP/BACKFILL: render this many logs once and only patch their timestamps")
+    arg_parser.add_argument("--replay-path", help="Capture file to replay")
+    arg_parser.add_argument("--replay-speed", type=_speed,
+                            help="Multiplier of the capture's timing, or max (default: 1)")
+    arg_parser.add_argument("--replay-loop", action="store_true", default=None, help="Restart the capture when it ends")
+    arg_parser.add_argument("--rewrite-timestamps", dest="replay_rewrite_timestamps", action="store_true",
+                            default=None, help="Replace the capture's timestamps with the send time")
+    arg_parser.add_argument("--job-id", help="Job id in logs and sequence trailers (default: standalone-<random>)")
+    arg_parser.add_argument("--log-level", default="INFO", help="Log level of the sending engine")
+    args = arg_parser.parse_args(argv)
+
+    spec = {}
+    if args.spec:
+        spec = yaml.safe_load(args.spec.read_text(encoding="utf-8")) or {}
+        if not isinstance(spec, dict):
+            arg_parser.error(f"{args.spec} is not a YAML mapping")
+    spec.update({
+        field: value for field, value in vars(args).items()
+        if value is not None and field not in ("spec", "log_level")
+    })
+    try:
+        job_id, job_config, template_content = build_job(spec)
+    except (ValueError, FileNotFoundError) as e:
+        arg_parser.error(str(e))
+
+    logging.basicConfig(level=args.log_level, format='%(asctime)s - %(levelname)s - %(message)s')
+    destination = job_config['file_path'] or f"{job_config['destination_host']}:{job_config['destination_port']}"
+    if job_config['destinations']:
+        destination += f" and {len(job_config['destinations'])} more destination(s)"
+    if job_config['templates']:
+        destination += f", mixing {len(job_config['templates']) + 1} templates"
+    print(
+        f"Job {job_id}: {job_config['mode']} {job_config['protocol']} to {destination} (Ctrl-C to stop)",
+        file=sys.stderr
+    )
+    started = time.perf_counter()
+    try:
+        logs_sent = asyncio.run(run(job_id, job_config, template_content))
+    except OSError as e:
+        print(f"Job {job_id} failed: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    print(f"Sent {logs_sent} logs in {elapsed:.1f}s ({logs_sent / max(elapsed, 1e-9):,.0f} logs/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
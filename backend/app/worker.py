@@ -6,17 +6,23 @@ and manages long-running log sending jobs.
 """
 
 import asyncio
-import socket
 import logging
-from typing import Dict, Optional
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
 import redis.asyncio as redis
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from core.settings import cfg
-from models.job import Job, JobStatusEnum, ProtocolEnum
+from models.job import Job, JobStatusEnum, JobTemplate, ProtocolEnum
 from models.log_template import LogTemplate
-from services.log_generator import LogGenerator
+from services.fan_out import DeliveryStats
+from services.ramp_controller import RampResult
+from services.send_engine import DESTINATION_FIELDS, confine_job_paths, receiver_reports, run_job
+from services.sequence_tracker import RECEIVER_REPORT_CHANNEL
 
 
 # Configure logging with more detailed format
@@ -32,9 +38,6 @@ active_jobs: Dict[str, asyncio.Task] = {}
 # Redis client
 redis_client: Optional[redis.Redis] = None
 
-# Log generator instance
-log_generator = LogGenerator()
-
 # db
 engine = create_async_engine(cfg.APP_DB_URI)
 
@@ -57,7 +60,10 @@ async def send_log_loop(job_id: str) -> None:
             
             try:
                 logger.debug(f"Fetching job {job_id} from database")
-                stmt = select(Job).where(Job.id == job_id)
+                stmt = select(Job).options(
+                    selectinload(Job.templates).selectinload(JobTemplate.template),
+                    selectinload(Job.destinations)
+                ).where(Job.id == job_id)
                 job_res = await session.execute(stmt)
                 job = job_res.scalar_one_or_none()
                 if not job:
@@ -79,18 +85,78 @@ async def send_log_loop(job_id: str) -> None:
                     'destination_host': job.destination_host,
                     'destination_port': job.destination_port,
                     'protocol': job.protocol,
+                    'syslog_format': job.syslog_format,
+                    'tcp_framing': job.tcp_framing,
+                    'syslog_pri': job.syslog_pri,
+                    'syslog_hostname': job.syslog_hostname,
+                    'syslog_appname': job.syslog_appname,
+                    'tls_mode': cfg.SYSLOG_TLS_MODE,
+                    'tls_ca_file': cfg.SYSLOG_TLS_CA_FILE,
+                    'tls_cert_file': cfg.SYSLOG_TLS_CERT_FILE,
+                    'tls_key_file': cfg.SYSLOG_TLS_KEY_FILE,
+                    'http_path': job.http_path,
+                    'http_index': job.http_index,
+                    'http_batch_size': job.http_batch_size,
+                    'http_batch_age_ms': job.http_batch_age_ms,
+                    'http_max_in_flight': job.http_max_in_flight,
+                    'http_gzip': job.http_gzip,
+                    'http_tls': job.http_tls,
+                    'http_authorization': cfg.HTTP_SINK_AUTHORIZATION,
+                    'file_path': job.file_path,
+                    'file_rotate_mb': job.file_rotate_mb,
+                    'file_rotate_seconds': job.file_rotate_seconds,
+                    'file_rotate_keep': job.file_rotate_keep,
+                    'file_gzip': job.file_gzip,
+                    'file_fsync': job.file_fsync,
                     'start_time': job.start_time,
                     'end_time': job.end_time,
                     'send_count': job.send_count,
-                    'send_interval_ms': job.send_interval_ms or 1000
+                    'send_interval_ms': job.send_interval_ms or 1000,
+                    'embed_sequence': job.embed_sequence,
+                    'mode': job.mode,
+                    'ramp_base_eps': job.ramp_base_eps,
+                    'ramp_factor': job.ramp_factor,
+                    'ramp_step_seconds': job.ramp_step_seconds,
+                    'ramp_max_eps': job.ramp_max_eps,
+                    'backfill_eps': job.backfill_eps,
+                    'prerender_pool': job.prerender_pool,
+                    'replay_path': job.replay_path,
+                    'replay_speed': job.replay_speed,
+                    'replay_loop': job.replay_loop,
+                    'replay_rewrite_timestamps': job.replay_rewrite_timestamps,
+                    'template_weight': job.template_weight,
+                    'templates': [
+                        {'content': extra.template.content_format, 'weight': extra.weight}
+                        for extra in job.templates
+                    ],
+                    'destinations': [
+                        {field: getattr(destination, field) for field in DESTINATION_FIELDS}
+                        for destination in job.destinations
+                    ]
                 }
                 template_content = template.content_format
                 
+                # The API checked the paths on its host; check them again on
+                # this one, which is where they are opened
+                try:
+                    confine_job_paths(job_config, cfg.REPLAY_CAPTURE_ROOT, cfg.FILE_SINK_ROOT)
+                except ValueError as e:
+                    logger.error(f"Job {job_id} refused: {e}")
+                    await _update_job_status(job_id, JobStatusEnum.ERROR)
+                    return
+                
                 # Update job status to RUNNING
                 job.status = JobStatusEnum.RUNNING
                 await session.commit()
                 
-                logger.info(f"Job {job_id} configured: {job_config['protocol']} to {job_config['destination_host']}:{job_config['destination_port']}")
+                # the commit expired the job, so only job_config is read from here on
+                destinations = job_config['destinations']
+                destination = job_config['file_path'] if job_config['protocol'] == ProtocolEnum.FILE else \
+                    f"{job_config['destination_host']}:{job_config['destination_port']}"
+                logger.info(
+                    f"Job {job_id} configured: {job_config['protocol']} to {destination}"
+                    f"{f' and {len(destinations)} more destination(s)' if destinations else ''}"
+                )
                 logger.info(f"Scheduling config - start_time: {job_config['start_time']}, end_time: {job_config['end_time']}, send_count: {job_config['send_count']}, interval: {job_config['send_interval_ms']}ms")
                 
             except Exception as e:
@@ -104,74 +170,17 @@ async def send_log_loop(job_id: str) -> None:
                 await _update_job_status(job_id, JobStatusEnum.ERROR)
                 return
             
-            # Import datetime for time comparisons
-            from datetime import datetime, timezone
-            
-            # Helper function to ensure timezone-aware datetime
-            def ensure_timezone_aware(dt):
-                if dt is None:
-                    return None
-                if dt.tzinfo is None:
-                    # Assume naive datetime is in UTC
-                    return dt.replace(tzinfo=timezone.utc)
-                return dt
-            
-            # Ensure start_time and end_time are timezone-aware
-            job_config['start_time'] = ensure_timezone_aware(job_config['start_time'])
-            job_config['end_time'] = ensure_timezone_aware(job_config['end_time'])
-            
-            # Wait for start_time if set and in the future
-            if job_config['start_time']:
-                now = datetime.now(timezone.utc)
-                if job_config['start_time'] > now:
-                    wait_seconds = (job_config['start_time'] - now).total_seconds()
-                    logger.info(f"Job {job_id} waiting {wait_seconds:.1f}s until start time {job_config['start_time']}")
-                    await asyncio.sleep(wait_seconds)
-            
-            # Initialize counters
-            logs_sent = 0
-            interval_seconds = job_config['send_interval_ms'] / 1000.0
-            
-            # Main sending loop
-            while True:
-                try:
-                    # Check if we should stop due to end_time
-                    if job_config['end_time']:
-                        now = datetime.now(timezone.utc)
-                        if now >= job_config['end_time']:
-                            logger.info(f"Job {job_id} reached end_time {job_config['end_time']}, stopping")
-                            break
-                    
-                    # Check if we should stop due to send_count limit
-                    if job_config['send_count'] and logs_sent >= job_config['send_count']:
-                        logger.info(f"Job {job_id} reached send_count limit of {job_config['send_count']}, stopping")
-                        break
-                    
-                    # Generate log content from template
-                    log_content = log_generator.generate_log(template_content)
-                    
-                    # Send the log
-                    await _send_log_message(
-                        log_content,
-                        job_config['destination_host'],
-                        job_config['destination_port'],
-                        job_config['protocol']
-                    )
-                    
-                    logs_sent += 1
-                    logger.debug(f"Sent log {logs_sent} for job {job_id}: {log_content[:100]}...")
-                    
-                    # Sleep for the configured interval
-                    await asyncio.sleep(interval_seconds)
-                    
-                except asyncio.CancelledError:
-                    logger.info(f"Job {job_id} was cancelled")
-                    break
-                except Exception as e:
-                    logger.error(f"Error in job {job_id} loop: {e}")
-                    logger.debug(f"Full exception details: {type(e).__name__}: {str(e)}")
-                    await _update_job_status(job_id, JobStatusEnum.ERROR)
-                    break
+            try:
+                logs_sent = await run_job(
+                    job_id, job_config, template_content,
+                    on_result=lambda result: _save_ramp_result(job_id, result),
+                    on_delivery=lambda stats: _save_delivery_stats(job_id, stats)
+                )
+            except Exception as e:
+                logger.error(f"Error in job {job_id} loop: {e}")
+                logger.debug(f"Full exception details: {type(e).__name__}: {str(e)}")
+                await _update_job_status(job_id, JobStatusEnum.ERROR)
+                return
             
             # Job completed naturally (reached end_time or send_count)
             logger.info(f"Job {job_id} completed naturally after sending {logs_sent} logs")
@@ -187,74 +196,6 @@ async def send_log_loop(job_id: str) -> None:
             logger.info(f"Log sending loop ended for job {job_id}")
 
 
-async def _send_log_message(message: str, host: str, port: int, protocol: ProtocolEnum) -> None:
-    """
-    Send a log message to the specified destination.
-    
-    Args:
-        message: The log message to send
-        host: Destination host
-        port: Destination port  
-        protocol: Protocol to use (TCP or UDP)
-    """
-    try:
-        logger.debug(f"Sending message via {protocol} to {host}:{port} - {message[:50]}...")
-        logger.debug(f"full message: {message}")
-        if protocol == ProtocolEnum.UDP:
-            await _send_udp_message(message, host, port)
-        elif protocol == ProtocolEnum.TCP:
-            await _send_tcp_message(message, host, port)
-        else:
-            raise ValueError(f"Unsupported protocol: {protocol}")
-        logger.debug(f"Successfully sent message via {protocol} to {host}:{port}")
-    except Exception as e:
-        logger.error(f"Failed to send message to {host}:{port} via {protocol}: {type(e).__name__}: {e}")
-        raise
-
-
-async def _send_udp_message(message: str, host: str, port: int) -> None:
-    """Send a message via UDP."""
-    loop = asyncio.get_event_loop()
-    
-    def send_udp():
-        logger.debug(f"Creating UDP socket for {host}:{port}")
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        try:
-            message_bytes = message.encode('utf-8')
-            logger.debug(f"Sending {len(message_bytes)} bytes via UDP to {host}:{port}")
-            sock.sendto(message_bytes, (host, port))
-            logger.debug(f"UDP message sent successfully to {host}:{port}")
-        except Exception as e:
-            logger.error(f"UDP socket error: {type(e).__name__}: {e}")
-            raise
-        finally:
-            sock.close()
-    
-    await loop.run_in_executor(None, send_udp)
-
-
-async def _send_tcp_message(message: str, host: str, port: int) -> None:
-    """Send a message via TCP."""
-    try:
-        logger.debug(f"Opening TCP connection to {host}:{port}")
-        reader, writer = await asyncio.open_connection(host, port)
-        
-        # Prepare message with newline
-        message_bytes = message.encode('utf-8') + b'\n'
-        logger.debug(f"Sending {len(message_bytes)} bytes via TCP")
-        
-        writer.write(message_bytes)
-        await writer.drain()
-        
-        logger.debug(f"TCP message sent, closing connection to {host}:{port}")
-        writer.close()
-        await writer.wait_closed()
-        
-    except Exception as e:
-        logger.error(f"TCP connection error to {host}:{port}: {type(e).__name__}: {e}")
-        raise
-
-
 async def _update_job_status(job_id: str, status: JobStatusEnum) -> None:
     """
     Update job status in the database.
@@ -282,6 +223,74 @@ async def _update_job_status(job_id: str, status: JobStatusEnum) -> None:
             raise
 
 
+async def _save_ramp_result(job_id: str, result: RampResult) -> None:
+    """
+    Store the outcome of a ramp on the job.
+    
+    Args:
+        job_id: Job UUID as string
+        result: Saturation rate and what limited it
+    """
+    async with AsyncSession(engine) as session:
+        try:
+            stmt = select(Job).where(Job.id == job_id)
+            job = (await session.execute(stmt)).scalar_one_or_none()
+            if job:
+                job.saturation_eps = result.saturation_eps
+                job.saturation_reason = result.reason[:512]
+                job.saturation_measured_at = datetime.now(timezone.utc)
+                await session.commit()
+                logger.info(f"Saved ramp result for job {job_id}: {result.saturation_eps} eps")
+            else:
+                logger.warning(f"Job {job_id} not found when saving its ramp result")
+        except Exception as e:
+            logger.error(f"Failed to save ramp result for job {job_id}: {type(e).__name__}: {e}")
+            await session.rollback()
+
+
+async def _save_delivery_stats(job_id: str, stats: List[DeliveryStats]) -> None:
+    """
+    Store the delivery of a job run on the job and its extra destinations.
+    
+    Args:
+        job_id: Job UUID as string
+        stats: Delivery to the job's destination, then to each extra destination
+    """
+    async with AsyncSession(engine) as session:
+        try:
+            stmt = select(Job).options(selectinload(Job.destinations)).where(Job.id == job_id)
+            job = (await session.execute(stmt)).scalar_one_or_none()
+            if job:
+                # in order; destinations added while the job ran get no stats
+                for target, delivery in zip([job, *job.destinations], stats):
+                    target.logs_delivered = delivery.sent
+                    target.delivery_errors = delivery.errors
+                    target.delivery_reconnects = delivery.reconnects
+                    target.delivery_last_error = delivery.last_error[:512] if delivery.last_error else None
+                await session.commit()
+                logger.debug(f"Saved delivery stats of {len(stats)} destination(s) for job {job_id}")
+            else:
+                logger.warning(f"Job {job_id} not found when saving its delivery stats")
+        except Exception as e:
+            logger.error(f"Failed to save delivery stats for job {job_id}: {type(e).__name__}: {e}")
+            await session.rollback()
+
+
+def handle_receiver_report(message: str) -> None:
+    """
+    Keep the latest sequence receiver report of a job for RAMP loss checks.
+    
+    Args:
+        message: JSON snapshot of one job, see scripts/sequence_receiver.py
+    """
+    try:
+        report = json.loads(message)
+        report['received_at'] = time.monotonic()
+        receiver_reports[report['job_id']] = report
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Invalid receiver report: {message[:100]} - {e}")
+
+
 async def handle_job_command(message: str) -> None:
     """
     Handle incoming job commands from Redis pub/sub.
@@ -377,13 +386,16 @@ async def main():
         
         # Create pub/sub connection
         pubsub = redis_client.pubsub()
-        await pubsub.subscribe("job_commands")
+        await pubsub.subscribe("job_commands", RECEIVER_REPORT_CHANNEL)
         
         logger.info("Subscribed to job_commands channel, waiting for commands...")
         
         # Listen for messages
         async for message in pubsub.listen():
             if message["type"] == "message":
+                if message["channel"] == RECEIVER_REPORT_CHANNEL:
+                    handle_receiver_report(message["data"])
+                    continue
                 command_data = message["data"]
                 logger.info(f"Received command: {command_data}")
                 await handle_job_command(command_data)
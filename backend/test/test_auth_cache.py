@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-process authorization cache.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from core.auth_cache import AuthCache, AuthPrincipal, INVALIDATE_ALL
+
+
+def _principal(account_id: str) -> AuthPrincipal:
+    return AuthPrincipal(
+        account_id=account_id,
+        role_name="admin",
+        permissions=frozenset({"me", "admin"}),
+        is_blocked=False,
+    )
+
+
+def test_auth_cache_ttl_and_invalidation():
+    """Entries expire after the TTL and can be evicted explicitly."""
+    cache = AuthCache(ttl_seconds=0.05, max_size=2)
+
+    cache.put(_principal("a"))
+    assert cache.get("a").permissions == {"me", "admin"}
+
+    time.sleep(0.06)
+    assert cache.get("a") is None, "Entry should expire after the TTL"
+
+    cache.put(_principal("a"))
+    cache.put(_principal("b"))
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    cache.put(_principal("c"))
+    cache.put(_principal("d"))
+    assert len(cache) <= 2, "Cache must stay within max_size"
+
+    cache.invalidate(INVALIDATE_ALL)
+    assert len(cache) == 0
+
+    print("✅ Auth cache TTL, size bound and invalidation work correctly.")
+
+
+if __name__ == "__main__":
+    test_auth_cache_ttl_and_invalidation()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached compiled template parser.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from services.parsing_service import (
+    CompiledTemplateParser,
+    KeyValueTemplateParser,
+    TemplateParser,
+    get_compiled_parser,
+    parse_log_with_template,
+)
+from services.template_detection import TemplateDetectionIndex
+
+
+def test_compiled_parser_is_cached():
+    """The same template content returns the same compiled parser."""
+    template = "srcip={source.ip} dstip={destination.ip}"
+    assert get_compiled_parser(template) is get_compiled_parser(template)
+    assert get_compiled_parser(template) is not get_compiled_parser(template + " x")
+    print("✅ Compiled parser cache works correctly.")
+
+
+def test_repeated_placeholder_and_nesting():
+    """Templates repeating a placeholder compile and nest ECS paths."""
+    template = 'mastersrcmac="{source.mac}" srcmac="{source.mac}" srcip={source.ip} user={source.user.name}'
+    log = 'mastersrcmac="aa:bb" srcmac="cc:dd" srcip=1.2.3.4 user=bob'
+
+    result = parse_log_with_template(template, log)
+    print(f"Result: {result.model_dump()}")
+    assert result.is_match, result.error_message
+    assert result.parsed_ecs == {
+        "source": {"mac": "aa:bb", "ip": "1.2.3.4", "user": {"name": "bob"}}
+    }
+
+    miss = parse_log_with_template(template, "something else")
+    assert not miss.is_match
+    print("✅ Repeated placeholders and nested output work correctly.")
+
+
+def test_values_containing_delimiters():
+    """Placeholders take the longest value that still matches, delimiters included."""
+    result = parse_log_with_template("conn {source.ip}:{source.port}", "conn fe80::1:443")
+    assert result.parsed_ecs == {"source": {"ip": "fe80::1", "port": "443"}}
+    result = parse_log_with_template("{event.action},{source.ip},{destination.ip}", "allow,a,b,1.2.3.4,5.6.7.8")
+    assert result.parsed_ecs == {"event": {"action": "allow,a,b"}, "source": {"ip": "1.2.3.4"}, "destination": {"ip": "5.6.7.8"}}
+
+    # detection verifies with placeholders stopping at the next literal, but
+    # reports the same captures as parse-log
+    index = TemplateDetectionIndex()
+    index.upsert("conn", "Conn", "conn {source.ip}:{source.port} end")
+    detected = index.detect("conn fe80::1:443 end")
+    assert detected.best.id == "conn"
+    assert detected.parsed_ecs == {"source": {"ip": "fe80::1", "port": "443"}}
+    print("✅ Values containing delimiters parse like before.")
+
+
+def test_key_value_parser():
+    """key=value templates use the tokenizer parser, which handles quoted spaces."""
+    template = 'type="traffic" srcip={source.ip} msg="{message}" ref="http://x/VID{threat.id}" osname="{host.os.name}"'
+    parser = get_compiled_parser(template)
+    assert isinstance(parser, KeyValueTemplateParser)
+    assert isinstance(get_compiled_parser('"a",{source.ip},{destination.ip}'), CompiledTemplateParser)
+
+    expected = {
+        "source": {"ip": "1.2.3.4"},
+        "message": "File was blocked.",
+        "threat": {"id": "42"},
+        "host": {"os": {"name": "Windows 10"}},
+    }
+    in_order = 'type="traffic" srcip=1.2.3.4 msg="File was blocked." ref="http://x/VID42" osname="Windows 10"'
+    assert parser.parse(in_order) == expected
+    assert list(parser.parse(in_order)) == list(expected)
+    # an extra key misses the compiled pattern and goes through the tokenizer
+    log = 'type="traffic" srcname="pc 1" srcip=1.2.3.4 msg="File was blocked." ref="http://x/VID42" osname="Windows 10"'
+    assert parser.parse(log) == expected
+    assert parser.parse(log.replace('type="traffic"', 'type="event"')) is None
+    assert parser.parse(log.replace(" srcip=1.2.3.4", "")) is None
+    assert parser.parse("not key value") is None
+    # lines of other templates are turned away by the fixed pairs before tokenizing
+    assert parser.anchors == ('type="traffic"',)
+    assert parser.parse('subtype="forward" srcip=1.2.3.4') is None
+
+    # values containing the delimiters of their template parse as with the regex parser
+    parser = get_compiled_parser('type="traffic" dst={destination.ip}:{destination.port} msg="{message}"')
+    assert isinstance(parser, KeyValueTemplateParser)
+    expected = {"destination": {"ip": "fe80::1", "port": "443"}, "message": "a: b"}
+    assert parser.parse('type="traffic" dst=fe80::1:443 msg="a: b"') == expected
+    assert parser.parse('type="traffic" msg="a: b" dst=fe80::1:443') == expected
+
+    try:
+        TemplateParser()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("TemplateParser is instantiable without parse")
+    print("✅ Key=value parser works correctly.")
+
+
+if __name__ == "__main__":
+    test_compiled_parser_is_cached()
+    test_repeated_placeholder_and_nesting()
+    test_values_containing_delimiters()
+    test_key_value_parser()
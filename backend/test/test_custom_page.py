@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the list totals cache and keyset pagination cursors.
+"""
+
+import sys
+import os
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from fastapi import HTTPException
+
+from core.custom_page import TotalCountCache, decode_cursor, encode_cursor
+
+
+def test_total_count_cache_is_bounded():
+    """A full cache drops expired keys first, then the least recently used."""
+    cache = TotalCountCache(ttl_seconds=60, max_size=3)
+    for name in ("a", "b", "c"):
+        cache.put(("jobs", name), 1)
+    assert cache.get(("jobs", "a")) == 1
+    cache.put(("jobs", "d"), 4)
+    assert len(cache) == 3 and cache.get(("jobs", "b")) is None
+    assert cache.get(("jobs", "a")) == 1 and cache.get(("jobs", "d")) == 4
+
+    cache = TotalCountCache(ttl_seconds=0.05, max_size=2)
+    cache.put(("jobs", "old"), 1)
+    time.sleep(0.06)
+    cache.put(("jobs", "x"), 2)
+    cache.put(("jobs", "y"), 3)
+    assert len(cache) == 2 and cache.get(("jobs", "x")) == 2
+    cache.invalidate("jobs")
+    assert len(cache) == 0
+    print("✅ The totals cache is bounded.")
+
+
+def test_cursor_is_query_string_safe():
+    """Cursors survive a query string unencoded and bad ones are rejected."""
+    created_at = datetime(2026, 10, 19, 11, 0, 0, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, "a1b2-c3")
+    assert quote(cursor, safe="") == cursor
+    assert decode_cursor(cursor) == (created_at, "a1b2-c3")
+    for bad in ("not a cursor", "@@", encode_cursor(created_at, "x")[:-3]):
+        try:
+            decode_cursor(bad)
+        except HTTPException as e:
+            assert e.status_code == 400
+        else:
+            raise AssertionError(f"cursor {bad!r} was accepted")
+    print("✅ Cursors are query string safe.")
+
+
+if __name__ == "__main__":
+    test_total_count_cache_is_bounded()
+    test_cursor_is_query_string_safe()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline dataset export CLI.
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import export
+from services.virtual_clock import VirtualClock
+
+
+def test_spanning_clock_spreads_count_over_range():
+    """A spanning clock places exactly `count` logs inside [start, end)."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2026, 1, 8, tzinfo=timezone.utc)
+    clock = VirtualClock.spanning(start, end, 7)
+    assert len(clock) == 7
+    assert [clock.time_us(i) - clock.start_us for i in (0, 1, 6)] == [0, 86400 * 10**6, 6 * 86400 * 10**6]
+    print("✅ Spanning clock spreads logs over the range.")
+
+
+def test_export_writes_time_ordered_shards():
+    """Shards together hold every log once, in event time order."""
+    with tempfile.TemporaryDirectory() as output:
+        export.main([
+            "fortigate_forward_traffic", "-n", "300", "--start", "2026-10-01T00:00:00Z",
+            "--end", "2026-10-02T00:00:00Z", "--format", "ndjson", "--compress", "gzip",
+            "--workers", "1", "--shards", "3", "--buffer-size", "4096", "-o", output, "--seed", "7",
+        ])
+        shards = sorted(Path(output).glob("*.ndjson.gz"))
+        assert len(shards) == 3
+        records = [json.loads(line) for shard in shards for line in gzip.open(shard, "rt", encoding="utf-8")]
+
+    assert len(records) == 300
+    timestamps = [record["@timestamp"] for record in records]
+    assert timestamps == sorted(timestamps)
+    assert timestamps[0] == "2026-10-01T00:00:00.000000Z"
+    assert timestamps[-1] < "2026-10-02T00:00:00"
+    assert all("type=\"traffic\"" in record["message"] for record in records)
+    print("✅ Export writes time-ordered shards.")
+
+
+if __name__ == "__main__":
+    test_spanning_clock_spreads_count_over_range()
+    test_export_writes_time_ordered_shards()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for jobs sending one generated stream to several destinations.
+"""
+
+import asyncio
+import socket
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import standalone
+from services import send_engine
+
+
+async def _listener() -> tuple:
+    """TCP listener collecting received bytes; returns (server, port, received chunks)."""
+    received = []
+
+    async def handle(reader, writer):
+        while data := await reader.read(65536):
+            received.append(data)
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], received
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_destinations_receive_identical_logs():
+    """Each log is rendered once and every destination receives the same bytes."""
+    async def scenario(directory):
+        server, port, received = await _listener()
+        job_id, job_config, template_content = standalone.build_job({
+            "template_content": "src={source.ip} seq={sim.seq}",
+            "destination": f"127.0.0.1:{port}",
+            "protocol": "tcp",
+            "mode": "backfill",
+            "start_time": datetime(2026, 10, 1, tzinfo=timezone.utc),
+            "end_time": datetime(2026, 10, 1, 0, 0, 10, tzinfo=timezone.utc),
+            "backfill_eps": 100,
+            "prerender_pool": 50,
+            "embed_sequence": True,
+            "destinations": [
+                {"protocol": "file", "file_path": os.path.join(directory, "a.log")},
+                {"protocol": "FILE", "file_path": os.path.join(directory, "b.log")},
+            ],
+        })
+        reported = []
+
+        async def on_delivery(stats):
+            reported.extend(stats)
+
+        assert await send_engine.run_job(job_id, job_config, template_content, on_delivery=on_delivery) == 1000
+        await asyncio.sleep(0.05)
+        server.close()
+        await server.wait_closed()
+        return b"".join(received), reported
+
+    with tempfile.TemporaryDirectory() as directory:
+        streamed, reported = asyncio.run(scenario(directory))
+        with open(os.path.join(directory, "a.log"), "rb") as a, open(os.path.join(directory, "b.log"), "rb") as b:
+            assert streamed == a.read() == b.read()
+        assert streamed.count(b"\n") == 1000 and b"seq=0000001000" in streamed
+        assert [(stats.destination.split()[0], stats.sent, stats.errors) for stats in reported] == [
+            ("TCP", 1000, 0), ("FILE", 1000, 0), ("FILE", 1000, 0),
+        ]
+    print("✅ Destinations receive identical logs.")
+
+
+def test_failing_destination_does_not_stop_the_others():
+    """A dead destination is counted and skipped; the job fails only when none is left."""
+    async def scenario(directory):
+        path = os.path.join(directory, "ok.log")
+        job_config = {
+            "destination_host": "127.0.0.1", "destination_port": _closed_port(), "protocol": "TCP",
+            "start_time": None, "end_time": None, "send_count": 20, "send_interval_ms": 1,
+            "destinations": [{"protocol": "FILE", "file_path": path}],
+        }
+        reported = []
+
+        async def on_delivery(stats):
+            reported.extend(stats)
+
+        assert await send_engine.run_send_loop("fan-out-test", job_config, "msg=x", on_delivery=on_delivery) == 20
+        dead, alive = reported
+        assert dead.sent == 0 and dead.errors >= 1 and "ConnectionRefusedError" in dead.last_error
+        assert alive.sent == 20 and alive.errors == 0
+        with open(path, "rb") as f:
+            assert f.read() == b"msg=x\n" * 20
+
+        job_config["destinations"] = [{"protocol": "TCP", "destination_host": "127.0.0.1", "destination_port": _closed_port()}]
+        try:
+            await send_engine.run_send_loop("fan-out-test", job_config, "msg=x")
+        except ConnectionRefusedError:
+            pass
+        else:
+            raise AssertionError("a job without any reachable destination did not fail")
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(directory))
+    print("✅ A failing destination does not stop the others.")
+
+
+if __name__ == "__main__":
+    test_destinations_receive_identical_logs()
+    test_failing_destination_does_not_stop_the_others()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for the FILE protocol: coalesced writes, rotation, gzip and named pipes.
+"""
+
+import asyncio
+import gzip
+import sys
+import os
+import tempfile
+import threading
+import zlib
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from fastapi import HTTPException
+from core.settings import cfg
+from models.job import Job, JobDestination, ProtocolEnum
+from services import send_engine
+from services.file_sink import FSYNC_ROTATE, FSYNC_WRITE, FileSender
+from services.job_service import _validate_mode_settings
+from services.framing import RFC3164, Framer
+
+
+def test_coalesced_writes():
+    """Logs are buffered and written in one chunk, with the job's syslog header."""
+    async def scenario(path):
+        sender = FileSender(path, Framer(RFC3164, hostname="fw01", appname="sim"), fsync=FSYNC_WRITE)
+        for i in range(100):
+            assert await sender.send(f"msg={i}")
+        # nothing was written per log
+        assert not os.path.exists(path)
+        assert await sender.flush()
+        await sender.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sub", "fw.log")
+        asyncio.run(scenario(path))
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 100 and lines[0].startswith(b"<134>") and lines[99].endswith(b" fw01 sim: msg=99")
+    print("✅ FILE logs are written in coalesced chunks.")
+
+
+def test_rotation_keeps_newest_files():
+    """Files rotate by size and only the newest rotated files are kept."""
+    async def scenario(path):
+        sender = FileSender(path, rotate_bytes=1000, keep=2, fsync=FSYNC_ROTATE)
+        for chunk in range(12):
+            for i in range(10):
+                await sender.send(f"chunk={chunk:02d} msg={i:02d} " + "x" * 40)
+            assert await sender.flush()
+        await sender.close()
+        return sender.rotations
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fw.log")
+        assert asyncio.run(scenario(path)) == 6
+        rotated = sorted(name for name in os.listdir(directory) if name != "fw.log")
+        assert len(rotated) == 2 and all(name.startswith("fw.log-") for name in rotated)
+        # the newest rotated files hold chunks 8-11 and the current file is empty
+        contents = b"".join(open(os.path.join(directory, name), "rb").read() for name in rotated)
+        assert contents.count(b"\n") == 40 and b"chunk=08 msg=00" in contents and b"chunk=11 msg=09" in contents
+        assert os.path.getsize(path) == 0
+    print("✅ FILE rotation keeps the newest files.")
+
+
+def test_gzip_stream_readable_while_growing():
+    """A gzip FILE can be decompressed while it is written and is one member per file."""
+    async def scenario(path):
+        sender = FileSender(path, gzip=True)
+        await sender.send("first")
+        await sender.flush()
+        with open(path, "rb") as f:
+            assert zlib.decompressobj(31).decompress(f.read()) == b"first\n"
+        await sender.send("second")
+        await sender.flush()
+        await sender.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fw.log.gz")
+        asyncio.run(scenario(path))
+        assert gzip.decompress(open(path, "rb").read()) == b"first\nsecond\n"
+    print("✅ FILE gzip streams are readable while they grow.")
+
+
+def test_named_pipe():
+    """A named pipe is written once a reader opens it."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pipe")
+        os.mkfifo(path)
+        received = []
+
+        def read():
+            with open(path, "rb") as pipe:
+                received.append(pipe.read())
+
+        async def scenario():
+            sender = FileSender(path)
+            await sender.send("piped")
+            reader = threading.Thread(target=read)
+            reader.start()
+            assert await sender.flush()
+            await sender.close()
+            await asyncio.to_thread(reader.join)
+
+        asyncio.run(scenario())
+        assert received == [b"piped\n"]
+    print("✅ FILE writes to named pipes.")
+
+
+
+def test_file_path_stays_under_sink_root():
+    """FILE jobs and destinations may only write under FILE_SINK_ROOT, checked by the API and the worker."""
+    root = cfg.FILE_SINK_ROOT
+    with tempfile.TemporaryDirectory() as directory:
+        cfg.FILE_SINK_ROOT = directory
+        os.symlink("/etc", os.path.join(directory, "etc"))
+        inside = os.path.join(directory, "fw", "out.log")
+        try:
+            for job_path, destination_path, allowed in (
+                (inside, inside + ".2", True),
+                (os.path.join(directory, "..", "out.log"), inside, False),
+                (os.path.join(directory, "etc", "cron.d", "x"), inside, False),
+                ("out.log", inside, False),
+                (inside, "/etc/cron.d/x", False),
+            ):
+                job = Job(
+                    protocol=ProtocolEnum.FILE, file_path=job_path,
+                    destinations=[JobDestination(protocol=ProtocolEnum.FILE, file_path=destination_path)],
+                )
+                try:
+                    _validate_mode_settings(job)
+                except HTTPException as error:
+                    assert not allowed and error.status_code == 400, (job_path, destination_path)
+                else:
+                    assert allowed, (job_path, destination_path)
+
+                # the worker checks again on its own host before any FileSender is built
+                job_config = {
+                    "protocol": "FILE", "file_path": job_path,
+                    "destinations": [{"protocol": "FILE", "file_path": destination_path},
+                                     {"protocol": "UDP", "file_path": "/etc/cron.d/x"}],
+                }
+                try:
+                    send_engine.confine_job_paths(job_config, directory, directory)
+                except ValueError:
+                    assert not allowed, (job_path, destination_path)
+                else:
+                    assert allowed and job_config["destinations"][0]["file_path"] == os.path.realpath(destination_path)
+        finally:
+            cfg.FILE_SINK_ROOT = root
+    print("✅ file_path is confined to the sink root.")
+
+
+if __name__ == "__main__":
+    test_coalesced_writes()
+    test_rotation_keeps_newest_files()
+    test_gzip_stream_readable_while_growing()
+    test_named_pipe()
+    test_file_path_stays_under_sink_root()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for syslog headers and TCP framing.
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from services.framing import OCTET_COUNTING, RFC3164, RFC5424, Framer, split_octet_counted
+
+
+def test_syslog_headers():
+    """Headers carry PRI, timestamp, hostname and appname in the RFC layout."""
+    epoch_us = int(datetime(2026, 10, 1, 8, 5, 3, tzinfo=timezone.utc).timestamp()) * 1_000_000 + 1500
+    line = b"msg=hello\n"
+
+    framer = Framer(RFC5424, pri=13, hostname="fw01", appname="sim")
+    assert bytes(framer.udp(line, epoch_us)) == b"<13>1 2026-10-01T08:05:03.001500Z fw01 sim - - - msg=hello"
+    assert bytes(framer.tcp(line, epoch_us)) == b"<13>1 2026-10-01T08:05:03.001500Z fw01 sim - - - msg=hello\n"
+
+    local = datetime.fromtimestamp(epoch_us // 1_000_000)
+    stamp = f"{local.strftime('%b')} {local.day:2d} {local.strftime('%H:%M:%S')}".encode()
+    framer = Framer(RFC3164, hostname="fw01", appname="sim")
+    assert bytes(framer.udp(line, epoch_us)) == b"<134>" + stamp + b" fw01 sim: msg=hello"
+
+    # raw newline-framed TCP is passed through untouched
+    assert Framer().tcp(line) is line
+    print("✅ Syslog headers follow RFC 3164 and RFC 5424.")
+
+
+def test_octet_counting_round_trip():
+    """Octet-counted frames split back into the messages, also across reads."""
+    framer = Framer(framing=OCTET_COUNTING)
+    messages = [b"first", b"multi\nline", b"x" * 300]
+    stream = b"".join(bytes(framer.tcp(message + b"\n")) for message in messages)
+    assert stream.startswith(b"5 first10 multi\nline300 ")
+
+    received, pending = split_octet_counted(stream[:15])
+    assert received == [b"first"]
+    rest, pending = split_octet_counted(pending + stream[15:])
+    assert received + rest == messages and pending == b""
+    print("✅ Octet counting round-trips messages.")
+
+
+if __name__ == "__main__":
+    test_syslog_headers()
+    test_octet_counting_round_trip()
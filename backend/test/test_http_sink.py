@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for the HTTP bulk sinks against a local HTTP stand-in.
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import h11
+
+from services.http_sink import ES_BULK, HTTP_JSON, SPLUNK_HEC, HttpBulkSender
+
+OK = (200, [], b'{"errors":false,"items":[]}')
+
+
+class StandIn:
+    """HTTP/1.1 keep-alive server recording requests; respond(body) picks each response."""
+
+    def __init__(self, respond=lambda body: OK) -> None:
+        self.respond = respond
+        self.requests = []
+        self.connections = 0
+        self.handlers = []
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await asyncio.gather(*self.handlers)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.handlers.append(asyncio.current_task())
+        http = h11.Connection(h11.SERVER)
+        chunks = []
+        while True:
+            event = http.next_event()
+            if event is h11.NEED_DATA:
+                http.receive_data(await reader.read(65536))
+            elif isinstance(event, h11.Request):
+                headers, chunks = dict(event.headers), []
+            elif isinstance(event, h11.Data):
+                chunks.append(event.data)
+            elif isinstance(event, h11.EndOfMessage):
+                body = b"".join(chunks)
+                if headers.get(b"content-encoding") == b"gzip":
+                    body = gzip.decompress(body)
+                self.requests.append((headers, body))
+                status, extra, response = self.respond(body)
+                headers_out = [("Content-Length", str(len(response)))] + extra
+                writer.write(http.send(h11.Response(status_code=status, headers=headers_out)))
+                writer.write(http.send(h11.Data(data=response)))
+                writer.write(http.send(h11.EndOfMessage()))
+                await writer.drain()
+                http.start_next_cycle()
+            else:
+                break
+        writer.close()
+
+
+def test_elasticsearch_bulk_batches():
+    """Logs are posted as gzipped _bulk batches over one keep-alive connection."""
+    async def scenario():
+        stand_in = StandIn()
+        port = await stand_in.start()
+        sender = HttpBulkSender(
+            "127.0.0.1", port, ES_BULK, index="sim", batch_size=10, max_in_flight=1, gzip_bodies=True,
+            authorization="ApiKey abc"
+        )
+        for i in range(24):
+            assert await sender.send(f"msg={i}", 1_790_000_000_000_000 + i)
+        assert await sender.send('{"event":{"code":1}}')
+        await sender.close()
+        await stand_in.stop()
+
+        assert [body.count(b"\n") // 2 for _, body in stand_in.requests] == [10, 10, 5]
+        assert stand_in.connections == 1 and sender.requests == 3 and len(sender.latencies) == 3
+        headers, body = stand_in.requests[0]
+        assert headers[b"content-type"] == b"application/x-ndjson"
+        assert headers[b"authorization"] == b"ApiKey abc"
+        lines = body.split(b"\n")
+        assert json.loads(lines[0]) == {"create": {"_index": "sim"}}
+        assert json.loads(lines[1]) == {"@timestamp": "2026-09-21T14:13:20.000000Z", "message": "msg=0"}
+        # JSON logs are indexed as they are
+        assert stand_in.requests[2][1].split(b"\n")[-2] == b'{"event":{"code":1}}'
+
+    asyncio.run(scenario())
+    print("✅ Elasticsearch _bulk batches are posted over a keep-alive connection.")
+
+
+def test_retries_and_throttled_items():
+    """429 responses are retried, and so are only the bulk items rejected with 429."""
+    responses = [
+        (429, [("Retry-After", "0")], b"slow down"),
+        (200, [], json.dumps({"errors": True, "items": [
+            {"create": {"status": 201}}, {"create": {"status": 429}}, {"create": {"status": 400, "error": "mapping"}},
+        ]}).encode()),
+    ]
+
+    async def scenario():
+        stand_in = StandIn(lambda body: responses.pop(0) if responses else OK)
+        port = await stand_in.start()
+        sender = HttpBulkSender("127.0.0.1", port, ES_BULK, batch_size=3)
+        for i in range(3):
+            await sender.send(f"msg={i}")
+        await sender.close()
+        await stand_in.stop()
+
+        assert len(stand_in.requests) == 3
+        # the retry of the throttled item carries only msg=1
+        assert b"msg=1" in stand_in.requests[2][1] and stand_in.requests[2][1].count(b"\n") == 2
+        assert sender.retries == 2 and sender.errors == 2 and sender.dropped == 1
+
+    asyncio.run(scenario())
+    print("✅ Throttled requests and bulk items are retried.")
+
+
+def test_batch_age_and_dropped_batches():
+    """A batch is sent at its age; a batch failing every retry is dropped and reported once."""
+    async def scenario():
+        stand_in = StandIn(lambda body: (503, [("Retry-After", "0")], b"busy"))
+        port = await stand_in.start()
+        sender = HttpBulkSender("127.0.0.1", port, SPLUNK_HEC, batch_age_ms=20, hostname="fw01")
+        assert await sender.send("msg=hec", 1_790_000_000_250_000)
+        await asyncio.sleep(0.2)
+        assert len(stand_in.requests) == 4
+        assert json.loads(stand_in.requests[0][1]) == {"time": 1790000000.25, "event": "msg=hec", "host": "fw01"}
+        assert sender.dropped == 1 and isinstance(sender.last_error, OSError)
+        assert not await sender.send("msg=next")
+        assert await sender.send("msg=next")
+        await sender.close()
+        await stand_in.stop()
+
+        stand_in = StandIn()
+        port = await stand_in.start()
+        sender = HttpBulkSender("127.0.0.1", port, HTTP_JSON)
+        await sender.send('say "hi"', 1_790_000_000_000_000)
+        await sender.close()
+        await stand_in.stop()
+        assert json.loads(stand_in.requests[0][1]) == [{"@timestamp": "2026-09-21T14:13:20.000000Z", "message": 'say "hi"'}]
+
+    asyncio.run(scenario())
+    print("✅ Batches are sent at their age and dropped after their retries.")
+
+
+
+def test_unresponsive_receiver_times_out():
+    """A receiver that never answers fails attempts by timeout, and close() gives up on them."""
+    async def scenario():
+        connections = []
+
+        async def swallow(reader, writer):
+            connections.append(writer)
+            while await reader.read(65536):
+                pass
+
+        server = await asyncio.start_server(swallow, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        sender = HttpBulkSender("127.0.0.1", port, HTTP_JSON, batch_size=2, request_timeout=0.1)
+        for i in range(2):
+            await sender.send(f"msg={i}")
+        await asyncio.sleep(0.3)
+        # the timed out attempt counts as an error and waits for its retry
+        assert sender.retries == 1 and sender.errors == 1 and len(connections) == 1
+        assert isinstance(sender.last_error, TimeoutError)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await sender.close()
+        assert loop.time() - started < 0.5
+        assert sender.dropped == 2 and sender.requests == 0
+        server.close()
+        for writer in connections:
+            writer.close()
+
+    asyncio.run(scenario())
+    print("✅ Unresponsive receivers time out instead of stalling the sender.")
+
+
+if __name__ == "__main__":
+    test_elasticsearch_bulk_batches()
+    test_retries_and_throttled_items()
+    test_batch_age_and_dropped_batches()
+    test_unresponsive_receiver_times_out()
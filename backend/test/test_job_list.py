@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the job list projection and the jobs' raise-by-default relationships.
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import models
+from models.base import BaseModel
+from models.log_template import LogTemplate
+from schemas.job import JobCreate, JobOut, JobRead, JobUpdate
+from services import job_service
+
+
+class _Publisher:
+    """Stands in for the worker's Redis channel."""
+
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, channel: str, message: str) -> None:
+        self.messages.append((channel, message))
+
+
+async def _with_sessions(check) -> None:
+    """Run `check` against sessions of a fresh SQLite database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'jobs.db')}")
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(BaseModel.metadata.create_all)
+            await check(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+
+async def _create_job(sessions: async_sessionmaker) -> str:
+    async with sessions() as db:
+        template = LogTemplate(name="firewall", device_type="FortiGate", content_format="src={source.ip}")
+        extra = LogTemplate(name="proxy", device_type="Squid", content_format="dst={destination.ip}")
+        db.add_all([template, extra])
+        await db.commit()
+        job = await job_service.create_job(db, JobCreate(
+            template_id=template.id,
+            templates=[{"template_id": extra.id, "weight": 2}],
+            protocol="UDP",
+            destination_host="127.0.0.1",
+            destination_port=514,
+            destinations=[{"protocol": "TCP", "destination_host": "127.0.0.1", "destination_port": 601}],
+            send_count=10,
+        ))
+        assert len(JobRead.model_validate(job).templates) == 1
+        return str(job.id)
+
+
+def test_job_list_rows_serialize():
+    """The list projection carries every JobOut field and nothing the list doesn't render."""
+    async def check(sessions: async_sessionmaker):
+        job_id = await _create_job(sessions)
+        async with sessions() as db:
+            rows = (await db.execute(job_service.job_list_query())).all()
+        assert len(rows) == 1
+        job = JobOut.model_validate(rows[0])
+        assert str(job.id) == job_id and job.template_name == "firewall"
+        assert job.destination_port == 514 and job.send_count == 10
+        assert set(rows[0]._fields) == set(JobOut.model_fields)
+
+    asyncio.run(_with_sessions(check))
+    print("✅ Job list rows serialize as JobOut.")
+
+
+def test_job_get_start_update_load_relationships():
+    """Get, start and update load the relationships JobRead serializes."""
+    async def check(sessions: async_sessionmaker):
+        job_id = await _create_job(sessions)
+
+        async with sessions() as db:
+            job = JobRead.model_validate(await job_service.get_job_by_id(db, job_id))
+            assert len(job.templates) == 1 and len(job.destinations) == 1
+
+        publisher = _Publisher()
+        redis_client = job_service.redis_client
+        job_service.redis_client = publisher
+        try:
+            async with sessions() as db:
+                job = JobRead.model_validate(await job_service.start_job(db, job_id))
+        finally:
+            job_service.redis_client = redis_client
+        assert job.status == "RUNNING" and len(job.destinations) == 1
+        assert publisher.messages == [("job_commands", f"START:{job_id}")]
+
+        async with sessions() as db:
+            job = JobRead.model_validate(
+                await job_service.update_job(db, job_id, JobUpdate(send_count=20))
+            )
+        assert job.send_count == 20 and len(job.templates) == 1
+
+    asyncio.run(_with_sessions(check))
+    print("✅ Get, start and update load what they serialize.")
+
+
+if __name__ == "__main__":
+    test_job_list_rows_serialize()
+    test_job_get_start_update_load_relationships()
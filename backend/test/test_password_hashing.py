@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for bcrypt hashing and verification in the password thread pool.
+"""
+
+import asyncio
+import threading
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from core import security
+
+
+def test_hash_and_verify_in_executor():
+    """Hashing and verification run in the bcrypt pool, off the event loop, and are timed."""
+    threads = []
+    original = security.verify_password
+
+    def recording(plain_password, hashed_password):
+        threads.append(threading.current_thread().name)
+        return original(plain_password, hashed_password)
+
+    async def scenario():
+        hashed = await security.get_password_hash_async("s3cret")
+        security.verify_password = recording
+        try:
+            ok, wrong = await asyncio.gather(
+                security.verify_password_async("s3cret", hashed),
+                security.verify_password_async("wrong", hashed),
+            )
+        finally:
+            security.verify_password = original
+        return hashed, ok, wrong
+
+    before = security.get_password_hash_stats()
+    hashed, ok, wrong = asyncio.run(scenario())
+    after = security.get_password_hash_stats()
+
+    assert hashed.startswith("$2") and ok and not wrong
+    assert len(threads) == 2 and all(name.startswith("bcrypt") for name in threads)
+    assert after["hash"]["count"] == before["hash"]["count"] + 1
+    assert after["verify"]["count"] == before["verify"]["count"] + 2
+    print("✅ Passwords are hashed and verified in the bcrypt pool.")
+
+
+if __name__ == "__main__":
+    test_hash_and_verify_in_executor()
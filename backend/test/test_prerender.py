@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for pre-rendered message pools.
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from services.log_generator import LogGenerator
+from services.prerender import PrerenderedCorpus
+from services.sequence_tracker import SEQUENCE_PATTERN
+from services.virtual_clock import TimestampFormatter
+
+
+def test_patched_spans_match_rendered_timestamps():
+    """Patched spans hold the same values a full render at that time would."""
+    template = "{@timestamp} date={date} time={time} eventtime=<eventtime> start={event.start} ip={source.ip}"
+    corpus = PrerenderedCorpus(template, 3, LogGenerator())
+    epoch_us = int(datetime(2026, 10, 1, 12, 0, 5, tzinfo=timezone.utc).timestamp()) * 1_000_000 + 42
+    context = TimestampFormatter().context(epoch_us)
+
+    first = bytes(corpus.message(0, epoch_us)).decode()
+    assert first.endswith("\n")
+    fields = first.split()
+    assert fields[0] == f"{context['@timestamp.date']}T{context['@timestamp.time']}.000042"
+    assert fields[1:4] == [f"date={context['date']}", f"time={context['time']}", f"eventtime={context['eventtime']}"]
+    assert 0 <= int(context["eventtime"]) - int(fields[4].split("=")[1]) <= 3600
+
+    # the pool wraps around and keeps the generated values of each message
+    assert bytes(corpus.message(3, epoch_us)).decode() == first
+    later = bytes(corpus.message(3, epoch_us + 86_400_000_000)).decode()
+    assert later.split()[-1] == fields[-1] and later.split()[1] != fields[1]
+    print("✅ Pre-rendered spans are patched with the send time.")
+
+
+def test_sequence_spans():
+    """Sequence-numbered pools patch {sim.seq} and {sim.sent_ns} per send."""
+    corpus = PrerenderedCorpus("msg simjob={sim.job_id} simseq={sim.seq} simsent={sim.sent_ns}", 2, job_id="job-1")
+    for seq in (1, 2, 3):
+        match = SEQUENCE_PATTERN.search(bytes(corpus.message(seq, 0, seq)))
+        assert match.group(1) == b"job-1"
+        assert int(match.group(2)) == seq
+        assert len(match.group(3)) == 19
+    print("✅ Sequence spans are patched per send.")
+
+
+if __name__ == "__main__":
+    test_patched_spans_match_rendered_timestamps()
+    test_sequence_spans()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive EPS ramp controller.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from services.ramp_controller import RampController, RampStep
+
+
+def simulate(controller: RampController, capacity: float, max_steps: int = 50) -> int:
+    """Drive the controller against a destination accepting `capacity` eps."""
+    for steps in range(1, max_steps + 1):
+        target = controller.target_eps
+        achieved = min(target, capacity)
+        # back-pressure shows up as time blocked in drain()
+        stall = 0.0 if target <= capacity else 1 - capacity / target
+        controller.record(RampStep(target_eps=target, elapsed=10.0, sent=int(achieved * 10), drain_seconds=stall * 10))
+        if controller.settled:
+            return steps
+    raise AssertionError("ramp did not settle")
+
+
+def test_ramp_settles_below_capacity():
+    """The ramp finds a rate within a few percent of the destination's capacity."""
+    controller = RampController(base_eps=100, factor=2.0)
+    steps = simulate(controller, capacity=3000)
+    saturation = controller.result.saturation_eps
+    # within the 5% shortfall a step may have and still count as sustainable
+    assert 3000 * 0.85 <= saturation <= 3000 / 0.95, saturation
+    assert int(controller.target_eps) == saturation
+    assert steps <= 15, steps
+    print(f"✅ Ramp settled at {saturation} eps for a 3000 eps destination in {steps} steps.")
+
+
+def test_ramp_limits_and_failures():
+    """ramp_max_eps caps the ramp; an unreachable destination has no saturation rate."""
+    controller = RampController(base_eps=100, factor=2.0, max_eps=500)
+    simulate(controller, capacity=10000)
+    assert controller.result.saturation_eps == 500
+    assert "ramp_max_eps" in controller.result.reason
+
+    controller = RampController(base_eps=100, factor=2.0)
+    controller.record(RampStep(target_eps=100, elapsed=10.0, sent=0, errors=1000))
+    assert controller.settled and controller.result.saturation_eps is None
+    assert "send error" in controller.result.reason
+
+    # a step carried by socket buffers is discarded once a later step shows the real rate
+    controller = RampController(base_eps=1000, factor=2.0)
+    controller.record(RampStep(target_eps=1000, elapsed=10.0, sent=10000))
+    controller.record(RampStep(target_eps=2000, elapsed=10.0, sent=3000, drain_seconds=9.0))
+    assert controller.sustainable is None and controller.target_eps < 400
+    print("✅ Ramp limits and failures are handled correctly.")
+
+
+if __name__ == "__main__":
+    test_ramp_settles_below_capacity()
+    test_ramp_limits_and_failures()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for routing reads to the replica and read-your-writes pinning.
+"""
+
+import sys
+import os
+import time
+from contextlib import asynccontextmanager
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from core.dependencies.db import DBReplicaSession, DBSession, READ_PRIMARY_UNTIL_COOKIE
+from core.settings import cfg
+from main import read_your_writes
+
+
+def _sessionmaker(name: str):
+    """A sessionmaker whose sessions are just the database's name."""
+    @asynccontextmanager
+    async def session():
+        yield name
+    return session
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    yield {
+        "sessionmaker": _sessionmaker("primary"),
+        "replica_sessionmaker": _sessionmaker("replica"),
+    }
+
+
+def _client() -> TestClient:
+    app = FastAPI(lifespan=_lifespan)
+    app.middleware("http")(read_your_writes)
+
+    @app.get("/jobs")
+    async def read(db: DBReplicaSession):
+        return db
+
+    @app.post("/jobs")
+    async def write(db: DBSession):
+        return db
+
+    @app.put("/jobs")
+    async def rejected(db: DBSession):
+        raise HTTPException(status_code=400, detail="rejected")
+
+    return TestClient(app)
+
+
+def test_reads_use_the_replica():
+    """GETs read from the replica until the client mutates something."""
+    with _client() as client:
+        response = client.get("/jobs")
+        assert response.json() == "replica"
+        assert READ_PRIMARY_UNTIL_COOKIE not in response.cookies
+        response = client.put("/jobs")
+        assert response.status_code == 400 and READ_PRIMARY_UNTIL_COOKIE not in response.cookies
+        assert client.get("/jobs").json() == "replica"
+    print("✅ Reads use the replica.")
+
+
+def test_mutations_pin_reads_to_the_primary():
+    """A mutation sets the cookie, and reads within the window go to the primary."""
+    with _client() as client:
+        response = client.post("/jobs")
+        assert response.json() == "primary"
+        until = float(response.cookies[READ_PRIMARY_UNTIL_COOKIE])
+        assert time.time() < until <= time.time() + cfg.DB_READ_YOUR_WRITES_SECONDS
+        assert client.get("/jobs").json() == "primary"
+
+        client.cookies.set(READ_PRIMARY_UNTIL_COOKIE, str(time.time() - 1))
+        assert client.get("/jobs").json() == "replica"
+        client.cookies.set(READ_PRIMARY_UNTIL_COOKIE, "not a time")
+        assert client.get("/jobs").json() == "replica"
+    print("✅ Mutations pin reads to the primary.")
+
+
+def test_read_your_writes_can_be_disabled():
+    """A window of 0 seconds never pins reads to the primary."""
+    window = cfg.DB_READ_YOUR_WRITES_SECONDS
+    cfg.DB_READ_YOUR_WRITES_SECONDS = 0
+    try:
+        with _client() as client:
+            assert READ_PRIMARY_UNTIL_COOKIE not in client.post("/jobs").cookies
+            assert client.get("/jobs").json() == "replica"
+    finally:
+        cfg.DB_READ_YOUR_WRITES_SECONDS = window
+    print("✅ Read-your-writes can be disabled.")
+
+
+if __name__ == "__main__":
+    test_reads_use_the_replica()
+    test_mutations_pin_reads_to_the_primary()
+    test_read_your_writes_can_be_disabled()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script for REPLAY capture files.
+"""
+
+import sys
+import os
+import asyncio
+import socket
+import tempfile
+import time
+from datetime import datetime, timezone
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from fastapi import HTTPException
+from core.settings import cfg
+from models.job import Job, JobModeEnum, ProtocolEnum
+from services import send_engine
+from services.job_service import _validate_mode_settings
+from services.replay import CaptureFile, CaptureTimestamps
+
+
+def test_capture_lines_and_timestamps():
+    """Lines are split lazily and their leading timestamps parsed and rewritten in place."""
+    with tempfile.NamedTemporaryFile("wb", suffix=".log", delete=False) as capture:
+        capture.write(
+            b"<134>1 2026-10-01T02:00:00.25+02:00 host app msg\r\n\n"
+            b"date=2026-10-01 time=00:00:01 devname=fw\n"
+            b"no timestamp\n"
+            b"<13>Dec 31 23:59:59 host msg\n"
+            b"Jan  1 00:00:00 host last"
+        )
+    try:
+        with CaptureFile(capture.name) as capture_file:
+            lines = list(capture_file.lines())
+    finally:
+        os.unlink(capture.name)
+    assert len(lines) == 5 and lines[0].endswith(b"msg") and lines[-1].endswith(b"last")
+
+    timestamps = CaptureTimestamps(year=2026)
+    parsed = [timestamps.parse(line) for line in lines]
+    epoch = int(datetime(2026, 10, 1, tzinfo=timezone.utc).timestamp()) * 1_000_000
+    assert parsed[0][0] == epoch + 250_000
+    assert parsed[2] is None
+    # BSD timestamps have no year, a capture crossing new year moves on to the next one
+    assert parsed[4][0] - parsed[3][0] == 1_000_000
+
+    moment_us = int(datetime(2026, 11, 5, 8, 30, 15, 123456, tzinfo=timezone.utc).timestamp() * 1_000_000)
+    assert timestamps.rewrite(lines[0], parsed[0][1], moment_us) == b"<134>1 2026-11-05T10:30:15.12+02:00 host app msg"
+    rewritten = timestamps.rewrite(lines[3], parsed[3][1], moment_us)
+    local = datetime.fromtimestamp(moment_us // 1_000_000)
+    assert rewritten == f"<13>{local.strftime('%b')} {local.day:2d} {local.strftime('%H:%M:%S')} host msg".encode()
+    print("✅ Capture lines and timestamps are parsed and rewritten.")
+
+
+def test_replay_keeps_scaled_timing():
+    """A replay sends every line, spaced by its timestamps divided by the speed."""
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as capture:
+        for i in range(5):
+            capture.write(f"2026-10-01T00:00:0{i}Z line {i}\n")
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sink.settimeout(2)
+    job_config = {
+        "destination_host": "127.0.0.1", "destination_port": sink.getsockname()[1], "protocol": "UDP",
+        "start_time": None, "end_time": None, "send_count": 7, "send_interval_ms": 1000,
+        "mode": "REPLAY", "replay_path": capture.name, "replay_speed": 20, "replay_loop": True,
+        "replay_rewrite_timestamps": True,
+    }
+    try:
+        started = time.monotonic()
+        assert asyncio.run(send_engine.run_job("replay-test", job_config, "")) == 7
+        elapsed = time.monotonic() - started
+        received = [sink.recv(65535).decode() for _ in range(7)]
+    finally:
+        sink.close()
+        os.unlink(capture.name)
+
+    # 4s of capture at 20x is 0.2s per pass, the loop restarts after line 4
+    assert 0.2 <= elapsed < 1.0, elapsed
+    assert [message.split()[-1] for message in received] == ["0", "1", "2", "3", "4", "0", "1"]
+    assert not any(message.startswith("2026-10-01T") for message in received)
+    print("✅ Replay keeps the capture's timing scaled by its speed.")
+
+
+
+def test_timed_replay_yields_on_bursts():
+    """Lines sharing a timestamp never wait, yet the replay still yields to other tasks."""
+    lines = 4 * send_engine.REPLAY_BATCH
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    with sink, tempfile.TemporaryDirectory() as directory:
+        capture_path = os.path.join(directory, "burst.log")
+        with open(capture_path, "w") as capture:
+            for i in range(lines):
+                capture.write(f"2026-10-01T00:00:00Z line {i}\n")
+        job_config = {
+            "destination_host": "127.0.0.1", "destination_port": sink.getsockname()[1], "protocol": "UDP",
+            "start_time": None, "end_time": None, "send_count": 0, "send_interval_ms": 1000,
+            "mode": "REPLAY", "replay_path": capture_path, "replay_speed": 1,
+        }
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            sent = await send_engine.run_job("burst-test", job_config, "")
+            task.cancel()
+            return sent, ticks
+
+        sent, ticks = asyncio.run(scenario())
+    assert sent == lines
+    assert ticks >= lines // send_engine.REPLAY_BATCH - 1, ticks
+    print("✅ Timed replays yield to other tasks during bursts.")
+
+
+def test_replay_path_stays_under_capture_root():
+    """REPLAY jobs may only read captures under REPLAY_CAPTURE_ROOT, checked by the API and the worker."""
+    root = cfg.REPLAY_CAPTURE_ROOT
+    with tempfile.TemporaryDirectory() as directory:
+        cfg.REPLAY_CAPTURE_ROOT = directory
+        os.symlink("/proc/self/environ", os.path.join(directory, "environ.log"))
+        try:
+            for path, allowed in (
+                (os.path.join(directory, "fw", "capture.log"), True),
+                (os.path.join(directory, "..", "capture.log"), False),
+                (os.path.join(directory, "environ.log"), False),
+                ("/proc/self/environ", False),
+                ("capture.log", False),
+            ):
+                job = Job(
+                    mode=JobModeEnum.REPLAY, protocol=ProtocolEnum.UDP,
+                    destination_host="127.0.0.1", destination_port=514, replay_path=path,
+                )
+                try:
+                    _validate_mode_settings(job)
+                except HTTPException as error:
+                    assert not allowed and error.status_code == 400, path
+                else:
+                    assert allowed, path
+
+                # the worker checks again on its own host, whatever the API let through
+                job_config = {"mode": "REPLAY", "replay_path": path}
+                try:
+                    send_engine.confine_job_paths(job_config, directory, directory)
+                except ValueError:
+                    assert not allowed, path
+                else:
+                    assert allowed and job_config["replay_path"] == os.path.realpath(path), path
+
+            # a capture swapped for a symlink after it was saved is refused too
+            os.makedirs(os.path.join(directory, "fw"))
+            os.symlink("/proc/self/environ", os.path.join(directory, "fw", "capture.log"))
+            try:
+                send_engine.confine_job_paths({"mode": "REPLAY", "replay_path": os.path.join(directory, "fw", "capture.log")}, directory, directory)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("a symlink out of the capture root was accepted")
+            job_config = {"mode": "CONSTANT", "replay_path": "/proc/self/environ"}
+            send_engine.confine_job_paths(job_config, directory, directory)
+        finally:
+            cfg.REPLAY_CAPTURE_ROOT = root
+    print("✅ replay_path is confined to the capture root.")
+
+
+if __name__ == "__main__":
+    test_capture_lines_and_timestamps()
+    test_replay_keeps_scaled_timing()
+    test_timed_replay_yields_on_bursts()
+    test_replay_path_stays_under_capture_root()
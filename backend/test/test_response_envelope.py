@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for the success envelope of HandleResponseRoute.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from core.custom_api_route import EnvelopeJSONResponse, HandleResponseRoute
+
+
+def _client() -> TestClient:
+    router = APIRouter(route_class=HandleResponseRoute)
+
+    @router.post("/login")
+    async def login():
+        return {"access_token": "token"}
+
+    @router.delete("/logout")
+    async def logout():
+        return {"msg": "Successfully logout"}
+
+    @router.get("/self")
+    async def current_user():
+        return {"username": "admin"}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/auth")
+    return TestClient(app)
+
+
+def test_bypass_is_decided_on_the_prefixed_path():
+    """Login and logout bodies stay unwrapped, other routes are enveloped."""
+    client = _client()
+    assert client.post("/auth/login").json() == {"access_token": "token"}
+    assert client.delete("/auth/logout").json() == {"msg": "Successfully logout"}
+    assert client.get("/auth/self").json() == {"success": True, "data": {"username": "admin"}, "errorMessage": ""}
+
+    import main
+    response_classes = {route.path: route.response_class for route in main.app.routes if hasattr(route, "response_class")}
+    assert response_classes["/auth/login"] is not EnvelopeJSONResponse
+    assert response_classes["/auth/logout"] is not EnvelopeJSONResponse
+    print("✅ The envelope bypass is decided on the mounted path.")
+
+
+if __name__ == "__main__":
+    test_bypass_is_decided_on_the_prefixed_path()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the standalone job runner.
+"""
+
+import sys
+import os
+import asyncio
+import socket
+from datetime import datetime, timezone
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import standalone
+
+
+def test_build_job_from_spec():
+    """A spec is turned into the job_config the worker would build."""
+    job_id, job_config, template_content = standalone.build_job({
+        "template": "fortigate_forward_traffic",
+        "destination": "127.0.0.1:5514",
+        "protocol": "tcp",
+        "mode": "backfill",
+        "start_time": datetime(2026, 10, 1, tzinfo=timezone.utc),
+        "end_time": "2026-10-02T00:00:00Z",
+        "backfill_eps": 10,
+        "eps": 200,
+    })
+    assert job_id.startswith("standalone-")
+    assert "type=\"traffic\"" in template_content
+    assert job_config["destination_host"] == "127.0.0.1"
+    assert job_config["destination_port"] == 5514
+    assert (job_config["protocol"], job_config["mode"]) == ("TCP", "BACKFILL")
+    assert job_config["end_time"] == datetime(2026, 10, 2, tzinfo=timezone.utc)
+    assert job_config["send_interval_ms"] == 5
+    assert job_config["send_count"] is None
+
+    for spec, message in (
+        ({"destination": "127.0.0.1:5514"}, "template"),
+        ({"template_content": "x", "destination": "127.0.0.1"}, "destination"),
+        ({"template_content": "x", "destination": "h:1", "mode": "backfill"}, "start_time"),
+    ):
+        try:
+            standalone.build_job(spec)
+        except ValueError as e:
+            assert message in str(e)
+        else:
+            raise AssertionError(f"{spec} was accepted")
+    print("✅ Job specs are validated and converted.")
+
+
+def test_run_sends_to_destination():
+    """A standalone job sends send_count logs without API, database or Redis."""
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sink.settimeout(2)
+    job_id, job_config, template_content = standalone.build_job({
+        "template_content": "seq={sim.seq}",
+        "destination": f"127.0.0.1:{sink.getsockname()[1]}",
+        "send_count": 3,
+        "send_interval_ms": 1,
+        "embed_sequence": True,
+        "job_id": "standalone-test",
+    })
+    assert asyncio.run(standalone.run(job_id, job_config, template_content)) == 3
+    received = [sink.recv(65535).decode() for _ in range(3)]
+    sink.close()
+    assert [message.split()[0] for message in received] == ["seq=1", "seq=2", "seq=3"]
+    assert all("simjob=standalone-test" in message for message in received)
+    print("✅ Standalone job sends to its destination.")
+
+
+if __name__ == "__main__":
+    test_build_job_from_spec()
+    test_run_sends_to_destination()
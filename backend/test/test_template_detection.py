@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for template auto-detection.
+"""
+
+import json
+import sys
+import os
+import yaml
+from pathlib import Path
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from services.template_detection import AhoCorasick, TemplateDetectionIndex
+from services.log_generator import LogGenerator
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "predefined_templates"
+
+# Templates whose generated values never contain the spaces that defeat their regex
+ALWAYS_DETECTED = (
+    "fortigate_antivirus_logs", "fortigate_appctrl_logs", "fortigate_cifs_logs", "fortigate_dlp_logs",
+    "fortigate_dns_logs", "fortigate_ha_events", "fortigate_router_events", "fortigate_ssh_logs",
+    "fortigate_ssl_logs", "fortigate_system_events", "fortigate_user_events", "fortigate_vpn_events",
+    "fortigate_webfilter_logs", "fortigate_wireless_events",
+)
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    """All patterns are found, including overlapping and nested ones."""
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    assert matcher.find_all("ushers") == {"she", "he", "hers"}
+    assert matcher.find_all("nothing") == set()
+    print("✅ Aho-Corasick matching works correctly.")
+
+
+def test_detects_predefined_templates():
+    """Generated logs are attributed to the template they came from."""
+    index = TemplateDetectionIndex()
+    for yaml_file in sorted(TEMPLATES_DIR.glob("*.yml")):
+        data = yaml.safe_load(yaml_file.read_text(encoding="utf-8"))
+        index.upsert(yaml_file.stem, data["name"], data["content_format"])
+
+    generator = LogGenerator()
+    detected = 0
+    logs = {}
+    for template_id, template in index._templates.items():
+        log = logs[template_id] = generator.generate_log(template.content_format)
+        candidates = [t.id for t in index.candidates(log)]
+        assert template_id in candidates, (template_id, candidates)
+        assert len(candidates) < len(index), "Prefilter should narrow the candidates"
+        result = index.detect(log)
+        best = index.detect_best(log)
+        assert (best and best.id) == (result.best and result.best.id)
+        # values with spaces can defeat the regex itself, but never pick a wrong template
+        if result.best is not None:
+            assert result.best.id == template_id, (template_id, result.best.id)
+            detected += 1
+        else:
+            assert template_id not in ALWAYS_DETECTED, template_id
+    print(f"Detected {detected}/{len(index)} generated logs")
+    assert detected >= len(ALWAYS_DETECTED)
+
+    body, matched = index.detect_lines_to_ndjson([logs[t] for t in ALWAYS_DETECTED] + ["not a log"], 1)
+    records = [json.loads(line) for line in body.splitlines()]
+    assert matched == len(ALWAYS_DETECTED)
+    assert [r.get("template_id") for r in records] == list(ALWAYS_DETECTED) + [None]
+
+    assert index.detect("not a firewall log").best is None
+    print("✅ Predefined template detection works correctly.")
+
+
+def test_incremental_updates():
+    """Edits are reflected and the automaton is reused when anchors are unchanged."""
+    index = TemplateDetectionIndex()
+    index.upsert("a", "A", 'type="traffic" src={source.ip}')
+    matcher = index._snapshot.matcher
+
+    index.upsert("b", "B", 'type="traffic" src={source.ip} x')
+    assert index._snapshot.matcher is matcher, "Known anchors should not rebuild"
+    assert index.detect('type="traffic" src=1.2.3.4').best.id == "a"
+
+    index.upsert("c", "C", 'type="event" user={user.name}')
+    assert index._snapshot.matcher is not matcher
+    assert index.detect('type="event" user=bob').best.id == "c"
+
+    index.remove("c")
+    assert index.detect('type="event" user=bob').best is None
+    print("✅ Incremental index updates work correctly.")
+
+
+if __name__ == "__main__":
+    test_aho_corasick_finds_overlapping_patterns()
+    test_detects_predefined_templates()
+    test_incremental_updates()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for jobs drawing their logs from a weighted mix of templates.
+"""
+
+import asyncio
+import random
+import sys
+import os
+import tempfile
+from collections import Counter
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from services import send_engine
+from services.log_generator import LogGenerator
+from services.prerender import PrerenderedCorpus
+from services.template_mix import TemplateMix
+
+
+def test_compiled_templates_render_like_generate_log():
+    """A compiled template renders what generate_log renders, context and unknown placeholders included."""
+    generator = LogGenerator()
+    generator.add_placeholder("a.x", lambda: "X")
+    generator.add_placeholder("b", lambda: "B")
+    templates = [
+        "{a.x} <b> {a.x}{b} {unknown} <also unknown> {sim.seq} {",
+        "no placeholders",
+        "{b}",
+        "",
+    ]
+    context = {"sim.seq": "42", "b": "fixed"}
+    for template in templates:
+        for ctx in (None, context):
+            assert generator.compile(template).render(ctx) == generator.generate_log(template, ctx), template
+    print("✅ Compiled templates render like generate_log.")
+
+
+def test_alias_table_draws_by_weight():
+    """Templates are drawn in proportion to their weights."""
+    random.seed(7)
+    mix = TemplateMix(["forward", "ips", "event", "vpn"], [80, 10, 9.5, 0.5])
+    draws = Counter(mix.render() for _ in range(200_000))
+    for template, share in (("forward", 0.8), ("ips", 0.1), ("event", 0.095), ("vpn", 0.005)):
+        assert abs(draws[template] / 200_000 - share) < 0.005, (template, draws)
+    assert Counter(TemplateMix(["only"]).render() for _ in range(10)) == {"only": 10}
+
+    for templates, weights in (([], None), (["a", "b"], [1, 0]), (["a", "b"], [1, -2]), (["a"], [1, 2])):
+        try:
+            TemplateMix(templates, weights)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{templates} weighted {weights} were accepted")
+    print("✅ The alias table draws templates by weight.")
+
+
+def test_mixed_job_sends_one_stream():
+    """A job with extra templates sends one stream of all of them, prerendered pools included."""
+    async def scenario(path):
+        job_config = {
+            "protocol": "FILE", "file_path": path, "destination_host": None, "destination_port": None,
+            "start_time": None, "end_time": None, "send_count": 3000, "send_interval_ms": 1,
+            "embed_sequence": True, "template_weight": 8,
+            "templates": [{"content": "type=ips", "weight": 1}, {"content": "type=event", "weight": 1}],
+        }
+        return await send_engine.run_send_loop("mix-test", job_config, "type=traffic")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "mix.log")
+        assert asyncio.run(scenario(path)) == 3000
+        with open(path) as f:
+            lines = f.read().splitlines()
+    kinds = Counter(line.split()[0] for line in lines)
+    assert sum(kinds.values()) == 3000 and set(kinds) == {"type=traffic", "type=ips", "type=event"}
+    assert kinds["type=traffic"] > 2 * (kinds["type=ips"] + kinds["type=event"])
+    # every template carries the sequence trailer
+    assert [int(line.split("simseq=")[1].split()[0]) for line in lines] == list(range(1, 3001))
+
+    corpus = PrerenderedCorpus(TemplateMix(["{date} a", "{date} b"], [3, 1]), 4000)
+    pooled = Counter(bytes(corpus.message(i, 1_790_000_000_000_000)).split()[1] for i in range(4000))
+    assert 2800 < pooled[b"a"] < 3200 and pooled[b"a"] + pooled[b"b"] == 4000
+    print("✅ A mixed job sends one stream of all its templates.")
+
+
+if __name__ == "__main__":
+    test_compiled_templates_render_like_generate_log()
+    test_alias_table_draws_by_weight()
+    test_mixed_job_sends_one_stream()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for the BACKFILL virtual clock.
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from services.log_generator import LogGenerator
+from services.virtual_clock import TimestampFormatter, VirtualClock
+
+
+def test_incremental_formatting_matches_datetime():
+    """Incrementally formatted timestamps equal a full strftime of the same time."""
+    formatter = TimestampFormatter()
+    start = datetime(2026, 3, 1, 23, 59, 58, tzinfo=timezone.utc)
+    for step_us in range(0, 5_000_000, 250_001):
+        moment = start + timedelta(microseconds=step_us)
+        epoch_us = int(moment.replace(microsecond=0).timestamp()) * 1_000_000 + moment.microsecond
+        context = formatter.context(epoch_us)
+        local = datetime.fromtimestamp(epoch_us // 1_000_000).replace(microsecond=moment.microsecond)
+        assert context["@timestamp"] == local.isoformat()
+        assert context["@timestamp.high_res"] == local.strftime('%Y-%m-%dT%H:%M:%S.%f%z')
+        assert context["@timestamp.date2"] == local.strftime('%Y/%m/%d')
+        assert context["date"] == local.strftime('%Y-%m-%d')
+        assert context["time"] == local.strftime('%H:%M:%S')
+        assert context["event.created"] == str(int(moment.timestamp()))
+    print("✅ Incremental timestamp formatting matches datetime.")
+
+
+def test_virtual_clock_covers_range():
+    """A backfill covers [start, end) at the event rate and stamps logs from the clock."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    clock = VirtualClock(start, start + timedelta(seconds=10), eps=3)
+    assert len(clock) == 30
+    assert clock.time_us(0) == int(start.timestamp()) * 1_000_000
+    assert clock.time_us(29) < clock.end_us <= clock.time_us(30)
+
+    generator = LogGenerator()
+    logs = [
+        generator.generate_log("ts={event.created} legacy=<eventtime>", dict(context))
+        for _, context in clock.contexts()
+    ]
+    epoch = int(start.timestamp())
+    assert logs[0] == f"ts={epoch} legacy={epoch}"
+    assert logs[-1] == f"ts={epoch + 9} legacy={epoch + 9}"
+    print("✅ Virtual clock covers the backfill range.")
+
+
+if __name__ == "__main__":
+    test_incremental_formatting_matches_datetime()
+    test_virtual_clock_covers_range()